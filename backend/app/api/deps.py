@@ -1,41 +1,95 @@
 """Dependencies for API routes."""
 
-from fastapi import HTTPException, Request, status
+from fastapi import Depends, HTTPException, Query, Request, status
+from app.api.schemas import Episode
 from app.core.session import get_session
+from app.services.http_client import get_http_client
+from app.services.library_prefetch import library_prefetcher
 from app.services.spotify import SpotifyClient
+from app.services.token_store import TokenRefreshError, token_store
 
 
 async def get_current_user(request: Request) -> dict:
     """
     Dependency to get current authenticated user.
     
-    Raises 401 if user is not authenticated.
+    Raises 401 if user is not authenticated or the session's tokens are
+    gone (logged out, expired from the store, or revoked). The access token
+    comes from the server-side token store, refreshed ahead of expiry. The
+    first request after an idle period starts a library prefetch. Raises
+    503 with Retry-After if the access token has expired and Spotify cannot
+    refresh it right now.
     
     Returns:
         Dict with user_id and access_token
     """
     session = get_session(request)
-    if not session:
+    resolved = None
+    if session and "sid" in session:
+        try:
+            resolved = await token_store.get_access_token(session["sid"])
+        except TokenRefreshError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not refresh Spotify access. Please try again shortly.",
+                headers={"Retry-After": str(max(1, round(e.retry_after)))},
+            ) from e
+    if resolved is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
     
+    user_id, access_token = resolved
+    library_prefetcher.touch(user_id, access_token)
     return {
-        "user_id": session["user_id"],
-        "access_token": session["access_token"],
-        "refresh_token": session.get("refresh_token"),
+        "user_id": user_id,
+        "access_token": access_token,
     }
 
 
-async def get_spotify_client(request: Request) -> SpotifyClient:
+async def get_spotify_client(user_data: dict = Depends(get_current_user)) -> SpotifyClient:
     """
     Dependency to get authenticated Spotify client.
     
     Raises 401 if user is not authenticated.
     
     Returns:
-        SpotifyClient instance with access token
+        SpotifyClient instance with access token, sharing the pooled HTTP client
+    """
+    return SpotifyClient(
+        access_token=user_data["access_token"],
+        http_client=get_http_client(),
+        user_id=user_data["user_id"],
+    )
+
+
+EPISODE_FIELDS = tuple(Episode.model_fields)
+
+
+def get_episode_fields(
+    fields: str | None = Query(
+        None,
+        description="Comma-separated episode fields to return, e.g. id,name,duration_ms (id is always included)",
+    ),
+) -> tuple[str, ...]:
+    """
+    Dependency parsing the ``fields=`` projection for episode responses.
+    
+    Lets clients on slow connections leave out heavy fields such as
+    ``description``. Raises 422 for unknown field names.
+    
+    Returns:
+        Selected Episode field names in schema order (all fields by default)
     """
-    user_data = await get_current_user(request)
-    return SpotifyClient(access_token=user_data["access_token"])
+    if fields is None:
+        return EPISODE_FIELDS
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected.difference(EPISODE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown episode fields: {', '.join(sorted(unknown))}",
+        )
+    selected.add("id")
+    return tuple(name for name in EPISODE_FIELDS if name in selected)
@@ -0,0 +1,67 @@
+"""JSON response rendering and conditional request helpers."""
+
+import json
+from types import ModuleType
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+orjson: ModuleType | None
+try:
+    import orjson as _orjson
+except ImportError:  # Optional; the stdlib encoder produces the same JSON, slower
+    orjson = None
+else:
+    orjson = _orjson
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode JSON-ready content as compact UTF-8 JSON.
+
+    Args:
+        content: Dicts, lists, strings, numbers, booleans and None only
+
+    Returns:
+        Encoded bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against a response's ETag.
+
+    Uses the weak comparison required for ``If-None-Match``: ``W/``
+    prefixes are ignored and ``*`` matches anything.
+
+    Args:
+        if_none_match: Header value (comma-separated ETags) or None
+        etag: ETag of the current representation
+
+    Returns:
+        True if the client's copy is current (answer 304)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed.
+
+    Used as the app's default response class. Routes that return one
+    directly skip FastAPI's ``response_model`` validation and
+    ``jsonable_encoder`` pass, so the content must already be JSON-ready
+    and valid, e.g. dicts built from :class:`~app.core.episode_store.EpisodeStore`
+    columns.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,13 +2,16 @@
 
 import logging
 
-from fastapi import APIRouter, Request, Response, HTTPException, status
+from fastapi import APIRouter, Depends, Request, Response, HTTPException, status
 from fastapi.responses import RedirectResponse
 
 from app.config import settings
 from app.core.session import create_session, get_session, clear_session
+from app.services.library_prefetch import library_prefetcher
+from app.services.rate_limiter import SpotifyRateLimited
 from app.services.spotify import SpotifyClient
-from app.api.deps import get_current_user
+from app.services.token_store import token_store
+from app.api.deps import get_spotify_client
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -37,17 +40,19 @@ async def login():
 @router.get("/callback")
 async def callback(
     request: Request,
-    response: Response,
     code: str | None = None,
     error: str | None = None,
 ):
     """
     Handle Spotify OAuth callback.
-    Exchanges authorization code for tokens and creates session.
+    Exchanges authorization code for tokens, stores them server-side and
+    creates a session cookie holding only the session id. The user's
+    library starts loading in the background, so the first playlist
+    request finds it cached.
     """
     if error:
         # User denied authorization or error occurred
-        logger.warning(f"OAuth callback received error: {error}")
+        logger.warning("OAuth callback received error: %s", error)
         return RedirectResponse(
             url=f"{settings.CORS_ORIGINS[0]}/?error={error}",
             status_code=status.HTTP_302_FOUND,
@@ -67,27 +72,29 @@ async def callback(
         token_data = await spotify.exchange_code_for_tokens(code)
         
         access_token = token_data["access_token"]
-        refresh_token = token_data.get("refresh_token")
         
         # Get user profile to get user ID
         spotify_with_token = SpotifyClient(access_token=access_token)
         user_profile = await spotify_with_token.get_user_profile()
         user_id = user_profile["id"]
         
-        logger.info(f"OAuth successful for user: {user_id}")
+        logger.info("OAuth successful for user: %s", user_id)
         
-        # Create session
-        create_session(response, user_id, access_token, refresh_token or "")
+        # Store tokens server-side and create session
+        session_id = await token_store.create_session(user_id, token_data)
+        library_prefetcher.prefetch(user_id, access_token)
         
-        # Redirect to frontend
-        return RedirectResponse(
+        # Redirect to frontend (the cookie must be set on the returned response)
+        redirect = RedirectResponse(
             url=f"{settings.CORS_ORIGINS[0]}/?login=success",
             status_code=status.HTTP_302_FOUND,
         )
+        create_session(redirect, session_id)
+        return redirect
     
     except Exception as e:
         # Log error with full exception details
-        logger.error(f"OAuth callback error: {e}", exc_info=True)
+        logger.error("OAuth callback error: %s", e, exc_info=True)
         return RedirectResponse(
             url=f"{settings.CORS_ORIGINS[0]}/?error=auth_failed",
             status_code=status.HTTP_302_FOUND,
@@ -95,24 +102,24 @@ async def callback(
 
 
 @router.get("/logout")
-async def logout(response: Response):
+async def logout(request: Request, response: Response):
     """
-    Logout user by clearing session.
+    Logout user by ending the server-side session and clearing the cookie.
     """
+    session = get_session(request)
+    if session and "sid" in session:
+        await token_store.delete_session(session["sid"])
     clear_session(response)
     return {"message": "Logged out successfully"}
 
 
 @router.get("/me")
-async def get_user_info(request: Request):
+async def get_user_info(spotify: SpotifyClient = Depends(get_spotify_client)):
     """
     Get current authenticated user information.
     """
     try:
-        user_data = await get_current_user(request)
-        
         # Get fresh user profile from Spotify
-        spotify = SpotifyClient(access_token=user_data["access_token"])
         user_profile = await spotify.get_user_profile()
         
         return {
@@ -121,11 +128,11 @@ async def get_user_info(request: Request):
             "email": user_profile.get("email"),
             "images": user_profile.get("images", []),
         }
-    except HTTPException:
+    except (HTTPException, SpotifyRateLimited):
         raise
     except Exception as e:
         # Log full error details for debugging (not exposed to client)
-        logger.error(f"Failed to get user info: {e}", exc_info=True)
+        logger.error("Failed to get user info: %s", e, exc_info=True)
         # Return generic error message to client (no sensitive details)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
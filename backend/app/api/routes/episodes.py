@@ -1,20 +1,108 @@
 """Episode-related routes."""
 
-from fastapi import APIRouter
+import base64
+import logging
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import Response
+
+from app.api.deps import EPISODE_FIELDS, get_current_user, get_episode_fields, get_spotify_client
+from app.api.responses import FastJSONResponse, etag_matches
+from app.api.schemas import Episode, EpisodePage
+from app.core.episode_store import EpisodeStore
+from app.core.metadata_store import metadata_store
+from app.services.library_cache import get_user_library
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/episodes", tags=["episodes"])
 
 
-@router.get("")
-async def get_episodes(limit: int = 50, offset: int = 0):
-    """Get user's saved episodes and followed podcasts."""
-    # TODO: Implement in Sprint 2
-    return {"message": "Episodes endpoint - to be implemented", "limit": limit, "offset": offset}
+def _encode_cursor(episode_id: str) -> str:
+    return base64.urlsafe_b64encode(episode_id.encode()).decode().rstrip("=")
+
+
+def _cursor_start(library: EpisodeStore, cursor: str) -> int:
+    """Row following the episode a cursor points at."""
+    try:
+        episode_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except ValueError:
+        index = None
+    else:
+        index = library.index_of(episode_id)
+    if index is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid or expired cursor. Start again from the first page.",
+        )
+    return index + 1
+
+
+@router.get("", response_model=EpisodePage)
+async def get_episodes(
+    limit: int = Query(50, ge=1),
+    cursor: str | None = None,
+    if_none_match: str | None = Header(None),
+    fields: tuple[str, ...] = Depends(get_episode_fields),
+    user: dict = Depends(get_current_user),
+    spotify: SpotifyClient = Depends(get_spotify_client),
+):
+    """
+    Get a page of user's saved episodes, most recently saved first.
+    
+    Pages continue after the last episode of the previous page
+    (``next_cursor``), not at a position, so episodes saved while paging
+    do not shift or repeat later pages. The ETag is derived from the
+    library fingerprint; sending it back in ``If-None-Match`` returns 304
+    with no body until the library changes. Pages are serialized straight
+    from the cached library's columns; ``fields=`` leaves out unneeded
+    episode fields such as ``description``.
+    """
+    try:
+        library = await get_user_library(user["user_id"], spotify)
+    except httpx.HTTPError as e:
+        logger.error("Failed to get saved episodes: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to retrieve episodes from Spotify. Please try again later.",
+        )
+
+    # Weak: the same page may be sent with different content encodings
+    projection = "" if fields == EPISODE_FIELDS else ",".join(fields)
+    etag = f'W/"{library.fingerprint}:{limit}:{cursor or ""}:{projection}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
+    start = _cursor_start(library, cursor) if cursor else 0
+    stop = min(start + limit, len(library))
+    next_cursor = _encode_cursor(library.ids[stop - 1]) if stop < len(library) else None
+    return FastJSONResponse(
+        {"items": library.episode_dicts(range(start, stop), fields), "next_cursor": next_cursor},
+        headers=headers,
+    )
 
-@router.get("/{episode_id}")
-async def get_episode(episode_id: str):
-    """Get episode details."""
-    # TODO: Implement in Sprint 2
-    return {"message": "Episode detail endpoint - to be implemented", "episode_id": episode_id}
 
+@router.get("/{episode_id}", response_model=Episode)
+async def get_episode(
+    episode_id: str,
+    spotify: SpotifyClient = Depends(get_spotify_client),
+):
+    """Get episode details, from the local metadata store when it has the episode."""
+    stored = await metadata_store.get_episodes([episode_id])
+    if len(stored):
+        return stored.episode(0)
+    try:
+        episodes = await spotify.get_episodes([episode_id])
+    except httpx.HTTPError as e:
+        logger.error("Failed to get episode %s: %s", episode_id, e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to retrieve episode from Spotify. Please try again later.",
+        )
+    if not episodes:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Episode not found")
+    return episodes[0]
@@ -1,20 +1,197 @@
 """Playlist-related routes."""
 
-from fastapi import APIRouter
+import asyncio
+import logging
+
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.api.deps import EPISODE_FIELDS, get_current_user, get_episode_fields, get_spotify_client
+from app.api.schemas import (
+    Playlist,
+    PlaylistGenerationRequest,
+    PlaylistJobStatus,
+    SavePlaylistRequest,
+    SavePlaylistResponse,
+)
+from app.core.metrics import generation_stage_seconds
+from app.services.library_cache import get_user_library
+from app.services.playlist_cache import get_playlist
+from app.services.playlist_jobs import Job, JobQueueFull, job_manager
+from app.services.playlist_saver import IdempotencyKeyConflict, PlaylistCreationFailed, playlist_saver
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/playlists", tags=["playlists"])
 
 
-@router.post("/generate")
-async def generate_playlist():
+async def _get_library(user: dict, spotify: SpotifyClient):
+    try:
+        return await get_user_library(user["user_id"], spotify)
+    except httpx.HTTPError as e:
+        logger.error("Failed to fetch library for playlist generation: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to retrieve episodes from Spotify. Please try again later.",
+        )
+
+
+def _episode_exclude(fields: tuple[str, ...]) -> set[str] | None:
+    """Episode fields left out by a ``fields=`` projection."""
+    return None if fields == EPISODE_FIELDS else set(EPISODE_FIELDS).difference(fields)
+
+
+def _playlist_response(playlist: Playlist, fields: tuple[str, ...]) -> Response:
+    """
+    Render an already validated playlist, timing serialization.
+
+    pydantic-core serializes the cached model directly, which beats
+    ``model_dump()`` followed by orjson; either way the response_model
+    validation and ``jsonable_encoder`` passes are skipped.
+    """
+    excluded = _episode_exclude(fields)
+    with generation_stage_seconds.time("serialize"):
+        if excluded is None:
+            content = playlist.model_dump_json()
+        else:
+            content = playlist.model_dump_json(exclude={"items": {"__all__": {"episode": excluded}}})
+    return Response(content=content, media_type="application/json")
+
+
+@router.post("/generate", response_model=Playlist)
+async def generate_playlist(
+    params: PlaylistGenerationRequest,
+    fields: tuple[str, ...] = Depends(get_episode_fields),
+    user: dict = Depends(get_current_user),
+    spotify: SpotifyClient = Depends(get_spotify_client),
+):
     """Generate a playlist based on run parameters."""
-    # TODO: Implement in Sprint 4
-    return {"message": "Generate playlist endpoint - to be implemented"}
+    library = await _get_library(user, spotify)
+    return _playlist_response(await get_playlist(user["user_id"], library, params), fields)
+
+
+@router.post("/regenerate", response_model=Playlist)
+async def regenerate_playlist(
+    params: PlaylistGenerationRequest,
+    fields: tuple[str, ...] = Depends(get_episode_fields),
+    user: dict = Depends(get_current_user),
+    spotify: SpotifyClient = Depends(get_spotify_client),
+):
+    """
+    Get a different playlist for the same run parameters.
+    
+    Returns the next of the alternatives generated with the first request
+    for these parameters, cycling back to the best one after the last.
+    """
+    library = await _get_library(user, spotify)
+    return _playlist_response(await get_playlist(user["user_id"], library, params, regenerate=True), fields)
+
+
+@router.post("/jobs", response_model=PlaylistJobStatus, status_code=status.HTTP_202_ACCEPTED)
+async def submit_playlist_job(
+    params: PlaylistGenerationRequest,
+    user: dict = Depends(get_current_user),
+    spotify: SpotifyClient = Depends(get_spotify_client),
+):
+    """
+    Start generating a playlist in the background.
+    
+    Returns the job at once; poll ``GET /jobs/{job_id}`` or stream
+    ``GET /jobs/{job_id}/events`` for progress and the result. Identical
+    submissions while a job is in flight return the same job.
+    """
+    try:
+        job = job_manager.submit(user["user_id"], params, spotify)
+    except JobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many playlists are being generated. Please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+    return job.to_status()
+
+
+def _get_job(job_id: str, user: dict) -> Job:
+    job = job_manager.get(job_id, user["user_id"])
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=PlaylistJobStatus)
+async def get_playlist_job(
+    job_id: str,
+    fields: tuple[str, ...] = Depends(get_episode_fields),
+    user: dict = Depends(get_current_user),
+):
+    """Get a playlist job's status, and its playlist once finished."""
+    # Polled repeatedly and nests a full playlist once finished; skip re-validation
+    excluded = _episode_exclude(fields)
+    job_status = _get_job(job_id, user).to_status()
+    if excluded is None:
+        content = job_status.model_dump_json()
+    else:
+        content = job_status.model_dump_json(exclude={"result": {"items": {"__all__": {"episode": excluded}}}})
+    return Response(content=content, media_type="application/json")
+
 
+@router.get("/jobs/{job_id}/events")
+async def stream_playlist_job(job_id: str, user: dict = Depends(get_current_user)):
+    """
+    Stream a playlist job's progress as server-sent events.
+    
+    Sends the current status at once and again on every change; the stream
+    ends after the final (succeeded/failed) event.
+    """
+    job = _get_job(job_id, user)
+    
+    async def events():
+        while True:
+            changed = job.changed
+            yield f"event: {job.status}\ndata: {job.to_status().model_dump_json()}\n\n"
+            if job.finished:
+                return
+            while not changed.is_set():
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
-@router.post("/save")
-async def save_playlist():
-    """Save generated playlist to Spotify."""
-    # TODO: Implement in Sprint 5
-    return {"message": "Save playlist endpoint - to be implemented"}
 
+@router.post("/save", response_model=SavePlaylistResponse)
+async def save_playlist(
+    request: SavePlaylistRequest,
+    user: dict = Depends(get_current_user),
+    spotify: SpotifyClient = Depends(get_spotify_client),
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+):
+    """
+    Save generated playlist to Spotify.
+    
+    Send an ``Idempotency-Key`` header to make retries safe: repeating a
+    completed save returns the same playlist, and repeating an interrupted
+    one continues it instead of creating another playlist.
+    """
+    try:
+        return await playlist_saver.save(user["user_id"], request, spotify, idempotency_key)
+    except IdempotencyKeyConflict:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different playlist.",
+        )
+    except (httpx.HTTPError, PlaylistCreationFailed) as e:
+        logger.error("Failed to save playlist: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Failed to save playlist to Spotify. Please try again.",
+        )
@@ -1,6 +1,8 @@
 """Pydantic schemas for request/response models."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from app.config import settings
 
 
 # Episode Models
@@ -15,10 +17,19 @@ class Episode(BaseModel):
     release_date: str | None = None
 
 
+class EpisodePage(BaseModel):
+    """Page of saved episodes."""
+    items: list[Episode]
+    next_cursor: str | None = None  # Pass as ?cursor= for the next page; None on the last page
+
+
 # Playlist Models
 class PlaylistGenerationRequest(BaseModel):
     """Request model for playlist generation."""
-    duration_minutes: int
+    duration_minutes: int = Field(
+        ge=settings.PLAYLIST_MIN_DURATION_MINUTES,
+        le=settings.PLAYLIST_MAX_DURATION_MINUTES,
+    )
     run_type: str  # "easy" | "tempo" | "long"
     content_preference: str  # "light" | "mixed" | "deep"
 
@@ -34,6 +45,17 @@ class Playlist(BaseModel):
     items: list[PlaylistItem]
     total_duration_minutes: float
     target_duration_minutes: int
+    alternative: int = 0  # Position among the alternatives generated for these parameters
+    alternatives: int = 1  # Number of alternatives generated
+
+
+class PlaylistJobStatus(BaseModel):
+    """Status of a background playlist generation job."""
+    job_id: str
+    status: str  # "queued" | "running" | "succeeded" | "failed"
+    stage: str  # "queued" | "fetching_library" | "optimizing" | "done"
+    result: Playlist | None = None
+    error: str | None = None
 
 
 class SavePlaylistRequest(BaseModel):
@@ -41,3 +63,10 @@ class SavePlaylistRequest(BaseModel):
     playlist_name: str
     episode_ids: list[str]
 
+
+class SavePlaylistResponse(BaseModel):
+    """Playlist saved to Spotify."""
+    playlist_id: str
+    playlist_url: str | None = None
+    episodes_added: int
+
@@ -9,6 +9,13 @@ class Settings(BaseSettings):
     # API Settings
     API_V1_PREFIX: str = "/api"
     
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # "text" or "json" (one object per line)
+    LOG_QUEUE_SIZE: int = 10_000  # Records waiting for the writer thread; more are dropped
+    LOG_RATE_LIMIT_PER_MESSAGE: int = 20  # Records per message template per period below ERROR (0 disables)
+    LOG_RATE_LIMIT_PERIOD_SECONDS: float = 10.0
+    
     # CORS Settings
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
     
@@ -16,10 +23,87 @@ class Settings(BaseSettings):
     SPOTIFY_CLIENT_ID: str = ""
     SPOTIFY_CLIENT_SECRET: str = ""
     SPOTIFY_REDIRECT_URI: str = "http://localhost:8000/api/auth/callback"
+    SPOTIFY_API_BASE_URL: str = "https://api.spotify.com/v1"
+    SPOTIFY_ACCOUNTS_BASE_URL: str = "https://accounts.spotify.com"
+    
+    # Spotify HTTP Client Settings (shared keep-alive pool)
+    SPOTIFY_HTTP2: bool = True
+    SPOTIFY_MAX_CONNECTIONS: int = 100
+    SPOTIFY_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    SPOTIFY_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    SPOTIFY_TIMEOUT_SECONDS: float = 10.0
+    SPOTIFY_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    SPOTIFY_PAGE_SIZE: int = 50  # Spotify maximum for library endpoints
+    SPOTIFY_PAGE_CONCURRENCY: int = 8  # Concurrent page/batch requests per fetch
+    
+    # Spotify Rate Limiting (token buckets, shared per app and per user)
+    SPOTIFY_RATE_LIMIT_PER_SECOND: float = 20.0
+    SPOTIFY_RATE_LIMIT_BURST: int = 100
+    SPOTIFY_USER_RATE_LIMIT_PER_SECOND: float = 10.0
+    SPOTIFY_USER_RATE_LIMIT_BURST: int = 50
+    SPOTIFY_INTERACTIVE_MAX_WAIT_SECONDS: float = 10.0  # Fail fast beyond this wait
+    SPOTIFY_BACKGROUND_MAX_WAIT_SECONDS: float = 120.0
+    SPOTIFY_MAX_RETRIES: int = 3  # For 429, 5xx and transport errors
+    SPOTIFY_BACKOFF_BASE_SECONDS: float = 0.5
+    SPOTIFY_BACKOFF_MAX_SECONDS: float = 8.0
     
     # Session Settings
     SECRET_KEY: str = "change-me-in-production"  # Should be set via env var
     SESSION_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    SESSION_CACHE_SIZE: int = 10_000  # Verified sessions kept in memory (0 disables)
+    TOKEN_STORE_MAX_MB: int = 16  # Server-side token store, memory backend only
+    TOKEN_REFRESH_MARGIN_SECONDS: int = 5 * 60  # Refresh access tokens this long before expiry
+    TOKEN_REFRESH_INTERVAL_SECONDS: int = 60  # Background refresh check interval
+    TOKEN_KEEP_WARM_SECONDS: int = 60 * 60  # Keep refreshing for users seen within this window
+    
+    # Library Cache Settings
+    CACHE_BACKEND: str = "memory"  # "memory" (per process) or "redis" (shared)
+    WEB_CONCURRENCY: int = 1  # Server worker processes (uvicorn/gunicorn read it too); >1 needs redis
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_KEY_PREFIX: str = "prp"
+    EPISODE_CACHE_TTL_SECONDS: int = 5 * 60  # Saved episodes
+    SHOW_CACHE_TTL_SECONDS: int = 60 * 60  # Followed show metadata
+    CACHE_STALE_SECONDS: int = 10 * 60  # Serve expired entries this long while refreshing
+    LIBRARY_FULL_SYNC_SECONDS: int = 6 * 60 * 60  # Full refetch interval; refreshes in between are incremental
+    LIBRARY_PREFETCH_ENABLED: bool = True  # Warm the library in the background after login and on session resume
+    LIBRARY_PREFETCH_IDLE_SECONDS: int = 30 * 60  # A request after this long without one resumes the session
+    LIBRARY_PREFETCH_MAX_CONCURRENT: int = 8  # Users warmed at once; further prefetches are skipped
+    EPISODE_CACHE_MAX_MB: int = 256  # Memory backend only
+    SHOW_CACHE_MAX_MB: int = 32  # Memory backend only
+    METADATA_STORE_ENABLED: bool = True  # Persist episode metadata and library order to disk across restarts
+    METADATA_STORE_PATH: str = "data/metadata.db"  # SQLite file, shared by worker processes on one host
+    METADATA_STORE_MMAP_MB: int = 256  # Memory-mapped read window
+    METADATA_STORE_RETENTION_DAYS: int = 30  # Libraries and episodes not written for this long are pruned
+    
+    # Playlist Generation Settings
+    PLAYLIST_DURATION_TOLERANCE_MINUTES: int = 5  # Allowed over/under vs. run duration
+    PLAYLIST_MIN_DURATION_MINUTES: int = 10  # Shortest run accepted
+    PLAYLIST_MAX_DURATION_MINUTES: int = 300  # Longest run accepted; optimizer memory grows with candidates x target
+    PLAYLIST_JOB_WORKERS: int = 4  # Concurrent background generation jobs
+    PLAYLIST_JOB_QUEUE_SIZE: int = 100  # Queued jobs beyond this are rejected with 503
+    PLAYLIST_JOB_RETENTION_SECONDS: int = 10 * 60  # Finished jobs kept for polling
+    PLAYLIST_PROCESS_WORKERS: int = 2  # Optimizer worker processes (0 runs everything inline)
+    PLAYLIST_OFFLOAD_MIN_CELLS: int = 10_000_000  # Candidates x capacity seconds x alternatives below which searches run inline
+    PLAYLIST_ALTERNATIVES: int = 5  # Distinct playlists generated per request, handed out by /regenerate
+    PLAYLIST_ALTERNATIVES_TTL_SECONDS: int = 6 * 60 * 60  # Keyed by library fingerprint, so library changes miss anyway
+    PLAYLIST_CACHE_MAX_MB: int = 32  # Memory backend only
+    PLAYLIST_SAVE_RECORD_TTL_SECONDS: int = 24 * 60 * 60  # Idempotency-Key records for /save
+    
+    # Request Profiling Settings (stack sampling of the event loop thread)
+    PROFILE_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled
+    PROFILE_SLOW_REQUEST_MS: float = 0.0  # Also profile requests slower than this (0 disables)
+    PROFILE_INTERVAL_MS: float = 5.0  # Stack sampling interval
+    PROFILE_WINDOW_SECONDS: int = 60  # Samples kept; longer requests lose their start
+    PROFILE_DIR: str = "profiles"  # Collapsed-stack files, one per profiled request
+    PROFILE_MAX_FILES: int = 100  # Oldest profiles are deleted beyond this
+    PROFILE_TRIGGER_TOKEN: str = ""  # Enables POST /debug/profile when set
+    PROFILE_TRIGGER_MAX_REQUESTS: int = 1000  # Upper bound for one trigger
+    
+    # Response Compression Settings
+    COMPRESSION_ENABLED: bool = True  # brotli (if installed) or gzip, negotiated per request
+    COMPRESSION_MIN_BYTES: int = 1024  # Smaller bodies are sent as is
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; higher is smaller but far slower
+    COMPRESSION_GZIP_LEVEL: int = 5  # 1-9
     
     class Config:
         """Pydantic config."""
@@ -0,0 +1,199 @@
+"""Async read-through cache with TTL, single-flight loads and stale-while-revalidate."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, TypeVar
+
+from app.core.cache_backends import CacheBackend
+from app.core.metrics import registry
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# Every AsyncCache in the process, for the metrics at the end of this module
+_caches: list["AsyncCache"] = []
+
+
+@dataclass
+class CacheStats:
+    """Cache counters."""
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+
+
+class AsyncCache(Generic[V]):
+    """
+    Async read-through cache keyed by string.
+
+    - Entries younger than ``ttl_seconds`` are served as fresh hits.
+    - Entries up to ``stale_seconds`` past their TTL are served immediately
+      while one background refresh reloads them.
+    - Concurrent misses for the same key share one load (single-flight,
+      per process).
+    - Storage, size bounds and eviction are delegated to a CacheBackend.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        stale_seconds: float,
+        backend: CacheBackend,
+        retain_seconds: float | None = None,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            name: Cache name used in logs and stats
+            ttl_seconds: Time an entry is served as fresh
+            stale_seconds: Extra time an expired entry may be served while refreshing
+            backend: Storage backend
+            retain_seconds: How long the backend keeps an entry as the base for
+                an incremental refresh (defaults to TTL plus stale window)
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.backend = backend
+        self.retain_seconds = max(retain_seconds or 0, ttl_seconds + stale_seconds)
+        self.stats = CacheStats()
+        self._inflight: dict[str, asyncio.Task] = {}
+        _caches.append(self)
+
+    async def get(self, key: str, loader: Callable[[V | None], Awaitable[V]]) -> V:
+        """
+        Get a value, loading it with ``loader`` on a miss.
+
+        The loader receives the previous value for ``key`` if one is still
+        stored (expired or not), so it can refresh incrementally; otherwise
+        None.
+
+        Args:
+            key: Cache key
+            loader: Coroutine function producing a fresh value from the previous one
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        entry = await self.backend.get(key)
+        previous = None
+        if entry is not None:
+            loaded_at, previous = entry
+            age = time.time() - loaded_at
+            if age < self.ttl_seconds:
+                self.stats.hits += 1
+                return previous
+            if age < self.ttl_seconds + self.stale_seconds:
+                self.stats.stale_hits += 1
+                self._load(key, loader, previous)
+                return previous
+
+        self.stats.misses += 1
+        return await asyncio.shield(self._load(key, loader, previous))
+
+    async def set(self, key: str, value: V) -> None:
+        """
+        Store a freshly loaded value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        await self.backend.set(
+            key,
+            value,
+            loaded_at=time.time(),
+            expire_seconds=self.retain_seconds,
+        )
+
+    async def invalidate(self, key: str) -> None:
+        """
+        Drop a cached value.
+
+        Args:
+            key: Cache key
+        """
+        await self.backend.delete(key)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get counters and backend occupancy.
+
+        Returns:
+            Dict of stats
+        """
+        lookups = self.stats.hits + self.stats.stale_hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            "hit_ratio": round((self.stats.hits + self.stats.stale_hits) / lookups, 4) if lookups else 0.0,
+            "backend": type(self.backend).__name__,
+            **self.backend.snapshot(),
+        }
+
+    def _load(
+        self,
+        key: str,
+        loader: Callable[[V | None], Awaitable[V]],
+        previous: V | None,
+    ) -> asyncio.Task:
+        """Start a load for ``key`` unless one is already in flight."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, loader, previous))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Clear the in-flight marker; failures are reported by ``_refresh``."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh(
+        self,
+        key: str,
+        loader: Callable[[V | None], Awaitable[V]],
+        previous: V | None,
+    ) -> V:
+        """Run ``loader`` and store its result."""
+        self.stats.refreshes += 1
+        try:
+            value = await loader(previous)
+        except Exception as e:
+            self.stats.refresh_errors += 1
+            logger.warning("Cache %s: load failed for %r: %s", self.name, key, e)
+            raise
+        await self.set(key, value)
+        return value
+
+
+registry.counter_callback(
+    "cache_lookups_total",
+    "Cache lookups by result (hit, stale, miss).",
+    ("cache", "result"),
+    lambda: {
+        (cache.name, result): count
+        for cache in _caches
+        for result, count in (
+            ("hit", cache.stats.hits),
+            ("stale", cache.stats.stale_hits),
+            ("miss", cache.stats.misses),
+        )
+    },
+)
+registry.gauge_callback(
+    "cache_hit_ratio",
+    "Share of cache lookups served from cache (fresh or stale).",
+    ("cache",),
+    lambda: {(cache.name,): cache.snapshot()["hit_ratio"] for cache in _caches},
+)
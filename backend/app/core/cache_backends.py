@@ -0,0 +1,265 @@
+"""Storage backends for AsyncCache."""
+
+import logging
+import math
+import struct
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from app.config import settings
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Load timestamp stored in front of each serialized value
+_HEADER = struct.Struct("<d")
+
+# Shared Redis connection pool, created on first use
+_redis_client = None
+
+
+class CacheBackend(ABC):
+    """Key/value storage behind an AsyncCache."""
+
+    @abstractmethod
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        """
+        Get a stored value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (load timestamp, value), or None if absent
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, loaded_at: float, expire_seconds: float) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            loaded_at: Wall-clock time the value was loaded
+            expire_seconds: Time after which the backend may drop the value
+        """
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """
+        Drop a stored value.
+
+        Args:
+            key: Cache key
+        """
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Get backend-specific occupancy counters.
+
+        Returns:
+            Dict of stats
+        """
+        return {}
+
+
+class MemoryBackend(CacheBackend):
+    """
+    In-process storage bounded by an estimated byte budget (LRU eviction).
+
+    Entries expire after ``expire_seconds`` like they do in Redis: an
+    expired entry reads as a miss, and expired entries at the LRU end are
+    dropped on every write so unread ones do not linger until evicted.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int]):
+        """
+        Initialize backend.
+
+        Args:
+            max_bytes: Upper bound on the summed size of all values
+            sizeof: Function estimating the size of a value in bytes
+        """
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.evictions = 0
+        # key -> (loaded_at, value, size, expires_at)
+        self._entries: OrderedDict[str, tuple[float, Any, int, float]] = OrderedDict()
+        self._total_bytes = 0
+
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[3] <= time.time():
+            await self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    async def set(self, key: str, value: Any, loaded_at: float, expire_seconds: float) -> None:
+        await self.delete(key)
+        now = time.time()
+        size = self.sizeof(value)
+        # Same one second floor as the Redis backend
+        self._entries[key] = (loaded_at, value, size, now + max(1, expire_seconds))
+        self._total_bytes += size
+
+        # Least recently used first, so expired entries collect at the front
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if oldest[3] > now:
+                break
+            await self.delete(oldest_key)
+
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_key, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+            self._total_bytes -= evicted_size
+            self.evictions += 1
+            logger.debug("Evicted %r (%s bytes)", evicted_key, evicted_size)
+
+    async def delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+class RedisBackend(CacheBackend):
+    """
+    Storage in Redis (or any server speaking the Redis protocol).
+
+    Values are serialized with the supplied ``dumps``/``loads`` pair and
+    expire server-side; memory bounds and eviction are left to the server's
+    ``maxmemory`` policy (``allkeys-lru`` recommended). Redis errors are
+    logged and treated as misses so an outage degrades to upstream fetches.
+    """
+
+    def __init__(
+        self,
+        client,
+        namespace: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+    ):
+        """
+        Initialize backend.
+
+        Args:
+            client: ``redis.asyncio.Redis`` compatible client
+            namespace: Prefix for all keys written by this backend
+            dumps: Value serializer
+            loads: Value deserializer
+        """
+        self.client = client
+        self.namespace = namespace
+        self.dumps = dumps
+        self.loads = loads
+        self.errors = 0
+
+    async def get(self, key: str) -> tuple[float, Any] | None:
+        try:
+            data = await self.client.get(f"{self.namespace}:{key}")
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Redis get failed for %s:%s: %s", self.namespace, key, e)
+            return None
+        if data is None:
+            return None
+        try:
+            (loaded_at,) = _HEADER.unpack_from(data)
+            return loaded_at, self.loads(data[_HEADER.size:])
+        except Exception as e:
+            # Written by an incompatible version; reload from upstream
+            logger.warning("Undecodable cache value for %s:%s: %s", self.namespace, key, e)
+            return None
+
+    async def set(self, key: str, value: Any, loaded_at: float, expire_seconds: float) -> None:
+        data = _HEADER.pack(loaded_at) + self.dumps(value)
+        try:
+            await self.client.set(
+                f"{self.namespace}:{key}",
+                data,
+                ex=max(1, math.ceil(expire_seconds)),
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Redis set failed for %s:%s: %s", self.namespace, key, e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(f"{self.namespace}:{key}")
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Redis delete failed for %s:%s: %s", self.namespace, key, e)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"errors": self.errors}
+
+
+def get_redis_client():
+    """
+    Get the shared Redis client, creating it on first use.
+
+    Returns:
+        ``redis.asyncio.Redis`` client for ``CACHE_REDIS_URL``
+    """
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from e
+        _redis_client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+    return _redis_client
+
+
+async def close_redis_client() -> None:
+    """Close the shared Redis client if it was created."""
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+
+def create_backend(
+    name: str,
+    max_bytes: int,
+    sizeof: Callable[[Any], int],
+    dumps: Callable[[Any], bytes],
+    loads: Callable[[bytes], Any],
+) -> CacheBackend:
+    """
+    Create the backend selected by ``CACHE_BACKEND``.
+
+    Args:
+        name: Cache name, used as the Redis key namespace
+        max_bytes: Memory budget for the in-process backend
+        sizeof: Size estimator for the in-process backend
+        dumps: Serializer for the Redis backend
+        loads: Deserializer for the Redis backend
+
+    Returns:
+        CacheBackend
+    """
+    if settings.CACHE_BACKEND == "redis":
+        return RedisBackend(
+            get_redis_client(),
+            namespace=f"{settings.CACHE_KEY_PREFIX}:{name}",
+            dumps=dumps,
+            loads=loads,
+        )
+    if settings.CACHE_BACKEND != "memory":
+        raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND!r}")
+    return MemoryBackend(max_bytes=max_bytes, sizeof=sizeof)
@@ -0,0 +1,105 @@
+"""Compact binary encoding helpers for cached values."""
+
+import struct
+from collections.abc import Sequence
+
+import numpy as np
+
+_LENGTH = struct.Struct("<Q")
+
+
+def pack_strings(values: Sequence[str | None]) -> bytes:
+    """
+    Encode a list of optional strings as one length table plus one blob.
+
+    Args:
+        values: Strings (None allowed)
+
+    Returns:
+        Encoded bytes
+    """
+    encoded = [value.encode() if value is not None else None for value in values]
+    lengths = np.array(
+        [len(value) if value is not None else -1 for value in encoded],
+        dtype="<i4",
+    )
+    blob = b"".join(value for value in encoded if value)
+    return _LENGTH.pack(len(values)) + lengths.tobytes() + blob
+
+
+def unpack_strings(data: bytes) -> list[str | None]:
+    """
+    Decode bytes produced by :func:`pack_strings`.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        List of optional strings
+    """
+    (count,) = _LENGTH.unpack_from(data)
+    header = _LENGTH.size + 4 * count
+    lengths = np.frombuffer(data, dtype="<i4", count=count, offset=_LENGTH.size).tolist()
+    values: list[str | None] = []
+    position = header
+    for length in lengths:
+        if length < 0:
+            values.append(None)
+            continue
+        values.append(data[position:position + length].decode())
+        position += length
+    return values
+
+
+def unpack_required_strings(data: bytes) -> list[str]:
+    """
+    Decode bytes produced by :func:`pack_strings` from strings that are never None.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        List of strings
+
+    Raises:
+        ValueError: If a value is None
+    """
+    values = unpack_strings(data)
+    strings = [value for value in values if value is not None]
+    if len(strings) != len(values):
+        raise ValueError("Unexpected missing string")
+    return strings
+
+
+def pack_sections(sections: list[bytes]) -> bytes:
+    """
+    Concatenate byte sections with length prefixes.
+
+    Args:
+        sections: Byte sections
+
+    Returns:
+        Encoded bytes
+    """
+    return b"".join(_LENGTH.pack(len(section)) + section for section in sections)
+
+
+def unpack_sections(data: bytes) -> list[bytes]:
+    """
+    Split bytes produced by :func:`pack_sections`.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        Byte sections
+    """
+    sections: list[bytes] = []
+    view = memoryview(data)
+    position = 0
+    while position < len(data):
+        (length,) = _LENGTH.unpack_from(data, position)
+        position += _LENGTH.size
+        sections.append(bytes(view[position:position + length]))
+        position += length
+    return sections
@@ -0,0 +1,137 @@
+"""Negotiated brotli/gzip response compression."""
+
+import asyncio
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.core.metrics import registry
+
+try:
+    import brotli  # type: ignore[import-untyped]
+except ImportError:  # Optional; only gzip is offered without it
+    brotli = None
+
+# zlib and brotli release the GIL; bodies this large compress on a worker thread
+_OFFLOAD_BYTES = 64 * 1024
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+compression_saved_bytes = registry.counter(
+    "http_compression_saved_bytes_total",
+    "Response body bytes saved by compression.",
+    ("encoding",),
+)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick a response encoding from an ``Accept-Encoding`` header.
+
+    Brotli (when installed) is preferred over gzip at equal weight;
+    ``q=0`` rules an encoding out and ``*`` covers encodings not listed.
+
+    Args:
+        accept_encoding: Header value
+
+    Returns:
+        "br", "gzip", or None to send the body as is
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in ("br", "gzip") if brotli is not None else ("gzip",):
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "br" or "gzip"
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON and text responses.
+
+    The encoding is negotiated per request from ``Accept-Encoding``.
+    Bodies below ``COMPRESSION_MIN_BYTES``, responses that already carry a
+    ``Content-Encoding`` and streamed responses (server-sent events must
+    not be buffered) are sent unchanged, as is any body that would not
+    shrink.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            passthrough = True
+            headers = MutableHeaders(scope=start_message)
+            body = message.get("body", b"")
+            if not headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES) or "content-encoding" in headers:
+                await send(start_message)
+                await send(message)
+                return
+
+            # The body depends on Accept-Encoding whenever it could be compressed
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is None or message.get("more_body", False) or len(body) < settings.COMPRESSION_MIN_BYTES:
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= _OFFLOAD_BYTES:
+                compressed = await asyncio.to_thread(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+            if len(compressed) < len(body):
+                compression_saved_bytes.inc(encoding, amount=len(body) - len(compressed))
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                message = {"type": "http.response.body", "body": compressed}
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -1,19 +1,197 @@
 """Content classification for episodes."""
 
-# TODO: Implement in Sprint 4
-# This will classify episodes as "light", "mixed", or "deep"
+import hashlib
+import re
+import string
+from collections.abc import Iterable, Sequence
+
+# Keyword lexicon (lowercase). Light keywords pull towards "light", deep
+# keywords towards "deep"; episodes with no clear lean are "mixed".
+LIGHT_KEYWORDS = (
+    "comedy", "comedian", "funny", "hilarious", "laugh", "laughs", "jokes",
+    "banter", "chat", "chats", "hangout", "gossip", "celebrity", "celebrities",
+    "pop culture", "trivia", "quiz", "games", "gaming", "reaction", "recap",
+    "rewatch", "storytime", "improv", "sketch", "silly", "fun", "sports",
+    "fantasy football", "movie", "movies", "tv", "reality tv", "dating",
+    "roast", "listener questions", "mailbag", "behind the scenes",
+)
+DEEP_KEYWORDS = (
+    "science", "scientist", "scientific", "research", "researcher", "study",
+    "history", "historian", "philosophy", "philosopher", "economics",
+    "economy", "politics", "political", "policy", "geopolitics", "analysis",
+    "deep dive", "in-depth", "investigation", "investigative", "explained",
+    "theory", "lecture", "psychology", "neuroscience", "physics", "biology",
+    "mathematics", "climate", "technology", "artificial intelligence",
+    "ethics", "documentary", "war", "democracy", "medicine", "evidence",
+    "long-form", "masterclass",
+)
+
+# Durations used as a weak signal (very short episodes skew light)
+SHORT_EPISODE_MS = 20 * 60 * 1000
+LONG_EPISODE_MS = 90 * 60 * 1000
+
+# Net keyword score at which an episode is no longer "mixed"
+CLASS_THRESHOLD = 2
+
+# Classification results kept per episode id
+MAX_CACHED_EPISODES = 200_000
+
+# Punctuation and whitespace become plain spaces before scanning, so every
+# word starts right after a " " (hyphens are kept for "in-depth" etc.)
+_SEPARATORS = str.maketrans({char: " " for char in string.punctuation.replace("-", "") + string.whitespace})
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Build a regex alternation that shares common prefixes.
+
+    Python's regex engine tries alternatives one by one, so a flat
+    ``a|b|c`` over a large lexicon costs one attempt per keyword at every
+    position. Nesting alternatives by shared prefix (a trie) makes each
+    position cost roughly one walk down the trie, as in Aho-Corasick.
+
+    Args:
+        words: Keywords
+
+    Returns:
+        Regex source matching any keyword
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if terminal else body
+
+    return render(trie)
+
+
+class ContentClassifier:
+    """
+    Keyword-based light/mixed/deep classifier with a per-episode result cache.
+
+    The lexicon is compiled once into a single trie-shaped regex, so each
+    description is scanned in one pass regardless of lexicon size. Text is
+    lowercased and normalized to space-separated words first, which lets the
+    pattern start with a literal space: the regex engine then jumps between
+    word starts instead of trying the trie at every character. Results are
+    stored per episode id together with a hash of the classified text;
+    episodes whose text has not changed are never rescanned.
+    """
+
+    def __init__(
+        self,
+        light_keywords: Sequence[str] = LIGHT_KEYWORDS,
+        deep_keywords: Sequence[str] = DEEP_KEYWORDS,
+        max_cached: int = MAX_CACHED_EPISODES,
+    ):
+        """
+        Initialize classifier.
+
+        Args:
+            light_keywords: Keywords indicating light content
+            deep_keywords: Keywords indicating deep content
+            max_cached: Maximum number of cached episode results
+        """
+        self.weights = {word: -1 for word in light_keywords}
+        self.weights.update({word: 1 for word in deep_keywords})
+        self.pattern = re.compile(" (" + _trie_pattern(self.weights) + r")(?!\w)")
+        self.max_cached = max_cached
+        self._cache: dict[str, tuple[bytes, str]] = {}
+
+    def score_text(self, text: str) -> int:
+        """
+        Score text by keyword hits (negative is light, positive is deep).
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Net keyword score
+        """
+        normalized = " " + text.lower().translate(_SEPARATORS)
+        weights = self.weights
+        return sum(weights[match] for match in self.pattern.findall(normalized))
+
+    def classify_episodes(self, episodes: Sequence) -> list[str]:
+        """
+        Classify a batch of episodes, reusing cached results.
+
+        Args:
+            episodes: Episode objects
+
+        Returns:
+            Content type per episode: "light", "mixed", or "deep"
+        """
+        cache = self._cache
+        results: list[str] = []
+        for episode in episodes:
+            text = f"{episode.name}\n{episode.podcast_name}\n{episode.description or ''}"
+            digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+            cached = cache.get(episode.id)
+            if cached is not None and cached[0] == digest:
+                results.append(cached[1])
+                continue
+
+            content_type = self._classify(self.score_text(text), episode.duration_ms)
+            cache[episode.id] = (digest, content_type)
+            results.append(content_type)
+
+        if len(cache) > self.max_cached:
+            # Drop the oldest half (dicts keep insertion order)
+            for key in list(cache)[: len(cache) // 2]:
+                del cache[key]
+        return results
+
+    @staticmethod
+    def _classify(score: int, duration_ms: int) -> str:
+        if duration_ms and duration_ms < SHORT_EPISODE_MS:
+            score -= 1
+        elif duration_ms > LONG_EPISODE_MS:
+            score += 1
+
+        if score >= CLASS_THRESHOLD:
+            return "deep"
+        if score <= -CLASS_THRESHOLD:
+            return "light"
+        return "mixed"
+
+
+# Shared classifier (and result cache) for the process
+classifier = ContentClassifier()
+
+
+def classify_episodes(episodes: Sequence) -> list[str]:
+    """
+    Classify a batch of episodes' content types.
+
+    Args:
+        episodes: Episode objects
+
+    Returns:
+        Content type per episode: "light", "mixed", or "deep"
+    """
+    return classifier.classify_episodes(episodes)
 
 
 def classify_episode(episode):
     """
     Classify an episode's content type.
-    
+
     Args:
         episode: Episode object
-    
+
     Returns:
         Content type: "light", "mixed", or "deep"
     """
-    # TODO: Implement in Sprint 4
-    raise NotImplementedError("Content classification not yet implemented")
-
+    return classifier.classify_episodes([episode])[0]
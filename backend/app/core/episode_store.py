@@ -0,0 +1,513 @@
+"""Columnar in-memory store for a user's episode library."""
+
+import hashlib
+import struct
+import time
+import zlib
+from collections.abc import Iterable, Sequence
+from datetime import date
+
+import numpy as np
+
+from app.api.schemas import Episode
+from app.core.codec import pack_sections, pack_strings, unpack_required_strings, unpack_sections, unpack_strings
+
+# Binary format marker for to_bytes/from_bytes
+_FORMAT = b"EPS5"
+_TIMESTAMP = struct.Struct("<d")
+_FINGERPRINT = struct.Struct("<Q")
+_COUNT = struct.Struct("<q")
+
+# Content class codes stored in the ``content_class`` column
+CONTENT_CLASSES = ("unknown", "light", "mixed", "deep")
+CONTENT_CLASS_CODES = {name: code for code, name in enumerate(CONTENT_CLASSES)}
+
+# Content classes acceptable for each content preference. Unclassified
+# episodes are always kept so an unclassified library still yields playlists.
+PREFERENCE_CLASSES = {
+    "light": ("unknown", "light", "mixed"),
+    "mixed": CONTENT_CLASSES,
+    "deep": ("unknown", "mixed", "deep"),
+}
+
+
+def release_date_ordinal(release_date: str | None) -> int:
+    """
+    Convert a Spotify release date to a proleptic Gregorian ordinal.
+
+    Spotify reports dates with year, month or day precision ("2024",
+    "2024-03", "2024-03-15"); missing parts default to the first.
+
+    Args:
+        release_date: Release date string or None
+
+    Returns:
+        Date ordinal, or 0 if the date is missing or malformed
+    """
+    if not release_date:
+        return 0
+    parts = release_date.split("-")
+    try:
+        year = int(parts[0])
+        month = int(parts[1]) if len(parts) > 1 else 1
+        day = int(parts[2]) if len(parts) > 2 else 1
+        return date(year, month, day).toordinal()
+    except (ValueError, IndexError):
+        return 0
+
+
+# Separates hashed fields; None is hashed as _NONE so it differs from ""
+_FIELD_SEPARATOR = "\x1f"
+_NONE = "\x00"
+
+
+def _hash_sum(hashes: np.ndarray) -> int:
+    """Sum hashes modulo 2**64 (uint64 addition wraps)."""
+    return int(hashes.sum(dtype=np.uint64))
+
+
+class EpisodeStore:
+    """
+    Episode library held as NumPy columns plus interned string tables.
+
+    Numeric fields used for candidate filtering live in parallel arrays, so
+    filtering by content preference, duration window and recency is a handful
+    of vectorized mask operations. Podcast ids and names are interned into
+    tables referenced by ``podcast_idx``. Pydantic ``Episode`` objects are
+    only built on demand via :meth:`episode`.
+
+    ``fingerprint`` identifies the library contents: the row count plus the
+    sum (mod 2**64) of per-row hashes of every rendered field and the row's
+    position counted from the end (see :meth:`row_hashes`). Rows keep their
+    position from the end when episodes are prepended, so :meth:`prepend`
+    updates the sum from the new rows alone, while any added, removed,
+    changed or reordered episode changes it.
+    """
+
+    def __init__(
+        self,
+        ids: list[str],
+        names: list[str],
+        descriptions: list[str | None],
+        release_dates: list[str | None],
+        podcast_ids: list[str],
+        podcast_names: list[str],
+        duration_ms: np.ndarray,
+        podcast_idx: np.ndarray,
+        release_ordinal: np.ndarray,
+        content_class: np.ndarray,
+        full_synced_at: float | None = None,
+        hash_sum: int | None = None,
+        unavailable: int = 0,
+    ):
+        """
+        Initialize store from prebuilt columns.
+
+        Args:
+            ids: Episode ids
+            names: Episode names
+            descriptions: Episode descriptions
+            release_dates: Release date strings as reported by Spotify
+            podcast_ids: Interned podcast id table
+            podcast_names: Interned podcast name table (parallel to podcast_ids)
+            duration_ms: Episode durations in milliseconds (int64)
+            podcast_idx: Index into the podcast tables per episode (int32)
+            release_ordinal: Release date ordinal per episode, 0 if unknown (int32)
+            content_class: Content class code per episode (int8)
+            full_synced_at: Wall-clock time of the last full fetch (defaults to now)
+            hash_sum: Precomputed sum of :meth:`row_hashes` (computed if None)
+            unavailable: Saved items Spotify lists without an episode (counted
+                in its library total but not stored here)
+        """
+        self.ids = ids
+        self.names = names
+        self.descriptions = descriptions
+        self.release_dates = release_dates
+        self.podcast_ids = podcast_ids
+        self.podcast_names = podcast_names
+        self.duration_ms = duration_ms
+        self.podcast_idx = podcast_idx
+        self.release_ordinal = release_ordinal
+        self.content_class = content_class
+        self.full_synced_at = time.time() if full_synced_at is None else full_synced_at
+        self.unavailable = unavailable
+        self._id_index: dict[str, int] | None = None
+        self.hash_sum = _hash_sum(self.row_hashes()) if hash_sum is None else hash_sum
+
+    @classmethod
+    def from_episodes(
+        cls,
+        episodes: Iterable,
+        content_classes: Sequence[str] | None = None,
+        unavailable: int = 0,
+    ) -> "EpisodeStore":
+        """
+        Build a store from episode objects.
+
+        Args:
+            episodes: Episode models (anything with the Episode attributes)
+            content_classes: Optional content class per episode
+            unavailable: Saved items Spotify lists without an episode
+
+        Returns:
+            EpisodeStore
+        """
+        ids: list[str] = []
+        names: list[str] = []
+        descriptions: list[str | None] = []
+        release_dates: list[str | None] = []
+        durations: list[int] = []
+        podcast_indices: list[int] = []
+        podcast_lookup: dict[str, int] = {}
+        podcast_ids: list[str] = []
+        podcast_names: list[str] = []
+
+        for episode in episodes:
+            podcast_index = podcast_lookup.get(episode.podcast_id)
+            if podcast_index is None:
+                podcast_index = len(podcast_ids)
+                podcast_lookup[episode.podcast_id] = podcast_index
+                podcast_ids.append(episode.podcast_id)
+                podcast_names.append(episode.podcast_name)
+
+            ids.append(episode.id)
+            names.append(episode.name)
+            descriptions.append(episode.description)
+            release_dates.append(episode.release_date)
+            durations.append(episode.duration_ms)
+            podcast_indices.append(podcast_index)
+
+        if content_classes is None:
+            content_class = np.zeros(len(ids), dtype=np.int8)
+        else:
+            content_class = np.array(
+                [CONTENT_CLASS_CODES.get(name, 0) for name in content_classes],
+                dtype=np.int8,
+            )
+
+        return cls(
+            ids=ids,
+            names=names,
+            descriptions=descriptions,
+            release_dates=release_dates,
+            podcast_ids=podcast_ids,
+            podcast_names=podcast_names,
+            duration_ms=np.array(durations, dtype=np.int64),
+            podcast_idx=np.array(podcast_indices, dtype=np.int32),
+            release_ordinal=np.array(
+                [release_date_ordinal(value) for value in release_dates],
+                dtype=np.int32,
+            ),
+            content_class=content_class,
+            unavailable=unavailable,
+        )
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize to a compact binary form (zlib-compressed columns).
+
+        Returns:
+            Encoded bytes
+        """
+        payload = pack_sections([
+            pack_strings(self.ids),
+            pack_strings(self.names),
+            pack_strings(self.descriptions),
+            pack_strings(self.release_dates),
+            pack_strings(self.podcast_ids),
+            pack_strings(self.podcast_names),
+            self.duration_ms.astype("<i8").tobytes(),
+            self.podcast_idx.astype("<i4").tobytes(),
+            self.release_ordinal.astype("<i4").tobytes(),
+            self.content_class.astype("i1").tobytes(),
+            _TIMESTAMP.pack(self.full_synced_at),
+            _FINGERPRINT.pack(self.hash_sum),
+            _COUNT.pack(self.unavailable),
+        ])
+        return _FORMAT + zlib.compress(payload, 1)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "EpisodeStore":
+        """
+        Deserialize bytes produced by :meth:`to_bytes`.
+
+        Args:
+            data: Encoded bytes
+
+        Returns:
+            EpisodeStore
+        """
+        if data[:len(_FORMAT)] != _FORMAT:
+            raise ValueError("Unsupported EpisodeStore encoding")
+        (
+            ids,
+            names,
+            descriptions,
+            release_dates,
+            podcast_ids,
+            podcast_names,
+            duration_ms,
+            podcast_idx,
+            release_ordinal,
+            content_class,
+            full_synced_at,
+            hash_sum,
+            unavailable,
+        ) = unpack_sections(zlib.decompress(data[len(_FORMAT):]))
+        return cls(
+            ids=unpack_required_strings(ids),
+            names=unpack_required_strings(names),
+            descriptions=unpack_strings(descriptions),
+            release_dates=unpack_strings(release_dates),
+            podcast_ids=unpack_required_strings(podcast_ids),
+            podcast_names=unpack_required_strings(podcast_names),
+            duration_ms=np.frombuffer(duration_ms, dtype="<i8").astype(np.int64),
+            podcast_idx=np.frombuffer(podcast_idx, dtype="<i4").astype(np.int32),
+            release_ordinal=np.frombuffer(release_ordinal, dtype="<i4").astype(np.int32),
+            content_class=np.frombuffer(content_class, dtype="i1").astype(np.int8),
+            full_synced_at=_TIMESTAMP.unpack(full_synced_at)[0],
+            hash_sum=_FINGERPRINT.unpack(hash_sum)[0],
+            unavailable=_COUNT.unpack(unavailable)[0],
+        )
+
+    def prepend(
+        self,
+        episodes: Sequence,
+        content_classes: Sequence[str] | None = None,
+        unavailable: int = 0,
+    ) -> "EpisodeStore":
+        """
+        Build a new store with ``episodes`` placed before the existing rows.
+
+        Used to merge newly saved episodes into a cached library. Podcast
+        tables are extended rather than rebuilt; ``full_synced_at`` carries
+        over since this is not a full fetch, and the fingerprint is updated
+        from the new rows alone.
+
+        Args:
+            episodes: New episode models, newest first
+            content_classes: Optional content class per new episode
+            unavailable: New saved items Spotify lists without an episode
+
+        Returns:
+            New EpisodeStore (this one is left unchanged)
+        """
+        delta = EpisodeStore.from_episodes(episodes, content_classes)
+
+        podcast_ids = list(self.podcast_ids)
+        podcast_names = list(self.podcast_names)
+        lookup = {podcast_id: index for index, podcast_id in enumerate(podcast_ids)}
+        remap = np.empty(len(delta.podcast_ids), dtype=np.int32)
+        for delta_index, podcast_id in enumerate(delta.podcast_ids):
+            index = lookup.get(podcast_id)
+            if index is None:
+                index = len(podcast_ids)
+                podcast_ids.append(podcast_id)
+                podcast_names.append(delta.podcast_names[delta_index])
+            remap[delta_index] = index
+
+        return EpisodeStore(
+            ids=delta.ids + self.ids,
+            names=delta.names + self.names,
+            descriptions=delta.descriptions + self.descriptions,
+            release_dates=delta.release_dates + self.release_dates,
+            podcast_ids=podcast_ids,
+            podcast_names=podcast_names,
+            duration_ms=np.concatenate([delta.duration_ms, self.duration_ms]),
+            podcast_idx=np.concatenate([remap[delta.podcast_idx], self.podcast_idx]),
+            release_ordinal=np.concatenate([delta.release_ordinal, self.release_ordinal]),
+            content_class=np.concatenate([delta.content_class, self.content_class]),
+            full_synced_at=self.full_synced_at,
+            hash_sum=(self.hash_sum + _hash_sum(delta.row_hashes(rows_after=len(self)))) % 2**64,
+            unavailable=self.unavailable + unavailable,
+        )
+
+    def row_hashes(self, rows_after: int = 0) -> np.ndarray:
+        """
+        Hash each row's rendered fields and its position from the end.
+
+        Covers everything episode pages and cached playlists show (id, name,
+        description, release date, podcast, duration, content class), so an
+        upstream edit to any of them changes the fingerprint.
+
+        Args:
+            rows_after: Rows that will follow these in the library (used
+                when hashing rows that are about to be prepended)
+
+        Returns:
+            64-bit hash per row (uint64)
+        """
+        last = len(self.ids) - 1 + rows_after
+        digests = b"".join(
+            hashlib.blake2b(
+                _FIELD_SEPARATOR.join((
+                    str(last - row),
+                    self.ids[row],
+                    self.names[row],
+                    _NONE if description is None else description,
+                    _NONE if release_date is None else release_date,
+                    self.podcast_ids[podcast],
+                    self.podcast_names[podcast],
+                    str(duration),
+                    str(code),
+                )).encode(),
+                digest_size=8,
+            ).digest()
+            for row, (description, release_date, podcast, duration, code) in enumerate(zip(
+                self.descriptions,
+                self.release_dates,
+                self.podcast_idx.tolist(),
+                self.duration_ms.tolist(),
+                self.content_class.tolist(),
+            ))
+        )
+        return np.frombuffer(digests, dtype="<u8").astype(np.uint64)
+
+    @property
+    def fingerprint(self) -> str:
+        """Cheap identifier of the library contents (changes with any episode change)."""
+        return f"{len(self.ids):x}-{self.hash_sum:016x}"
+
+    def index_of(self, episode_id: str) -> int | None:
+        """
+        Find an episode's row.
+
+        Args:
+            episode_id: Episode id
+
+        Returns:
+            Row index, or None if the episode is not in the library
+        """
+        if self._id_index is None:
+            self._id_index = {value: index for index, value in enumerate(self.ids)}
+        return self._id_index.get(episode_id)
+
+    def __contains__(self, episode_id: str) -> bool:
+        return self.index_of(episode_id) is not None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint in bytes (arrays plus string payloads)."""
+        arrays = (
+            self.duration_ms.nbytes
+            + self.podcast_idx.nbytes
+            + self.release_ordinal.nbytes
+            + self.content_class.nbytes
+        )
+        tables: tuple[Sequence[str | None], ...] = (
+            self.ids,
+            self.names,
+            self.descriptions,
+            self.podcast_ids,
+            self.podcast_names,
+        )
+        strings = sum(len(value or "") for table in tables for value in table)
+        # Rough per-object overhead for the Python string objects
+        return arrays + strings + 64 * (5 * len(self.ids) + 2 * len(self.podcast_ids))
+
+    def filter(
+        self,
+        content_preference: str | None = None,
+        min_duration_ms: int | None = None,
+        max_duration_ms: int | None = None,
+        released_after: date | None = None,
+    ) -> np.ndarray:
+        """
+        Select candidate episodes with vectorized masks.
+
+        Args:
+            content_preference: Content preference (light/mixed/deep)
+            min_duration_ms: Minimum episode duration, inclusive
+            max_duration_ms: Maximum episode duration, inclusive
+            released_after: Keep only episodes released on or after this date
+
+        Returns:
+            Indices of matching episodes, newest first
+        """
+        mask = np.ones(len(self), dtype=bool)
+
+        if content_preference is not None:
+            allowed = PREFERENCE_CLASSES.get(content_preference, CONTENT_CLASSES)
+            codes = np.array([CONTENT_CLASS_CODES[name] for name in allowed], dtype=np.int8)
+            mask &= np.isin(self.content_class, codes)
+        if min_duration_ms is not None:
+            mask &= self.duration_ms >= min_duration_ms
+        if max_duration_ms is not None:
+            mask &= self.duration_ms <= max_duration_ms
+        if released_after is not None:
+            mask &= self.release_ordinal >= released_after.toordinal()
+
+        indices = np.flatnonzero(mask)
+        # Stable sort keeps library order among same-day releases
+        order = np.argsort(-self.release_ordinal[indices], kind="stable")
+        return indices[order]
+
+    def episode(self, index: int) -> Episode:
+        """
+        Build the API episode model for one row.
+
+        Args:
+            index: Row index
+
+        Returns:
+            Episode
+        """
+        podcast_index = int(self.podcast_idx[index])
+        return Episode(
+            id=self.ids[index],
+            name=self.names[index],
+            duration_ms=int(self.duration_ms[index]),
+            description=self.descriptions[index],
+            podcast_name=self.podcast_names[podcast_index],
+            podcast_id=self.podcast_ids[podcast_index],
+            release_date=self.release_dates[index],
+        )
+
+    def episode_dicts(
+        self,
+        indices: Sequence[int] | np.ndarray,
+        fields: Sequence[str] | None = None,
+    ) -> list[dict]:
+        """
+        Build JSON-ready episode dicts for rows, without building models.
+
+        Same fields and order as :class:`Episode`; used by responses that
+        are serialized straight from the columns.
+
+        Args:
+            indices: Row indices
+            fields: Episode fields to keep (all by default)
+
+        Returns:
+            One dict per row
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        ids, names, descriptions, release_dates = self.ids, self.names, self.descriptions, self.release_dates
+        podcast_ids, podcast_names = self.podcast_ids, self.podcast_names
+        rows = [
+            {
+                "id": ids[index],
+                "name": names[index],
+                "duration_ms": duration_ms,
+                "description": descriptions[index],
+                "podcast_name": podcast_names[podcast_index],
+                "podcast_id": podcast_ids[podcast_index],
+                "release_date": release_dates[index],
+            }
+            for index, duration_ms, podcast_index in zip(
+                indices.tolist(),
+                self.duration_ms[indices].tolist(),
+                self.podcast_idx[indices].tolist(),
+            )
+        ]
+        if fields is not None:
+            # Deleting a few keys is cheaper than building narrower dicts
+            dropped = [name for name in rows[0] if name not in fields] if rows else []
+            if dropped:
+                for row in rows:
+                    for name in dropped:
+                        del row[name]
+        return rows
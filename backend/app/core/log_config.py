@@ -0,0 +1,180 @@
+"""Logging setup: non-blocking queue handler, text/JSON output and rate limiting."""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
+
+from app.config import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "suppressed"}
+
+_traceback_formatter = logging.Formatter()
+_listener: QueueListener | None = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let through at most ``limit`` records per message template per period.
+
+    Records are keyed by logger, level and unformatted message, so lazy
+    ``%s`` arguments do not defeat the limit. The first record of a
+    template in the next period carries the number dropped as
+    ``record.suppressed``. ERROR and above are never dropped.
+    """
+
+    def __init__(self, limit: int, period_seconds: float):
+        """
+        Initialize filter.
+
+        Args:
+            limit: Records allowed per template per period
+            period_seconds: Length of a period
+        """
+        super().__init__()
+        self.limit = limit
+        self.period_seconds = period_seconds
+        self.window_start = time.monotonic()
+        self.counts: dict[tuple, int] = {}
+        self.pending: dict[tuple, int] = {}
+        # Observability
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        now = time.monotonic()
+        if now - self.window_start >= self.period_seconds:
+            self.window_start = now
+            self.pending = {key: count - self.limit for key, count in self.counts.items() if count > self.limit}
+            self.counts = {}
+
+        key = (record.name, record.levelno, str(record.msg))
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count > self.limit:
+            self.dropped += 1
+            return False
+        if count == 1 and key in self.pending:
+            record.suppressed = self.pending.pop(key)
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """The classic ``time - logger - level - message`` line, noting suppressed repeats."""
+
+    def __init__(self):
+        super().__init__(TEXT_FORMAT, TEXT_DATE_FORMAT)
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            line += f" ({suppressed} similar messages suppressed)"
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            entry["suppressed"] = suppressed
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hand records to the writer thread without ever blocking the caller.
+
+    Only argument merging and traceback rendering happen on the calling
+    thread (they must, before the objects change); formatting and I/O run
+    on the listener thread. When the queue is full, records are dropped
+    and counted rather than stalling the event loop.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        # Observability
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> None:
+    """
+    Route the root logger through a queue to a background writer thread.
+
+    Output goes to stderr as text or JSON (``LOG_FORMAT``) at ``LOG_LEVEL``.
+    Existing root handlers are replaced. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(JsonFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    if settings.LOG_RATE_LIMIT_PER_MESSAGE > 0:
+        queue_handler.addFilter(
+            RateLimitFilter(settings.LOG_RATE_LIMIT_PER_MESSAGE, settings.LOG_RATE_LIMIT_PERIOD_SECONDS)
+        )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL.upper())
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
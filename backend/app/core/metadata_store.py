@@ -0,0 +1,364 @@
+"""Persistent on-disk store of episode metadata and user libraries."""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from app.config import settings
+from app.core.codec import pack_strings, unpack_required_strings
+from app.core.episode_store import EpisodeStore
+from app.core.metrics import registry
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Bound parameters per bulk lookup query (SQLite allows 999 on old builds)
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shows (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    description TEXT,
+    release_date TEXT,
+    release_ordinal INTEGER NOT NULL,
+    duration_ms INTEGER NOT NULL,
+    show_id TEXT NOT NULL,
+    content_class INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS episodes_updated_at ON episodes (updated_at);
+CREATE TABLE IF NOT EXISTS libraries (
+    user_id TEXT PRIMARY KEY,
+    episode_ids BLOB NOT NULL,
+    unavailable INTEGER NOT NULL,
+    full_synced_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_UPSERT_SHOW = """
+INSERT INTO shows (id, name) VALUES (?, ?)
+ON CONFLICT (id) DO UPDATE SET name = excluded.name
+"""
+
+_UPSERT_EPISODE = """
+INSERT INTO episodes (
+    id, name, description, release_date, release_ordinal, duration_ms, show_id, content_class, updated_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    name = excluded.name,
+    description = excluded.description,
+    release_date = excluded.release_date,
+    release_ordinal = excluded.release_ordinal,
+    duration_ms = excluded.duration_ms,
+    show_id = excluded.show_id,
+    content_class = excluded.content_class,
+    updated_at = excluded.updated_at
+"""
+
+_UPSERT_LIBRARY = """
+INSERT INTO libraries (user_id, episode_ids, unavailable, full_synced_at, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user_id) DO UPDATE SET
+    episode_ids = excluded.episode_ids,
+    unavailable = excluded.unavailable,
+    full_synced_at = excluded.full_synced_at,
+    updated_at = excluded.updated_at
+"""
+
+metadata_store_seconds = registry.histogram(
+    "metadata_store_seconds",
+    "Episode metadata store operation time, including waiting for the connection.",
+    ("operation",),
+)
+
+
+def _store_from_rows(
+    ids: Sequence[str],
+    rows: dict[str, tuple],
+    full_synced_at: float | None,
+    unavailable: int = 0,
+) -> EpisodeStore:
+    """Build an EpisodeStore from looked-up rows, in ``ids`` order."""
+    names: list[str] = []
+    descriptions: list[str | None] = []
+    release_dates: list[str | None] = []
+    release_ordinals: list[int] = []
+    durations: list[int] = []
+    content_classes: list[int] = []
+    podcast_indices: list[int] = []
+    podcast_lookup: dict[str, int] = {}
+    podcast_ids: list[str] = []
+    podcast_names: list[str] = []
+
+    for episode_id in ids:
+        name, description, release_date, release_ordinal, duration_ms, show_id, show_name, content_class = rows[episode_id]
+        podcast_index = podcast_lookup.get(show_id)
+        if podcast_index is None:
+            podcast_index = len(podcast_ids)
+            podcast_lookup[show_id] = podcast_index
+            podcast_ids.append(show_id)
+            podcast_names.append(show_name)
+
+        names.append(name)
+        descriptions.append(description)
+        release_dates.append(release_date)
+        release_ordinals.append(release_ordinal)
+        durations.append(duration_ms)
+        content_classes.append(content_class)
+        podcast_indices.append(podcast_index)
+
+    return EpisodeStore(
+        ids=list(ids),
+        names=names,
+        descriptions=descriptions,
+        release_dates=release_dates,
+        podcast_ids=podcast_ids,
+        podcast_names=podcast_names,
+        duration_ms=np.array(durations, dtype=np.int64),
+        podcast_idx=np.array(podcast_indices, dtype=np.int32),
+        release_ordinal=np.array(release_ordinals, dtype=np.int32),
+        content_class=np.array(content_classes, dtype=np.int8),
+        full_synced_at=full_synced_at,
+        unavailable=unavailable,
+    )
+
+
+class MetadataStore:
+    """
+    Episode and show metadata plus per-user library order in a local SQLite file.
+
+    Rows are keyed by Spotify episode id and shared between users, together
+    with each episode's content class, so classification survives restarts
+    too. Each user's library is stored as its ordered list of episode ids
+    and the time of its last full fetch. A worker starting with empty caches
+    rebuilds a library from disk with one bulk lookup and then only needs
+    an incremental sync instead of refetching and reclassifying everything.
+
+    The database runs in WAL mode, so worker processes sharing the file
+    read while another writes, and reads go through a memory map of up to
+    ``METADATA_STORE_MMAP_MB``. SQLite calls block, so the async methods run
+    them on a worker thread over one connection per process. Database
+    errors are logged and treated as misses, like Redis cache errors.
+    """
+
+    def __init__(self):
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        # Observability
+        self.hydrated = 0
+        self.misses = 0
+        self.episodes_written = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a store path is configured."""
+        return settings.METADATA_STORE_ENABLED and bool(settings.METADATA_STORE_PATH)
+
+    async def get_episodes(self, episode_ids: Sequence[str]) -> EpisodeStore:
+        """
+        Look up episodes by id in bulk.
+
+        Args:
+            episode_ids: Spotify episode ids
+
+        Returns:
+            EpisodeStore of the stored episodes in ``episode_ids`` order
+            (unknown ids are left out)
+        """
+        if not self.enabled:
+            return _store_from_rows([], {}, None)
+        rows = await self._run("lookup", self._lookup, episode_ids) or {}
+        return _store_from_rows([episode_id for episode_id in episode_ids if episode_id in rows], rows, None)
+
+    async def save_library(self, user_id: str, store: EpisodeStore, indices: Sequence[int] | None = None) -> None:
+        """
+        Persist a user's library order and the metadata of its new rows.
+
+        Args:
+            user_id: Spotify user ID
+            store: The user's library
+            indices: Rows of ``store`` not yet on disk (defaults to all)
+        """
+        if self.enabled:
+            await self._run("save_library", self._save_library, user_id, store, indices)
+
+    async def load_library(self, user_id: str, max_age_seconds: float) -> EpisodeStore | None:
+        """
+        Rebuild a user's library from disk.
+
+        Args:
+            user_id: Spotify user ID
+            max_age_seconds: Ignore libraries whose last full fetch is older
+
+        Returns:
+            EpisodeStore carrying the stored ``full_synced_at``, or None if
+            nothing usable is stored (absent, too old or missing episodes)
+        """
+        if not self.enabled:
+            return None
+        store = await self._run("load_library", self._load_library, user_id, max_age_seconds)
+        if store is None:
+            self.misses += 1
+        else:
+            self.hydrated += 1
+        return store
+
+    def close(self) -> None:
+        """Close the connection (reopened on next use)."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def snapshot(self) -> dict:
+        """
+        Get store counters.
+
+        Returns:
+            Dict of stats
+        """
+        return {
+            "enabled": self.enabled,
+            "hydrated": self.hydrated,
+            "misses": self.misses,
+            "episodes_written": self.episodes_written,
+            "errors": self.errors,
+        }
+
+    async def _run(self, operation: str, func, *args):
+        """Run ``func(connection, *args)`` on a worker thread; None on database errors."""
+        with metadata_store_seconds.time(operation):
+            try:
+                return await asyncio.to_thread(self._call, func, *args)
+            except (sqlite3.Error, OSError) as e:
+                self.errors += 1
+                logger.warning("Metadata store %s failed: %s", operation, e)
+                return None
+
+    def _call(self, func, *args):
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._open()
+            return func(self._connection, *args)
+
+    def _open(self) -> sqlite3.Connection:
+        path = Path(settings.METADATA_STORE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        try:
+            connection.execute("PRAGMA busy_timeout = 5000")
+            connection.execute("PRAGMA journal_mode = WAL")
+            # WAL stays consistent without fsync per commit; a crash only loses the latest writes
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(f"PRAGMA mmap_size = {settings.METADATA_STORE_MMAP_MB * 1024 * 1024}")
+            connection.executescript(_SCHEMA)
+            self._prune(connection)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        logger.info("Opened episode metadata store %s", path)
+        return connection
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        """Drop libraries and episodes not written within the retention window."""
+        cutoff = time.time() - settings.METADATA_STORE_RETENTION_DAYS * 24 * 60 * 60
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            libraries = connection.execute("DELETE FROM libraries WHERE updated_at < ?", (cutoff,)).rowcount
+            # Libraries still referencing a pruned episode fall back to a full sync
+            episodes = connection.execute("DELETE FROM episodes WHERE updated_at < ?", (cutoff,)).rowcount
+            connection.execute("DELETE FROM shows WHERE id NOT IN (SELECT show_id FROM episodes)")
+        if libraries or episodes:
+            logger.info("Pruned %s libraries and %s episodes from the metadata store", libraries, episodes)
+
+    def _write_episodes(self, connection: sqlite3.Connection, store: EpisodeStore, indices: Sequence[int] | None) -> None:
+        rows = range(len(store)) if indices is None else indices
+        if not len(rows):
+            return
+        now = time.time()
+        podcasts = {int(store.podcast_idx[index]) for index in rows}
+        connection.executemany(
+            _UPSERT_SHOW,
+            ((store.podcast_ids[podcast], store.podcast_names[podcast]) for podcast in podcasts),
+        )
+        podcast_idx = store.podcast_idx.tolist()
+        release_ordinal = store.release_ordinal.tolist()
+        duration_ms = store.duration_ms.tolist()
+        content_class = store.content_class.tolist()
+        connection.executemany(
+            _UPSERT_EPISODE,
+            (
+                (
+                    store.ids[index],
+                    store.names[index],
+                    store.descriptions[index],
+                    store.release_dates[index],
+                    release_ordinal[index],
+                    duration_ms[index],
+                    store.podcast_ids[podcast_idx[index]],
+                    content_class[index],
+                    now,
+                )
+                for index in rows
+            ),
+        )
+        self.episodes_written += len(rows)
+
+    def _lookup(self, connection: sqlite3.Connection, episode_ids: Sequence[str]) -> dict[str, tuple]:
+        rows: dict[str, tuple] = {}
+        for start in range(0, len(episode_ids), _LOOKUP_CHUNK):
+            chunk = episode_ids[start:start + _LOOKUP_CHUNK]
+            cursor = connection.execute(
+                "SELECT e.id, e.name, e.description, e.release_date, e.release_ordinal, e.duration_ms,"
+                " e.show_id, s.name, e.content_class"
+                " FROM episodes e JOIN shows s ON s.id = e.show_id"
+                f" WHERE e.id IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for row in cursor:
+                rows[row[0]] = row[1:]
+        return rows
+
+    def _save_library(
+        self,
+        connection: sqlite3.Connection,
+        user_id: str,
+        store: EpisodeStore,
+        indices: Sequence[int] | None,
+    ) -> None:
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            self._write_episodes(connection, store, indices)
+            connection.execute(
+                _UPSERT_LIBRARY,
+                (user_id, pack_strings(store.ids), store.unavailable, store.full_synced_at, time.time()),
+            )
+
+    def _load_library(self, connection: sqlite3.Connection, user_id: str, max_age_seconds: float) -> EpisodeStore | None:
+        row = connection.execute(
+            "SELECT episode_ids, unavailable, full_synced_at FROM libraries WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+        if row is None or time.time() - row[2] >= max_age_seconds:
+            return None
+        episode_ids = unpack_required_strings(row[0])
+        rows = self._lookup(connection, episode_ids)
+        if len(rows) < len(set(episode_ids)):
+            return None
+        return _store_from_rows(episode_ids, rows, row[2], unavailable=row[1])
+
+
+# Shared by every request in the process
+metadata_store = MetadataStore()
@@ -0,0 +1,334 @@
+"""In-process metrics registry with Prometheus text exposition."""
+
+import bisect
+import logging
+import math
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Seconds; covers sub-millisecond cache hits up to slow full library syncs
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bytes; from small JSON bodies up to uncompressed pages of thousands of episodes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# Starlette appends "; charset=utf-8" to text responses
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class for a named metric with a fixed set of label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> list[str]:
+        """
+        Render the metric in the Prometheus text format.
+
+        Returns:
+            Exposition lines, including HELP and TYPE
+        """
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def _key(self, values: tuple) -> tuple[str, ...]:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        return tuple(str(value) for value in values)
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        """
+        Increase the count.
+
+        Args:
+            *labels: Label values, in ``labelnames`` order
+            amount: Non-negative increment
+        """
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last is +Inf), sum]
+        self._values: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value (seconds for latencies)
+            *labels: Label values, in ``labelnames`` order
+        """
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    @contextmanager
+    def time(self, *labels) -> Iterator[None]:
+        """
+        Observe the wall-clock duration of a block, even if it raises.
+
+        Args:
+            *labels: Label values, in ``labelnames`` order
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """
+    Metric read from existing counters at scrape time.
+
+    Used for state that services already track (cache stats, scheduler
+    counters, queue depths), so the hot path pays nothing extra.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        kind: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], dict[tuple, float]],
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, self._key(key))} {_format_value(value)}"
+            for key, value in self.callback().items()
+        ]
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together by ``/metrics``."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], dict[tuple, float]],
+    ) -> CallbackMetric:
+        """Register a gauge whose samples are read from ``callback`` at scrape time."""
+        return self._register(CallbackMetric(name, documentation, "gauge", labelnames, callback))
+
+    def counter_callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], dict[tuple, float]],
+    ) -> CallbackMetric:
+        """Register a counter whose samples are read from ``callback`` at scrape time."""
+        return self._register(CallbackMetric(name, documentation, "counter", labelnames, callback))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text format.
+
+        A failing callback drops only its own metric from the output.
+
+        Returns:
+            Exposition text
+        """
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logger.warning("Failed to collect metric %s: %s", metric.name, e)
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: MetricT) -> MetricT:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+
+# Shared by every module in the process
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve an HTTP request, by route template.",
+    ("method", "route", "status"),
+)
+
+http_response_size_bytes = registry.histogram(
+    "http_response_size_bytes",
+    "Response body bytes as sent, by route template and content encoding.",
+    ("method", "route", "encoding"),
+    buckets=SIZE_BUCKETS,
+)
+
+generation_stage_seconds = registry.histogram(
+    "playlist_generation_stage_seconds",
+    "Time spent per playlist generation stage (fetch includes classify on a library miss).",
+    ("stage",),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency and response size per route template.
+
+    Sizes are body bytes as sent, after compression. Routes are labelled
+    by their path template (``/api/playlists/jobs/{job_id}``), not the raw
+    path, so label cardinality stays bounded; requests matching no route
+    share the ``unmatched`` label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._templates: dict[Callable, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        encoding = "identity"
+        size = 0
+
+        async def send_with_status(message):
+            nonlocal status_code, encoding, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-encoding":
+                        encoding = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = self._route_template(scope)
+            http_request_seconds.observe(time.perf_counter() - start, scope["method"], route, status_code)
+            http_response_size_bytes.observe(size, scope["method"], route, encoding)
+
+    def _route_template(self, scope) -> str:
+        """Path template of the route that handled the request."""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        template = self._templates.get(endpoint)
+        if template is None:
+            # The router stores the endpoint in the scope; map it back to its path once
+            for route in scope["app"].routes:
+                if getattr(route, "endpoint", None) is endpoint:
+                    template = route.path
+                    break
+            else:
+                template = "unmatched"
+            self._templates[endpoint] = template
+        return template
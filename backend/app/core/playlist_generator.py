@@ -1,22 +1,316 @@
 """Playlist generation algorithm."""
 
-# TODO: Implement in Sprint 4
-# This will contain the core algorithm for generating playlists
+from collections.abc import Sequence
 
+import numpy as np
 
-def generate_playlist(episodes, target_duration, run_type, content_preference):
+from app.api.schemas import Playlist
+from app.config import settings
+from app.core.episode_store import EpisodeStore
+
+
+def fit_duration(durations_s: Sequence[int], target_s: int, tolerance_s: int) -> list[int]:
+    """
+    Pick a subset of durations whose sum is as close as possible to a target.
+
+    Bounded subset-sum over durations bucketed to seconds. Reachable sums are
+    kept as a bitset in a Python int (bit ``s`` set means some subset sums to
+    ``s`` seconds), so adding an item is a single shift-or over the whole
+    reachability array: O(n·T) bit operations in total, with no per-sum loop
+    in Python. The bitset before each item is kept so the chosen subset can be
+    rebuilt by walking the items backwards.
+
+    Earlier items are preferred: when a sum is reachable both with and without
+    an item, the rebuild leaves the later item out. Callers should therefore
+    pass candidates best-first.
+
+    Args:
+        durations_s: Candidate durations in whole seconds
+        target_s: Target total duration in seconds
+        tolerance_s: Allowed deviation from the target in seconds
+            (the target is capped at ``PLAYLIST_MAX_DURATION_MINUTES`` and the
+            tolerance at the target)
+
+    Returns:
+        Indices into ``durations_s`` of the chosen items, in input order.
+        If nothing lands inside the tolerance window, the longest reachable
+        total that does not exceed ``target_s + tolerance_s`` is used.
+    """
+    if target_s <= 0:
+        return []
+
+    # One bitset of the capacity's length is kept per item; bound the memory
+    target_s = min(target_s, settings.PLAYLIST_MAX_DURATION_MINUTES * 60)
+    tolerance_s = min(tolerance_s, target_s)
+    capacity = target_s + max(tolerance_s, 0)
+    mask = (1 << (capacity + 1)) - 1
+    reach = 1
+    snapshots: list[int] = []
+
+    for duration in durations_s:
+        snapshots.append(reach)
+        if 0 < duration <= capacity:
+            reach = (reach | (reach << duration)) & mask
+            if (reach >> target_s) & 1:
+                # Exact fit: later items cannot improve on it
+                break
+
+    best = _closest_reachable(reach, target_s, tolerance_s)
+
+    chosen: list[int] = []
+    remaining = best
+    for index in range(len(snapshots) - 1, -1, -1):
+        if remaining == 0:
+            break
+        if (snapshots[index] >> remaining) & 1:
+            # Reachable without this item
+            continue
+        chosen.append(index)
+        remaining -= durations_s[index]
+
+    chosen.reverse()
+    return chosen
+
+
+def _closest_reachable(reach: int, target_s: int, tolerance_s: int) -> int:
+    """
+    Find the reachable sum nearest the target, preferring shorter on ties.
+
+    Args:
+        reach: Reachability bitset
+        target_s: Target total duration in seconds
+        tolerance_s: Allowed deviation from the target in seconds
+
+    Returns:
+        Reachable sum in seconds
+    """
+    for delta in range(max(tolerance_s, 0) + 1):
+        under = target_s - delta
+        if under >= 0 and (reach >> under) & 1:
+            return under
+        if (reach >> (target_s + delta)) & 1:
+            return target_s + delta
+
+    # Nothing inside the window; every reachable sum is below it
+    return reach.bit_length() - 1
+
+
+def fit_alternatives(
+    durations_s: np.ndarray,
+    podcast_idx: np.ndarray,
+    target_s: int,
+    tolerance_s: int,
+    count: int,
+    seed: int = 0,
+) -> list[list[int]]:
+    """
+    Find up to ``count`` distinct fits, each steered away from earlier ones.
+
+    The first alternative is :func:`fit_duration` on the input (best-first)
+    order. Every restart reorders the candidates before fitting again:
+    episodes not used by an earlier alternative come first, then episodes
+    of podcasts used least so far, and within that the input position
+    scaled by random jitter, so restarts explore different orders that
+    still lean best-first. A restart that repeats an earlier episode set is
+    discarded; at most ``3 * count`` restarts are made.
+
+    Args:
+        durations_s: Candidate durations in whole seconds
+        podcast_idx: Podcast index per candidate
+        target_s: Target total duration in seconds
+        tolerance_s: Allowed deviation from the target in seconds
+        count: Number of alternatives wanted
+        seed: Random seed for the restarts (fixed, so results are repeatable)
+
+    Returns:
+        Index lists into ``durations_s``, each in input order. The first is
+        always present (possibly empty); fewer than ``count`` are returned
+        if the candidates do not allow more distinct fits.
+    """
+    rng = np.random.default_rng(seed)
+    positions = np.arange(len(durations_s), dtype=np.float64)
+    episode_used = np.zeros(len(durations_s), dtype=bool)
+    podcast_uses = np.zeros(int(podcast_idx.max()) + 1 if len(podcast_idx) else 0, dtype=np.int64)
+
+    alternatives: list[list[int]] = []
+    seen: set[tuple[int, ...]] = set()
+    order = np.arange(len(durations_s))
+    for attempt in range(3 * count):
+        if attempt:
+            jittered = positions * rng.uniform(0.5, 1.5, len(positions))
+            # lexsort sorts by the last key first
+            order = np.lexsort((jittered, podcast_uses[podcast_idx], episode_used))
+
+        chosen = sorted(order[fit_duration(durations_s[order].tolist(), target_s, tolerance_s)].tolist())
+        if not chosen and attempt == 0:
+            return [[]]
+        if tuple(chosen) in seen:
+            continue
+
+        seen.add(tuple(chosen))
+        alternatives.append(chosen)
+        episode_used[chosen] = True
+        np.add.at(podcast_uses, podcast_idx[chosen], 1)
+        if len(alternatives) == count:
+            break
+
+    return alternatives
+
+
+def select_candidates(
+    store: EpisodeStore,
+    target_duration: int,
+    content_preference: str,
+    tolerance_minutes: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Select playlist candidates and their durations for :func:`fit_duration`.
+
+    Args:
+        store: Episode library
+        target_duration: Target duration in minutes
+        content_preference: Content preference (light/mixed/deep)
+        tolerance_minutes: Allowed over/under in minutes
+
+    Returns:
+        Tuple of (candidate row indices newest-first, durations in whole
+        seconds as int64)
+    """
+    candidates = store.filter(
+        content_preference=content_preference,
+        min_duration_ms=1,
+        max_duration_ms=(target_duration + tolerance_minutes) * 60000,
+    )
+    durations_s = (store.duration_ms[candidates] + 500) // 1000
+    return candidates, durations_s
+
+
+def assemble_playlist(store: EpisodeStore, chosen: np.ndarray, target_duration: int) -> Playlist:
+    """
+    Build the API playlist for the chosen rows.
+
+    Rows are read as plain dicts and validated in a single call, which is
+    cheaper than building each Episode and PlaylistItem separately.
+
+    Args:
+        store: Episode library
+        chosen: Row indices in playlist order
+        target_duration: Target duration in minutes
+
+    Returns:
+        Playlist
+    """
+    total_ms = int(store.duration_ms[chosen].sum())
+
+    return Playlist.model_validate({
+        "items": [
+            {"episode": episode, "order": order}
+            for order, episode in enumerate(store.episode_dicts(chosen))
+        ],
+        "total_duration_minutes": round(total_ms / 60000, 2),
+        "target_duration_minutes": target_duration,
+    })
+
+
+def generate_playlist(
+    episodes,
+    target_duration: int,
+    run_type: str,
+    content_preference: str,
+    tolerance_minutes: int | None = None,
+) -> Playlist:
     """
     Generate a playlist matching the run parameters.
-    
+
+    Candidates are selected from the columnar store by content preference and
+    duration window, ordered newest-first, and fitted to the target duration
+    with :func:`fit_duration`. Pydantic episodes are only built for the items
+    that end up in the playlist.
+
+    Runs entirely on the calling thread; async callers should use
+    ``app.services.optimizer_pool.generate_playlist``, which moves large
+    searches off the event loop.
+
     Args:
-        episodes: List of available episodes
+        episodes: EpisodeStore, or list of available episodes
         target_duration: Target duration in minutes
         run_type: Type of run (easy/tempo/long)
         content_preference: Content preference (light/mixed/deep)
-    
+        tolerance_minutes: Allowed over/under in minutes (defaults to settings)
+
     Returns:
         Generated playlist
     """
-    # TODO: Implement in Sprint 4
-    raise NotImplementedError("Playlist generation not yet implemented")
+    if tolerance_minutes is None:
+        tolerance_minutes = settings.PLAYLIST_DURATION_TOLERANCE_MINUTES
+
+    store = episodes if isinstance(episodes, EpisodeStore) else EpisodeStore.from_episodes(episodes)
+
+    candidates, durations_s = select_candidates(store, target_duration, content_preference, tolerance_minutes)
+    chosen = candidates[fit_duration(durations_s.tolist(), target_duration * 60, tolerance_minutes * 60)]
+    return assemble_playlist(store, chosen, target_duration)
 
+
+def generate_playlists(
+    episodes,
+    target_duration: int,
+    run_type: str,
+    content_preference: str,
+    count: int,
+    tolerance_minutes: int | None = None,
+) -> list[Playlist]:
+    """
+    Generate up to ``count`` distinct playlists in one pass (see :func:`fit_alternatives`).
+
+    Args:
+        episodes: EpisodeStore, or list of available episodes
+        target_duration: Target duration in minutes
+        run_type: Type of run (easy/tempo/long)
+        content_preference: Content preference (light/mixed/deep)
+        count: Number of alternatives wanted
+        tolerance_minutes: Allowed over/under in minutes (defaults to settings)
+
+    Returns:
+        Playlists, best first
+    """
+    if tolerance_minutes is None:
+        tolerance_minutes = settings.PLAYLIST_DURATION_TOLERANCE_MINUTES
+
+    store = episodes if isinstance(episodes, EpisodeStore) else EpisodeStore.from_episodes(episodes)
+
+    candidates, durations_s = select_candidates(store, target_duration, content_preference, tolerance_minutes)
+    alternatives = fit_alternatives(
+        durations_s,
+        store.podcast_idx[candidates],
+        target_duration * 60,
+        tolerance_minutes * 60,
+        count,
+    )
+    return assemble_alternatives(store, candidates, alternatives, target_duration)
+
+
+def assemble_alternatives(
+    store: EpisodeStore,
+    candidates: np.ndarray,
+    alternatives: list[list[int]],
+    target_duration: int,
+) -> list[Playlist]:
+    """
+    Build the API playlists for :func:`fit_alternatives` results.
+
+    Args:
+        store: Episode library
+        candidates: Candidate row indices the alternatives index into
+        alternatives: Index lists into ``candidates``
+        target_duration: Target duration in minutes
+
+    Returns:
+        Playlists numbered by their position
+    """
+    playlists = []
+    for number, chosen in enumerate(alternatives):
+        playlist = assemble_playlist(store, candidates[chosen], target_duration)
+        playlist.alternative = number
+        playlist.alternatives = len(alternatives)
+        playlists.append(playlist)
+    return playlists
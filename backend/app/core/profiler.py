@@ -0,0 +1,255 @@
+"""Sampling profiler for slow or selected requests, written as collapsed stacks."""
+
+import asyncio
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from types import FrameType
+
+from app.config import settings
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame: FrameType | None) -> str:
+    """Render a stack root-first, frames separated by ``;`` (flamegraph format)."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class StackSampler:
+    """
+    Samples one thread's stack at a fixed interval from a daemon thread.
+
+    Samples are kept in a ring covering ``window_seconds``, so the stacks
+    seen during any recent time window can be read back after the fact.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float, window_seconds: float):
+        """
+        Initialize sampler.
+
+        Args:
+            thread_id: Thread to sample (the event loop's)
+            interval_seconds: Time between samples
+            window_seconds: How far back samples are kept
+        """
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.samples: deque[tuple[float, str]] = deque(maxlen=max(1, int(window_seconds / interval_seconds)))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampling thread."""
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    def window(self, start: float, end: float) -> Counter:
+        """
+        Count the stacks sampled between two ``time.perf_counter()`` readings.
+
+        Args:
+            start: Window start
+            end: Window end
+
+        Returns:
+            Sample count per collapsed stack
+        """
+        return Counter(stack for taken_at, stack in list(self.samples) if start <= taken_at <= end)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples.append((time.perf_counter(), _collapse(frame)))
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and writes their profiles to disk.
+
+    A request is profiled when it is picked by ``PROFILE_SAMPLE_RATE``,
+    when it takes longer than ``PROFILE_SLOW_REQUEST_MS``, or when it is
+    one of the next N requests armed with :meth:`trigger`. Its profile is
+    every event-loop stack sampled while it was in flight, which includes
+    work done for concurrent requests: that is what delayed it. Samples
+    idle in the selector mean the loop was waiting on I/O (Spotify).
+
+    Profiles are written to ``PROFILE_DIR`` as ``.collapsed`` files
+    (``flamegraph.pl`` / speedscope input); only the newest
+    ``PROFILE_MAX_FILES`` are kept.
+    """
+
+    def __init__(self):
+        self.sampler: StackSampler | None = None
+        self.armed = 0
+        self.selected_in_flight = 0
+        # Observability
+        self.written = 0
+
+    @property
+    def active(self) -> bool:
+        """Whether stacks are being sampled."""
+        return self.sampler is not None
+
+    @property
+    def configured(self) -> bool:
+        """Whether settings ask for sampled or slow-request profiles."""
+        return settings.PROFILE_SAMPLE_RATE > 0 or settings.PROFILE_SLOW_REQUEST_MS > 0
+
+    def start(self) -> None:
+        """Start sampling the calling (event loop) thread, if not already running."""
+        if self.sampler is not None:
+            return
+        self.sampler = StackSampler(
+            threading.get_ident(),
+            settings.PROFILE_INTERVAL_MS / 1000,
+            settings.PROFILE_WINDOW_SECONDS,
+        )
+        self.sampler.start()
+        logger.info("Request profiler sampling every %sms", settings.PROFILE_INTERVAL_MS)
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        if self.sampler is not None:
+            sampler, self.sampler = self.sampler, None
+            sampler.stop()
+
+    def trigger(self, requests: int) -> None:
+        """
+        Profile the next ``requests`` requests handled by this process.
+
+        Starts sampling if settings do not already keep it running; it
+        stops again once the armed requests are done.
+
+        Args:
+            requests: Number of requests to profile
+        """
+        self.armed += requests
+        self.start()
+
+    def should_profile(self) -> bool:
+        """Decide at the start of a request whether to profile it regardless of duration."""
+        if self.armed > 0:
+            self.armed -= 1
+        elif random.random() >= settings.PROFILE_SAMPLE_RATE:
+            return False
+        self.selected_in_flight += 1
+        return True
+
+    async def finish(
+        self,
+        method: str,
+        path: str,
+        status_code: int,
+        start: float,
+        end: float,
+        selected: bool,
+    ) -> None:
+        """
+        Write a profile for a finished request if it was selected or slow.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            status_code: Response status
+            start: Request start (``time.perf_counter()``)
+            end: Request end (``time.perf_counter()``)
+            selected: Result of :meth:`should_profile` for this request
+        """
+        if selected:
+            self.selected_in_flight -= 1
+        sampler = self.sampler
+        if sampler is None:
+            return
+        elapsed_ms = (end - start) * 1000
+        slow = 0 < settings.PROFILE_SLOW_REQUEST_MS <= elapsed_ms
+        if selected or slow:
+            stacks = sampler.window(start, end)
+            if stacks:
+                name = f"{time.time():.3f}-{method}-{path}-{status_code}-{elapsed_ms:.0f}ms"
+                await asyncio.to_thread(self._write, _UNSAFE_FILENAME_CHARS.sub("_", name), stacks)
+        if self.armed == 0 and self.selected_in_flight == 0 and not self.configured:
+            self.stop()
+
+    def snapshot(self) -> dict:
+        """
+        Get profiler state.
+
+        Returns:
+            Dict of stats
+        """
+        return {
+            "active": self.active,
+            "armed": self.armed,
+            "written": self.written,
+            "samples": len(self.sampler.samples) if self.sampler else 0,
+        }
+
+    def _write(self, name: str, stacks: Counter) -> None:
+        directory = Path(settings.PROFILE_DIR)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{name}.collapsed"
+            path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+            self.written += 1
+
+            profiles = sorted(directory.glob("*.collapsed"), key=lambda profile: profile.stat().st_mtime)
+            for old in profiles[: max(0, len(profiles) - settings.PROFILE_MAX_FILES)]:
+                old.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Failed to write request profile %s: %s", name, e)
+
+
+# Shared by every request in the process
+profiler = RequestProfiler()
+
+
+class ProfilerMiddleware:
+    """ASGI middleware handing request timings to :data:`profiler`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not profiler.active:
+            await self.app(scope, receive, send)
+            return
+
+        selected = profiler.should_profile()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            end = time.perf_counter()
+            await profiler.finish(scope["method"], scope["path"], status_code, start, end, selected)
@@ -1,6 +1,10 @@
 """Session management utilities."""
 
-from datetime import datetime, timedelta
+import hmac
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import cast
 from itsdangerous import URLSafeTimedSerializer
 from fastapi import Request, Response
 
@@ -13,26 +17,31 @@ serializer = URLSafeTimedSerializer(
     salt="session",
 )
 
+# Marker for "not yet verified on this request" (None means "no valid session")
+_NOT_LOADED = object()
 
-def create_session(response: Response, user_id: str, access_token: str, refresh_token: str) -> None:
+# Verified sessions keyed by cookie signature: (cookie, expires_at, session_data)
+_verified_sessions: OrderedDict[str, tuple[str, float, dict]] = OrderedDict()
+
+
+def create_session(response: Response, session_id: str) -> None:
     """
-    Create a signed session cookie with user tokens.
+    Create a signed session cookie for a server-side session.
+    
+    The cookie carries only the opaque session id; Spotify tokens stay in
+    the server-side token store.
     
     Args:
         response: FastAPI response object
-        user_id: Spotify user ID
-        access_token: Spotify access token
-        refresh_token: Spotify refresh token
+        session_id: Opaque session id from the token store
     """
     session_data = {
-        "user_id": user_id,
-        "access_token": access_token,
-        "refresh_token": refresh_token,
+        "sid": session_id,
         "created_at": datetime.utcnow().isoformat(),
     }
     
-    # Sign the session data
-    signed_token = serializer.dumps(session_data, max_age=settings.SESSION_EXPIRE_MINUTES * 60)
+    # Sign the session data (expiry is checked against max_age on load)
+    signed_token = serializer.dumps(session_data)
     
     # Set as HTTP-only cookie
     response.set_cookie(
@@ -49,22 +58,63 @@ def get_session(request: Request) -> dict | None:
     """
     Get and verify session data from cookie.
     
+    Verification (HMAC, base64 and JSON decode) runs at most once per cookie
+    while it is valid: the result is kept on the request and in a bounded LRU
+    keyed by the cookie's signature, and expires with the cookie's max_age.
+    Treat the returned dict as read-only; it is shared between requests.
+    
     Args:
         request: FastAPI request object
         
     Returns:
         Session data dict or None if invalid/expired
     """
-    session_cookie = request.cookies.get("session")
+    cached = getattr(request.state, "session", _NOT_LOADED)
+    if cached is not _NOT_LOADED:
+        return cast(dict | None, cached)
+    
+    session_data = _verify_session_cookie(request.cookies.get("session"))
+    request.state.session = session_data
+    return session_data
+
+
+def _verify_session_cookie(session_cookie: str | None) -> dict | None:
+    """
+    Verify a session cookie, using the verified-session LRU when possible.
+    
+    Args:
+        session_cookie: Raw cookie value
+        
+    Returns:
+        Session data dict or None if invalid/expired
+    """
     if not session_cookie:
         return None
     
+    max_age = settings.SESSION_EXPIRE_MINUTES * 60
+    signature = session_cookie.rpartition(".")[2]
+    entry = _verified_sessions.get(signature)
+    if entry is not None and hmac.compare_digest(entry[0], session_cookie):
+        if time.time() < entry[1]:
+            _verified_sessions.move_to_end(signature)
+            return entry[2]
+        del _verified_sessions[signature]
+    
     try:
-        session_data = serializer.loads(session_cookie, max_age=settings.SESSION_EXPIRE_MINUTES * 60)
-        return session_data
+        session_data, signed_at = serializer.loads(
+            session_cookie,
+            max_age=max_age,
+            return_timestamp=True,
+        )
     except Exception:
         # Invalid or expired session
         return None
+    
+    if settings.SESSION_CACHE_SIZE > 0:
+        _verified_sessions[signature] = (session_cookie, signed_at.timestamp() + max_age, session_data)
+        if len(_verified_sessions) > settings.SESSION_CACHE_SIZE:
+            _verified_sessions.popitem(last=False)
+    return session_data
 
 
 def clear_session(response: Response) -> None:
@@ -1,19 +1,34 @@
 """FastAPI application entry point."""
 
 import logging
+import os
+import secrets
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
+from app.api.responses import FastJSONResponse
 from app.api.routes import auth, episodes, playlists
 from app.config import settings
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
+from app.core.cache_backends import close_redis_client
+from app.core.compression import CompressionMiddleware
+from app.core.log_config import configure_logging
+from app.core.metadata_store import metadata_store
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiler import ProfilerMiddleware, profiler
+from app.services.http_client import close_http_client, start_http_client
+from app.services.library_cache import cache_stats
+from app.services.library_prefetch import library_prefetcher
+from app.services.optimizer_pool import optimizer_pool
+from app.services.playlist_cache import alternatives_cache
+from app.services.playlist_jobs import job_manager
+from app.services.rate_limiter import SpotifyRateLimited, scheduler
+from app.services.token_store import token_store
+
+# Configure logging (queued to a writer thread, see app.core.log_config)
+configure_logging()
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
@@ -22,6 +37,7 @@ app = FastAPI(
     title="Podcast Run Planner API",
     description="API for generating podcast playlists for runs",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
 )
 
 # Configure CORS
@@ -33,27 +49,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (inside metrics, so sizes are recorded as sent)
+app.add_middleware(CompressionMiddleware)
+
+# Profile sampled, slow or triggered requests (no-op unless sampling is running)
+app.add_middleware(ProfilerMiddleware)
+
+# Record per-route latency (outermost, so it includes CORS handling)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
 app.include_router(episodes.router, prefix=settings.API_V1_PREFIX)
 app.include_router(playlists.router, prefix=settings.API_V1_PREFIX)
 
 
+@app.exception_handler(SpotifyRateLimited)
+async def spotify_rate_limited_handler(request: Request, exc: SpotifyRateLimited):
+    """Degrade to 503 + Retry-After when Spotify's rate limit cannot be waited out."""
+    logger.warning("Rate limited request to %s: %s", request.url.path, exc)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Spotify is rate limiting requests. Please try again shortly."},
+        headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
     """Log application startup information."""
     logger.info("=" * 60)
     logger.info("🚀 Podcast Run Planner API Starting")
     logger.info("=" * 60)
-    logger.info(f"Version: {app.version}")
-    logger.info(f"API Prefix: {settings.API_V1_PREFIX}")
-    logger.info(f"CORS Origins: {', '.join(settings.CORS_ORIGINS)}")
-    logger.info(f"Session Expiry: {settings.SESSION_EXPIRE_MINUTES} minutes")
+    logger.info("Version: %s", app.version)
+    logger.info("API Prefix: %s", settings.API_V1_PREFIX)
+    logger.info("CORS Origins: %s", ", ".join(settings.CORS_ORIGINS))
+    logger.info("Session Expiry: %s minutes", settings.SESSION_EXPIRE_MINUTES)
+    
+    # Sessions and tokens live in the cache backend; workers must share it
+    if settings.WEB_CONCURRENCY > 1 and settings.CACHE_BACKEND == "memory":
+        raise RuntimeError(
+            "WEB_CONCURRENCY > 1 requires CACHE_BACKEND=redis: the memory backend "
+            "keeps sessions per worker, so requests to other workers would get 401"
+        )
+    
+    # Open the shared Spotify HTTP connection pool
+    await start_http_client()
+    
+    # Refresh Spotify access tokens ahead of expiry
+    token_store.start()
+    
+    # Start the background playlist generation workers and optimizer processes
+    job_manager.start()
+    optimizer_pool.start()
+    
+    # Sample the event loop for sampled or slow request profiles
+    if profiler.configured:
+        profiler.start()
     
     # Check Spotify configuration
     if settings.SPOTIFY_CLIENT_ID:
         logger.info("✅ Spotify OAuth configured")
-        logger.debug(f"Spotify Redirect URI: {settings.SPOTIFY_REDIRECT_URI}")
+        logger.debug("Spotify Redirect URI: %s", settings.SPOTIFY_REDIRECT_URI)
     else:
         logger.warning("⚠️  Spotify OAuth not configured (SPOTIFY_CLIENT_ID missing)")
     
@@ -68,7 +125,7 @@ async def startup_event():
     for route in app.routes:
         if hasattr(route, "path") and hasattr(route, "methods"):
             methods = ", ".join(sorted(route.methods))
-            logger.info(f"  {methods:20} {route.path}")
+            logger.info("  %-20s %s", methods, route.path)
     
     logger.info("=" * 60)
     logger.info("✅ Application startup complete")
@@ -88,10 +145,82 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus metrics: request, Spotify, cache, scheduler and generation stage timings."""
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Library and playlist cache hit/miss/eviction counters, plus metadata store counters."""
+    return {**cache_stats(), alternatives_cache.name: alternatives_cache.snapshot()}
+
+
+@app.get("/prefetch/stats")
+async def get_prefetch_stats():
+    """Background library prefetch counters."""
+    return library_prefetcher.snapshot()
+
+
+@app.get("/scheduler/stats")
+async def get_scheduler_stats():
+    """Spotify request scheduler queue depth, wait times and retry counters."""
+    return scheduler.snapshot()
+
+
+@app.get("/auth/stats")
+async def get_auth_stats():
+    """Server-side token store refresh counters."""
+    return token_store.snapshot()
+
+
+@app.get("/jobs/stats")
+async def get_job_stats():
+    """Background playlist job queue depth and counters."""
+    return job_manager.snapshot()
+
+
+@app.get("/optimizer/stats")
+async def get_optimizer_stats():
+    """Inline vs. process-pool playlist optimization counters."""
+    return optimizer_pool.snapshot()
+
+
+@app.post("/debug/profile", include_in_schema=False)
+async def trigger_profile(
+    requests: int = Query(10, ge=1),
+    profile_token: str | None = Header(None, alias="X-Profile-Token"),
+):
+    """
+    Profile the next ``requests`` requests handled by this worker process.
+    
+    Disabled unless ``PROFILE_TRIGGER_TOKEN`` is set; the response names
+    the worker that was armed.
+    """
+    if not settings.PROFILE_TRIGGER_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not profile_token or not secrets.compare_digest(profile_token, settings.PROFILE_TRIGGER_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profile token")
+    
+    profiler.trigger(min(requests, settings.PROFILE_TRIGGER_MAX_REQUESTS))
+    logger.info("Profiling the next %s requests", profiler.armed)
+    return {"pid": os.getpid(), **profiler.snapshot()}
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log application shutdown."""
+    """Log application shutdown and release shared resources."""
     logger.info("=" * 60)
     logger.info("🛑 Podcast Run Planner API Shutting Down")
     logger.info("=" * 60)
+    
+    await job_manager.stop()
+    await library_prefetcher.stop()
+    await optimizer_pool.stop()
+    await token_store.stop()
+    profiler.stop()
+    await close_http_client()
+    await close_redis_client()
+    metadata_store.close()
 
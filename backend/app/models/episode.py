@@ -12,4 +12,5 @@ class Episode(BaseModel):
     podcast_name: str
     podcast_id: str
     release_date: str | None = None
+    added_at: str | None = None  # When the user saved it (saved episodes only)
 
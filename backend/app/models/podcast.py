@@ -0,0 +1,12 @@
+"""Podcast (Spotify show) data models."""
+
+from pydantic import BaseModel
+
+
+class Podcast(BaseModel):
+    """Podcast model."""
+    id: str
+    name: str
+    publisher: str | None = None
+    description: str | None = None
+    total_episodes: int | None = None
@@ -0,0 +1,66 @@
+"""Shared HTTP client for outbound Spotify API calls."""
+
+import logging
+
+import httpx
+
+from app.config import settings
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Process-wide client, created on app startup and closed on shutdown
+_client: httpx.AsyncClient | None = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create a pooled HTTP client configured from settings.
+
+    Returns:
+        httpx.AsyncClient with keep-alive pool limits and timeouts
+    """
+    limits = httpx.Limits(
+        max_connections=settings.SPOTIFY_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SPOTIFY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.SPOTIFY_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.SPOTIFY_TIMEOUT_SECONDS,
+        connect=settings.SPOTIFY_CONNECT_TIMEOUT_SECONDS,
+    )
+    return httpx.AsyncClient(http2=settings.SPOTIFY_HTTP2, limits=limits, timeout=timeout)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client.
+
+    Created lazily if the app lifespan has not started it (e.g. in scripts).
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def start_http_client() -> None:
+    """Create the shared HTTP client on application startup."""
+    get_http_client()
+    logger.info(
+        "HTTP client pool ready (http2=%s, max_connections=%s)",
+        settings.SPOTIFY_HTTP2,
+        settings.SPOTIFY_MAX_CONNECTIONS,
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("HTTP client pool closed")
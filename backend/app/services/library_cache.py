@@ -0,0 +1,201 @@
+"""Per-user caches of Spotify library data."""
+
+import logging
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.core.cache import AsyncCache
+from app.core.cache_backends import create_backend
+from app.core.codec import pack_sections, pack_strings, unpack_required_strings, unpack_sections, unpack_strings
+from app.core.content_classifier import classify_episodes
+from app.core.episode_store import EpisodeStore
+from app.core.metadata_store import metadata_store
+from app.core.metrics import generation_stage_seconds
+from app.models.episode import Episode
+from app.models.podcast import Podcast
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+
+def _podcasts_nbytes(podcasts: list[Podcast]) -> int:
+    """Approximate memory footprint of a list of podcasts."""
+    return sum(
+        256 + len(podcast.id) + len(podcast.name) + len(podcast.description or "")
+        for podcast in podcasts
+    )
+
+
+def _dump_podcasts(podcasts: list[Podcast]) -> bytes:
+    """Serialize podcasts column-wise."""
+    return pack_sections([
+        pack_strings([podcast.id for podcast in podcasts]),
+        pack_strings([podcast.name for podcast in podcasts]),
+        pack_strings([podcast.publisher for podcast in podcasts]),
+        pack_strings([podcast.description for podcast in podcasts]),
+        np.array(
+            [podcast.total_episodes if podcast.total_episodes is not None else -1 for podcast in podcasts],
+            dtype="<i4",
+        ).tobytes(),
+    ])
+
+
+def _load_podcasts(data: bytes) -> list[Podcast]:
+    """Deserialize podcasts written by _dump_podcasts."""
+    ids, names, publishers, descriptions, totals = unpack_sections(data)
+    return [
+        Podcast(
+            id=podcast_id,
+            name=name,
+            publisher=publisher,
+            description=description,
+            total_episodes=total if total >= 0 else None,
+        )
+        for podcast_id, name, publisher, description, total in zip(
+            unpack_required_strings(ids),
+            unpack_required_strings(names),
+            unpack_strings(publishers),
+            unpack_strings(descriptions),
+            np.frombuffer(totals, dtype="<i4").tolist(),
+        )
+    ]
+
+
+# Saved episodes change often; keep them briefly
+episode_cache: AsyncCache[EpisodeStore] = AsyncCache(
+    name="saved_episodes",
+    ttl_seconds=settings.EPISODE_CACHE_TTL_SECONDS,
+    stale_seconds=settings.CACHE_STALE_SECONDS,
+    # Keep libraries around as the base for incremental syncs
+    retain_seconds=settings.LIBRARY_FULL_SYNC_SECONDS,
+    backend=create_backend(
+        "saved_episodes",
+        max_bytes=settings.EPISODE_CACHE_MAX_MB * 1024 * 1024,
+        sizeof=lambda store: store.nbytes,
+        dumps=EpisodeStore.to_bytes,
+        loads=EpisodeStore.from_bytes,
+    ),
+)
+
+# Followed show metadata changes rarely; keep it longer
+show_cache: AsyncCache[list[Podcast]] = AsyncCache(
+    name="followed_shows",
+    ttl_seconds=settings.SHOW_CACHE_TTL_SECONDS,
+    stale_seconds=settings.CACHE_STALE_SECONDS,
+    backend=create_backend(
+        "followed_shows",
+        max_bytes=settings.SHOW_CACHE_MAX_MB * 1024 * 1024,
+        sizeof=_podcasts_nbytes,
+        dumps=_dump_podcasts,
+        loads=_load_podcasts,
+    ),
+)
+
+
+# Client running each user's in-flight library load
+_loading_clients: dict[str, SpotifyClient] = {}
+
+
+async def get_user_library(user_id: str, spotify: SpotifyClient) -> EpisodeStore:
+    """
+    Get a user's saved episodes as a columnar store, from cache when possible.
+
+    A refresh of a cached library only fetches episodes saved since it was
+    built and prepends them. When nothing is cached, the library persisted
+    in the metadata store is used as the base for that refresh. A full
+    fetch runs when neither has the library, when the last full fetch is
+    older than ``LIBRARY_FULL_SYNC_SECONDS``, or when Spotify's total shows
+    episodes were removed. Every change is written back to the store.
+
+    Concurrent callers share one load. If a caller with a higher priority
+    joins (a user waiting on a background prefetch), the load's remaining
+    Spotify requests are sent at that priority.
+
+    Args:
+        user_id: Spotify user ID (cache key)
+        spotify: Authenticated client used on a miss or refresh
+
+    Returns:
+        EpisodeStore in library order (most recently saved first)
+    """
+    async def load(previous: EpisodeStore | None) -> EpisodeStore:
+        _loading_clients[user_id] = spotify
+        try:
+            return await sync(previous)
+        finally:
+            _loading_clients.pop(user_id, None)
+
+    async def sync(previous: EpisodeStore | None) -> EpisodeStore:
+        if previous is None:
+            # Nothing cached (e.g. a freshly started worker): resume from disk
+            previous = await metadata_store.load_library(user_id, settings.LIBRARY_FULL_SYNC_SECONDS)
+        if previous is not None and time.time() - previous.full_synced_at < settings.LIBRARY_FULL_SYNC_SECONDS:
+            new_episodes, total, skipped = await spotify.get_saved_episodes_since(previous.__contains__)
+            # Spotify's total also counts saved items it no longer has an episode
+            # for. Those have no id, so the ones seen before the first known
+            # episode may already be in previous.unavailable; the total says
+            # how many of them are new. Fewer items than that means removals.
+            new_unavailable = total - len(previous) - previous.unavailable - len(new_episodes)
+            if 0 <= new_unavailable <= skipped:
+                if not new_episodes and not new_unavailable:
+                    return previous
+                with generation_stage_seconds.time("classify"):
+                    content_classes = classify_episodes(new_episodes)
+                library = previous.prepend(new_episodes, content_classes, unavailable=new_unavailable)
+                await metadata_store.save_library(user_id, library, range(len(new_episodes)))
+                return library
+            logger.info("Library of user %s lost episodes upstream, running full sync", user_id)
+
+        episodes: list[Episode] = []
+        unavailable = 0
+        async for batch, skipped in spotify.iter_saved_episodes():
+            episodes.extend(batch)
+            unavailable += skipped
+        # Pages arrive out of order; restore Spotify's newest-saved-first order
+        episodes.sort(key=lambda episode: episode.added_at or "", reverse=True)
+        with generation_stage_seconds.time("classify"):
+            content_classes = classify_episodes(episodes)
+        library = EpisodeStore.from_episodes(episodes, content_classes, unavailable=unavailable)
+        await metadata_store.save_library(user_id, library)
+        return library
+
+    loading = _loading_clients.get(user_id)
+    if loading is not None and spotify.priority < loading.priority:
+        loading.priority = spotify.priority
+
+    with generation_stage_seconds.time("fetch"):
+        return await episode_cache.get(user_id, load)
+
+
+async def get_user_shows(user_id: str, spotify: SpotifyClient) -> list[Podcast]:
+    """
+    Get a user's followed podcasts, from cache when possible.
+
+    Args:
+        user_id: Spotify user ID (cache key)
+        spotify: Authenticated client used on a miss or refresh
+
+    Returns:
+        List of podcasts
+    """
+    async def load(previous: list[Podcast] | None) -> list[Podcast]:
+        return await spotify.get_followed_podcasts()
+
+    return await show_cache.get(user_id, load)
+
+
+def cache_stats() -> dict:
+    """
+    Get hit/miss/eviction counters for the library caches and metadata store.
+
+    Returns:
+        Dict of stats per cache
+    """
+    caches: tuple[AsyncCache, ...] = (episode_cache, show_cache)
+    return {
+        **{cache.name: cache.snapshot() for cache in caches},
+        "metadata_store": metadata_store.snapshot(),
+    }
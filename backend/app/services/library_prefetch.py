@@ -0,0 +1,159 @@
+"""Background warming of a user's library caches after login or session resume."""
+
+import asyncio
+import logging
+import time
+
+from app.config import settings
+from app.core.metrics import registry
+from app.services.http_client import get_http_client
+from app.services.library_cache import get_user_library, get_user_shows
+from app.services.rate_limiter import Priority
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+prefetch_total = registry.counter(
+    "library_prefetch_total",
+    "Library prefetches by trigger (login/resume) and result (warmed/failed/skipped).",
+    ("trigger", "result"),
+)
+
+prefetch_seconds = registry.histogram(
+    "library_prefetch_seconds",
+    "Time to warm a user's library caches, including classification.",
+)
+
+
+class LibraryPrefetcher:
+    """
+    Warms saved episodes (fetched and classified) and followed shows.
+
+    A prefetch starts after a successful login and when a session resumes,
+    i.e. on a user's first request after ``LIBRARY_PREFETCH_IDLE_SECONDS``
+    without one (or the first this process has seen). It loads through
+    the same caches as the routes, so a generate request arriving
+    mid-prefetch joins it instead of fetching again. Its Spotify requests
+    go out at BACKGROUND priority, behind every request a user is waiting
+    on; at most ``LIBRARY_PREFETCH_MAX_CONCURRENT`` users are warmed at once.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        # user_id -> last request (monotonic), least recently seen first
+        self._last_seen: dict[str, float] = {}
+        # Observability
+        self.warmed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def prefetch(self, user_id: str, access_token: str, trigger: str = "login") -> bool:
+        """
+        Start warming a user's library unless it is already being warmed.
+
+        Args:
+            user_id: Spotify user ID
+            access_token: Access token for the user's Spotify requests
+            trigger: What started the prefetch, for metrics ("login" or "resume")
+
+        Returns:
+            True if a prefetch was started
+        """
+        self._last_seen.pop(user_id, None)
+        self._last_seen[user_id] = time.monotonic()
+        if not settings.LIBRARY_PREFETCH_ENABLED or user_id in self._tasks:
+            return False
+        if len(self._tasks) >= settings.LIBRARY_PREFETCH_MAX_CONCURRENT:
+            self.skipped += 1
+            prefetch_total.inc(trigger, "skipped")
+            return False
+
+        spotify = SpotifyClient(
+            access_token=access_token,
+            http_client=get_http_client(),
+            user_id=user_id,
+            priority=Priority.BACKGROUND,
+        )
+        task = asyncio.create_task(self._run(user_id, spotify, trigger))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda done: self._tasks.pop(user_id, None))
+        return True
+
+    def touch(self, user_id: str, access_token: str) -> None:
+        """
+        Record a request from a user, prefetching if it resumes an idle session.
+
+        Called for every authenticated request, so it only does dict work
+        unless a prefetch starts.
+
+        Args:
+            user_id: Spotify user ID
+            access_token: Access token for the user's Spotify requests
+        """
+        now = time.monotonic()
+        last_seen = self._last_seen.get(user_id)
+        if last_seen is not None and now - last_seen < settings.LIBRARY_PREFETCH_IDLE_SECONDS:
+            self._last_seen.pop(user_id)
+            self._last_seen[user_id] = now
+            return
+
+        # Forget users idle past the window, oldest first
+        while self._last_seen:
+            oldest = next(iter(self._last_seen))
+            if now - self._last_seen[oldest] < settings.LIBRARY_PREFETCH_IDLE_SECONDS:
+                break
+            del self._last_seen[oldest]
+        self.prefetch(user_id, access_token, trigger="resume")
+
+    async def stop(self) -> None:
+        """Cancel running prefetches."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        """
+        Get prefetch counters.
+
+        Returns:
+            Dict of stats
+        """
+        return {
+            "running": len(self._tasks),
+            "tracked_users": len(self._last_seen),
+            "warmed": self.warmed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+    async def _run(self, user_id: str, spotify: SpotifyClient, trigger: str) -> None:
+        start = time.perf_counter()
+        try:
+            library, shows = await asyncio.gather(
+                get_user_library(user_id, spotify),
+                get_user_shows(user_id, spotify),
+            )
+        except Exception as e:
+            # Nothing is waiting on this; the next request loads the library itself
+            self.failed += 1
+            prefetch_total.inc(trigger, "failed")
+            logger.warning("Library prefetch failed for user %s: %s", user_id, e)
+            return
+
+        elapsed = time.perf_counter() - start
+        self.warmed += 1
+        prefetch_total.inc(trigger, "warmed")
+        prefetch_seconds.observe(elapsed)
+        logger.debug(
+            "Prefetched library for user %s (%s episodes, %s shows) in %.2fs",
+            user_id,
+            len(library),
+            len(shows),
+            elapsed,
+        )
+
+
+# Shared by every request in the process
+library_prefetcher = LibraryPrefetcher()
@@ -0,0 +1,196 @@
+"""Process-pool offload for CPU-heavy playlist optimization."""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from app.api.schemas import Playlist
+from app.config import settings
+from app.core.episode_store import EpisodeStore
+from app.core.metrics import generation_stage_seconds
+from app.core.playlist_generator import assemble_alternatives, fit_alternatives, select_candidates
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+
+def _fit_shared(name: str, count: int, target_s: int, tolerance_s: int, alternatives: int) -> list[list[int]]:
+    """
+    Run :func:`fit_alternatives` in a worker on columns held in shared memory.
+
+    Args:
+        name: Shared memory block holding ``count`` int64 durations followed
+            by ``count`` int64 podcast indices
+        count: Number of candidates
+        target_s: Target total duration in seconds
+        tolerance_s: Allowed deviation from the target in seconds
+        alternatives: Number of alternatives wanted
+
+    Returns:
+        Index lists of the chosen candidates
+    """
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        columns = np.ndarray((2, count), dtype=np.int64, buffer=block.buf).copy()
+    finally:
+        block.close()
+    return fit_alternatives(columns[0], columns[1], target_s, tolerance_s, alternatives)
+
+
+def _warm_up() -> None:
+    """No-op task that makes a worker process start (and import this module)."""
+
+
+class OptimizerPool:
+    """
+    Runs playlist searches in worker processes once inputs are large enough.
+
+    The search is pure CPU work on two integer columns (durations and
+    podcast indices), so only those cross the process boundary: they are
+    copied once into a shared memory block and the worker returns the
+    chosen indices. Episode models and the store itself never get pickled.
+    Inputs below ``PLAYLIST_OFFLOAD_MIN_CELLS`` (candidates × capacity in
+    seconds × alternatives) run inline, where they finish faster than a
+    round trip to a worker.
+    """
+
+    def __init__(self):
+        self._executor: ProcessPoolExecutor | None = None
+        # Observability
+        self.inline = 0
+        self.offloaded = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """Start worker processes (no-op when ``PLAYLIST_PROCESS_WORKERS`` is 0)."""
+        if self._executor is not None or settings.PLAYLIST_PROCESS_WORKERS <= 0:
+            return
+        # Spawned workers do not inherit the event loop, sockets or locks
+        self._executor = ProcessPoolExecutor(
+            max_workers=settings.PLAYLIST_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        for _ in range(settings.PLAYLIST_PROCESS_WORKERS):
+            self._executor.submit(_warm_up)
+
+    async def stop(self) -> None:
+        """Shut down worker processes."""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def fit_alternatives(
+        self,
+        durations_s: np.ndarray,
+        podcast_idx: np.ndarray,
+        target_s: int,
+        tolerance_s: int,
+        count: int,
+    ) -> list[list[int]]:
+        """
+        Async :func:`fit_alternatives`, offloaded to a worker for large inputs.
+
+        Args:
+            durations_s: Candidate durations in whole seconds
+            podcast_idx: Podcast index per candidate
+            target_s: Target total duration in seconds
+            tolerance_s: Allowed deviation from the target in seconds
+            count: Number of alternatives wanted
+
+        Returns:
+            Index lists into the candidates, each in input order
+        """
+        cells = len(durations_s) * (target_s + max(tolerance_s, 0)) * count
+        if self._executor is None or cells < settings.PLAYLIST_OFFLOAD_MIN_CELLS:
+            self.inline += 1
+            return fit_alternatives(durations_s, podcast_idx, target_s, tolerance_s, count)
+
+        block = shared_memory.SharedMemory(create=True, size=max(2 * 8 * len(durations_s), 1))
+        try:
+            columns = np.ndarray((2, len(durations_s)), dtype=np.int64, buffer=block.buf)
+            columns[0] = durations_s
+            columns[1] = podcast_idx
+            del columns
+            loop = asyncio.get_running_loop()
+            chosen = await loop.run_in_executor(
+                self._executor, _fit_shared, block.name, len(durations_s), target_s, tolerance_s, count
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); replace the pool and answer inline
+            self.failures += 1
+            logger.error("Optimizer process pool broke, restarting it")
+            self._executor = None
+            self.start()
+            return fit_alternatives(durations_s, podcast_idx, target_s, tolerance_s, count)
+        finally:
+            block.close()
+            block.unlink()
+
+        self.offloaded += 1
+        return chosen
+
+    def snapshot(self) -> dict:
+        """
+        Get offload counters.
+
+        Returns:
+            Dict of stats
+        """
+        return {
+            "workers": settings.PLAYLIST_PROCESS_WORKERS if self._executor else 0,
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "failures": self.failures,
+        }
+
+
+# Shared by every request in the process
+optimizer_pool = OptimizerPool()
+
+
+async def generate_playlists(
+    episodes,
+    target_duration: int,
+    run_type: str,
+    content_preference: str,
+    count: int,
+    tolerance_minutes: int | None = None,
+) -> list[Playlist]:
+    """
+    Generate alternative playlists without blocking the event loop on large searches.
+
+    Same contract as ``app.core.playlist_generator.generate_playlists``;
+    candidate selection and playlist assembly stay inline, the search goes
+    through :data:`optimizer_pool`.
+
+    Args:
+        episodes: EpisodeStore, or list of available episodes
+        target_duration: Target duration in minutes
+        run_type: Type of run (easy/tempo/long)
+        content_preference: Content preference (light/mixed/deep)
+        count: Number of alternatives wanted
+        tolerance_minutes: Allowed over/under in minutes (defaults to settings)
+
+    Returns:
+        Playlists, best first
+    """
+    if tolerance_minutes is None:
+        tolerance_minutes = settings.PLAYLIST_DURATION_TOLERANCE_MINUTES
+
+    store = episodes if isinstance(episodes, EpisodeStore) else EpisodeStore.from_episodes(episodes)
+
+    with generation_stage_seconds.time("optimize"):
+        candidates, durations_s = select_candidates(store, target_duration, content_preference, tolerance_minutes)
+        alternatives = await optimizer_pool.fit_alternatives(
+            durations_s,
+            store.podcast_idx[candidates],
+            target_duration * 60,
+            tolerance_minutes * 60,
+            count,
+        )
+        return assemble_alternatives(store, candidates, alternatives, target_duration)
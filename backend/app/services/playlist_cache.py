@@ -0,0 +1,94 @@
+"""Per-user cache of generated playlist alternatives."""
+
+import logging
+
+from pydantic import BaseModel
+
+from app.api.schemas import Playlist, PlaylistGenerationRequest
+from app.config import settings
+from app.core.cache import AsyncCache
+from app.core.cache_backends import create_backend
+from app.core.episode_store import EpisodeStore
+from app.services.optimizer_pool import generate_playlists
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+
+class PlaylistAlternatives(BaseModel):
+    """Alternatives generated for one set of parameters."""
+    playlists: list[Playlist]
+    next_index: int = 1  # Alternative handed out by the next regenerate
+
+
+def _alternatives_nbytes(alternatives: PlaylistAlternatives) -> int:
+    """Approximate memory footprint of cached alternatives."""
+    return 256 + 1024 * sum(len(playlist.items) for playlist in alternatives.playlists)
+
+
+def _alternatives_key(user_id: str, library: EpisodeStore, params: PlaylistGenerationRequest) -> str:
+    # The library fingerprint makes any library change a miss
+    return (
+        f"{user_id}:{library.fingerprint}:"
+        f"{params.duration_minutes}:{params.run_type}:{params.content_preference}"
+    )
+
+
+alternatives_cache: AsyncCache[PlaylistAlternatives] = AsyncCache(
+    name="playlist_alternatives",
+    ttl_seconds=settings.PLAYLIST_ALTERNATIVES_TTL_SECONDS,
+    stale_seconds=0,
+    backend=create_backend(
+        "playlist_alternatives",
+        max_bytes=settings.PLAYLIST_CACHE_MAX_MB * 1024 * 1024,
+        sizeof=_alternatives_nbytes,
+        dumps=lambda alternatives: alternatives.model_dump_json().encode(),
+        loads=PlaylistAlternatives.model_validate_json,
+    ),
+)
+
+
+async def get_playlist(
+    user_id: str,
+    library: EpisodeStore,
+    params: PlaylistGenerationRequest,
+    regenerate: bool = False,
+) -> Playlist:
+    """
+    Get a playlist for the run parameters.
+
+    The first request for a (user, library fingerprint, duration, run type,
+    content preference) generates ``PLAYLIST_ALTERNATIVES`` distinct
+    playlists in one search and caches them. Plain requests return the best
+    one; ``regenerate`` hands out the next alternative (cycling back to the
+    first) without searching again. Once the library changes, its new
+    fingerprint misses the cache and the alternatives are generated afresh.
+
+    Args:
+        user_id: Spotify user ID
+        library: User's episode library
+        params: Generation parameters
+        regenerate: Return the next alternative instead of the best
+
+    Returns:
+        Playlist
+    """
+    async def load(previous: PlaylistAlternatives | None) -> PlaylistAlternatives:
+        playlists = await generate_playlists(
+            library,
+            target_duration=params.duration_minutes,
+            run_type=params.run_type,
+            content_preference=params.content_preference,
+            count=settings.PLAYLIST_ALTERNATIVES,
+        )
+        return PlaylistAlternatives(playlists=playlists)
+
+    key = _alternatives_key(user_id, library, params)
+    alternatives = await alternatives_cache.get(key, load)
+    if not regenerate:
+        return alternatives.playlists[0]
+
+    index = alternatives.next_index % len(alternatives.playlists)
+    alternatives.next_index = index + 1
+    await alternatives_cache.set(key, alternatives)
+    return alternatives.playlists[index]
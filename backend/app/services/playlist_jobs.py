@@ -0,0 +1,237 @@
+"""Background playlist generation jobs."""
+
+import asyncio
+import logging
+import secrets
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.api.schemas import Playlist, PlaylistGenerationRequest, PlaylistJobStatus
+from app.config import settings
+from app.services.library_cache import get_user_library
+from app.services.playlist_cache import get_playlist
+from app.services.rate_limiter import SpotifyRateLimited
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue cannot take another job."""
+
+
+@dataclass
+class Job:
+    """A playlist generation job and its progress."""
+    id: str
+    user_id: str
+    params: PlaylistGenerationRequest
+    spotify: SpotifyClient
+    status: str = "queued"  # queued | running | succeeded | failed
+    stage: str = "queued"  # queued | fetching_library | optimizing | done
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    result: Playlist | None = None
+    error: str | None = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def key(self) -> tuple:
+        """Coalescing key: same user, same generation parameters."""
+        return (self.user_id, *self.params.model_dump().values())
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def update(self, **fields) -> None:
+        """Apply field changes and wake anyone waiting for progress."""
+        for name, value in fields.items():
+            setattr(self, name, value)
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+    def to_status(self) -> PlaylistJobStatus:
+        return PlaylistJobStatus(
+            job_id=self.id,
+            status=self.status,
+            stage=self.stage,
+            result=self.result,
+            error=self.error,
+        )
+
+
+class PlaylistJobManager:
+    """
+    Runs playlist generation on a bounded pool of asyncio workers.
+
+    Submitting returns a job at once; a fixed number of worker tasks pull
+    jobs from a bounded queue and run the fetch-classify-optimize pipeline,
+    so a burst of submissions cannot start unbounded concurrent library
+    fetches. While a job is queued or running, a submission from the same
+    user with identical parameters joins it instead of creating another.
+    Finished jobs are kept for polling for ``PLAYLIST_JOB_RETENTION_SECONDS``.
+    """
+
+    def __init__(self):
+        self.jobs: dict[str, Job] = {}
+        self._pending: dict[tuple, Job] = {}
+        # Replaced by start() when the pool runs on a new event loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=settings.PLAYLIST_JOB_QUEUE_SIZE)
+        self._workers: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Observability
+        self.submitted = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def submit(self, user_id: str, params: PlaylistGenerationRequest, spotify: SpotifyClient) -> Job:
+        """
+        Queue a generation job, or join an identical one in flight.
+
+        Args:
+            user_id: Spotify user ID
+            params: Generation parameters
+            spotify: Client used to fetch the user's library
+
+        Returns:
+            The new or joined job
+
+        Raises:
+            JobQueueFull: If the queue is at capacity
+        """
+        self.start()
+        self._prune()
+
+        job = Job(id=secrets.token_urlsafe(16), user_id=user_id, params=params, spotify=spotify)
+        existing = self._pending.get(job.key)
+        if existing is not None:
+            self.coalesced += 1
+            return existing
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull()
+        self.jobs[job.id] = job
+        self._pending[job.key] = job
+        self.submitted += 1
+        return job
+
+    def get(self, job_id: str, user_id: str) -> Job | None:
+        """
+        Look up a job owned by a user.
+
+        Args:
+            job_id: Job id
+            user_id: Spotify user ID of the requester
+
+        Returns:
+            Job, or None if unknown, expired or owned by another user
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    def start(self) -> None:
+        """Start the worker pool (idempotent; restarts on a new event loop)."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=settings.PLAYLIST_JOB_QUEUE_SIZE)
+        self._pending = {}
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(settings.PLAYLIST_JOB_WORKERS)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the worker pool."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def snapshot(self) -> dict:
+        """
+        Get queue depth and job counters.
+
+        Returns:
+            Dict of stats
+        """
+        running = sum(1 for job in self._pending.values() if job.status == "running")
+        return {
+            "queued": self._queue.qsize(),
+            "running": running,
+            "workers": len(self._workers),
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "retained": len(self.jobs),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._pending.pop(job.key, None)
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        """Run the generation pipeline for one job, recording the outcome."""
+        started = time.monotonic()
+        try:
+            job.update(status="running", stage="fetching_library")
+            library = await get_user_library(job.user_id, job.spotify)
+
+            job.update(stage="optimizing")
+            playlist = await get_playlist(job.user_id, library, job.params)
+        except asyncio.CancelledError:
+            job.update(status="failed", error="Job cancelled", finished_at=time.time())
+            raise
+        except SpotifyRateLimited as e:
+            self.failed += 1
+            logger.warning("Playlist job %s rate limited: %s", job.id, e)
+            job.update(
+                status="failed",
+                error="Spotify is rate limiting requests. Please try again shortly.",
+                finished_at=time.time(),
+            )
+            return
+        except httpx.HTTPError as e:
+            self.failed += 1
+            logger.error("Failed to fetch library for playlist job %s: %s", job.id, e, exc_info=True)
+            job.update(
+                status="failed",
+                error="Failed to retrieve episodes from Spotify. Please try again later.",
+                finished_at=time.time(),
+            )
+            return
+        except Exception as e:
+            self.failed += 1
+            logger.error("Playlist job %s failed: %s", job.id, e, exc_info=True)
+            job.update(status="failed", error="Playlist generation failed.", finished_at=time.time())
+            return
+
+        job.update(status="succeeded", stage="done", result=playlist, finished_at=time.time())
+        logger.info("Playlist job %s finished in %.2fs", job.id, time.monotonic() - started)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention period."""
+        cutoff = time.time() - settings.PLAYLIST_JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+
+# Shared by every request in the process
+job_manager = PlaylistJobManager()
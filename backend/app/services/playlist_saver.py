@@ -0,0 +1,176 @@
+"""Idempotent pipeline for saving generated playlists to Spotify."""
+
+import asyncio
+import hashlib
+import logging
+import time
+
+from pydantic import BaseModel
+
+from app.api.schemas import SavePlaylistRequest, SavePlaylistResponse
+from app.config import settings
+from app.core.cache_backends import create_backend
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Save records are tiny; this bounds the in-process backend only
+_MAX_RECORD_BYTES = 8 * 1024 * 1024
+
+
+class IdempotencyKeyConflict(Exception):
+    """Raised when an idempotency key is reused with a different request."""
+
+
+class PlaylistCreationFailed(Exception):
+    """Raised when Spotify's create-playlist response has no playlist id."""
+
+
+class SaveRecord(BaseModel):
+    """Progress of one save, stored under its idempotency key."""
+    request_hash: str
+    playlist_id: str | None = None
+    playlist_url: str | None = None
+    added: int = 0  # Episodes appended so far, in order
+    completed: bool = False
+
+
+def _request_hash(request: SavePlaylistRequest) -> str:
+    return hashlib.blake2b(request.model_dump_json().encode(), digest_size=16).hexdigest()
+
+
+def _episode_uri(episode_id: str) -> str:
+    return f"spotify:episode:{episode_id}"
+
+
+class PlaylistSaver:
+    """
+    Creates a playlist and appends its episodes in ordered batches.
+
+    With an idempotency key, progress is recorded after the playlist is
+    created and after every batch, under (user, key) in the configured
+    cache backend. A repeated request returns the stored result of a
+    completed save without calling Spotify, and resumes an interrupted one
+    from the first missing batch instead of creating a second playlist.
+    Concurrent requests with the same key share one run per process.
+    """
+
+    def __init__(self):
+        self.records = create_backend(
+            "playlist_saves",
+            max_bytes=_MAX_RECORD_BYTES,
+            sizeof=lambda record: 512,
+            dumps=lambda record: record.model_dump_json().encode(),
+            loads=SaveRecord.model_validate_json,
+        )
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def save(
+        self,
+        user_id: str,
+        request: SavePlaylistRequest,
+        spotify: SpotifyClient,
+        idempotency_key: str | None = None,
+    ) -> SavePlaylistResponse:
+        """
+        Save a playlist to the user's Spotify account.
+
+        Args:
+            user_id: Spotify user ID
+            request: Playlist name and episode IDs in order
+            spotify: Authenticated client for the user
+            idempotency_key: Client-supplied key making retries safe
+
+        Returns:
+            Saved playlist
+
+        Raises:
+            IdempotencyKeyConflict: If the key was used for a different request
+            PlaylistCreationFailed: If Spotify returned no playlist id
+        """
+        if idempotency_key is None:
+            record = SaveRecord(request_hash=_request_hash(request))
+            return await self._run(None, record, request, spotify)
+
+        key = f"{user_id}:{idempotency_key}"
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._save_keyed(key, request, spotify))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Clear the in-flight marker; failures are reported to the awaiting callers."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _save_keyed(
+        self,
+        key: str,
+        request: SavePlaylistRequest,
+        spotify: SpotifyClient,
+    ) -> SavePlaylistResponse:
+        request_hash = _request_hash(request)
+        entry = await self.records.get(key)
+        if entry is None:
+            record = SaveRecord(request_hash=request_hash)
+        else:
+            record = entry[1]
+            if record.request_hash != request_hash:
+                raise IdempotencyKeyConflict()
+            if record.completed:
+                return self._response(record)
+            logger.info("Resuming playlist save %s after %s episodes", key, record.added)
+        return await self._run(key, record, request, spotify)
+
+    async def _run(
+        self,
+        key: str | None,
+        record: SaveRecord,
+        request: SavePlaylistRequest,
+        spotify: SpotifyClient,
+    ) -> SavePlaylistResponse:
+        """Create the playlist if needed and append the remaining batches."""
+        playlist_id = record.playlist_id
+        if playlist_id is None:
+            playlist = await spotify.create_playlist(request.playlist_name)
+            playlist_id = playlist.get("id")
+            if not playlist_id:
+                raise PlaylistCreationFailed("Spotify created a playlist without an id")
+            record.playlist_id = playlist_id
+            record.playlist_url = (playlist.get("external_urls") or {}).get("spotify")
+            await self._store(key, record)
+
+        done = record.added
+
+        async def progress(added: int) -> None:
+            record.added = done + added
+            await self._store(key, record)
+
+        uris = [_episode_uri(episode_id) for episode_id in request.episode_ids[done:]]
+        await spotify.add_episodes_to_playlist(playlist_id, uris, on_batch=progress)
+
+        record.completed = True
+        await self._store(key, record)
+        return self._response(record)
+
+    async def _store(self, key: str | None, record: SaveRecord) -> None:
+        if key is not None:
+            await self.records.set(key, record, time.time(), settings.PLAYLIST_SAVE_RECORD_TTL_SECONDS)
+
+    @staticmethod
+    def _response(record: SaveRecord) -> SavePlaylistResponse:
+        if record.playlist_id is None:
+            raise ValueError("Playlist save record has no playlist id")
+        return SavePlaylistResponse(
+            playlist_id=record.playlist_id,
+            playlist_url=record.playlist_url,
+            episodes_added=record.added,
+        )
+
+
+# Shared by every request in the process
+playlist_saver = PlaylistSaver()
@@ -0,0 +1,326 @@
+"""Rate-limit-aware scheduler for Spotify API requests."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+
+import httpx
+
+from app.config import settings
+from app.core.metrics import registry
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Idle per-user buckets are pruned once this many exist
+_MAX_USER_BUCKETS = 10_000
+
+# Failures before the request reached Spotify; safe to retry for any method
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+scheduler_wait_seconds = registry.histogram(
+    "spotify_scheduler_wait_seconds",
+    "Time a Spotify request waited for a rate-limit slot.",
+    ("priority",),
+)
+
+
+class Priority(IntEnum):
+    """Request priority; lower values are dispatched first."""
+    INTERACTIVE = 0  # A user is waiting on the response (/auth/me, generate)
+    BACKGROUND = 1  # Library warming and other prefetches
+
+
+class SpotifyRateLimited(Exception):
+    """Raised when a request cannot be sent within its wait budget."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Spotify rate limit exceeded, retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize bucket (starts full).
+
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0 if available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now: float) -> None:
+        """Consume one token (call only when wait_time() is 0)."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class RequestScheduler:
+    """
+    Central gate for outbound Spotify requests.
+
+    Every request takes a token from an app-wide bucket and from its user's
+    bucket before it is sent. Waiting requests are dispatched by priority,
+    then arrival order. A 429 pauses all dispatching for its ``Retry-After``
+    (Spotify limits per app), and 5xx/transport errors are retried with
+    jittered exponential backoff. Non-idempotent requests (POSTs) are only
+    retried when Spotify cannot have applied them: after a 429 or an error
+    before the connection was made. Requests that would wait longer than their
+    priority's budget fail fast with SpotifyRateLimited instead of piling up.
+    """
+
+    def __init__(self):
+        self.app_bucket = TokenBucket(
+            settings.SPOTIFY_RATE_LIMIT_PER_SECOND,
+            settings.SPOTIFY_RATE_LIMIT_BURST,
+        )
+        self.user_buckets: dict[str, TokenBucket] = {}
+        self.paused_until = 0.0
+        self._waiters: list[tuple[int, int, str | None, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        # Observability
+        self.sent = 0
+        self.throttled = 0
+        self.retries = 0
+        self.rejected = 0
+        self._recent_waits: deque[float] = deque(maxlen=1000)
+
+    async def send(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        user_key: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+        idempotent: bool = True,
+    ) -> httpx.Response:
+        """
+        Send a request once rate limits allow, retrying 429/5xx responses.
+
+        Args:
+            request: Coroutine function performing the HTTP call
+            user_key: Per-user bucket key (None for app-level calls)
+            priority: Dispatch priority
+            idempotent: Whether repeating the request is harmless; if not,
+                only 429s and connect-phase transport errors are retried
+
+        Returns:
+            Final response (may still be an error status after retries)
+
+        Raises:
+            SpotifyRateLimited: If the request cannot be sent within its wait budget
+        """
+        max_wait = self._max_wait(priority)
+        for attempt in range(settings.SPOTIFY_MAX_RETRIES + 1):
+            await self._acquire(user_key, priority, max_wait)
+            self.sent += 1
+            try:
+                response = await request()
+            except httpx.TransportError as e:
+                if attempt == settings.SPOTIFY_MAX_RETRIES or not (idempotent or isinstance(e, _CONNECT_ERRORS)):
+                    # The request may have been applied; repeating it could duplicate it
+                    raise
+                logger.warning("Spotify transport error, retrying: %s", e)
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code == 429:
+                self.throttled += 1
+                retry_after = _retry_after_seconds(response)
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+                logger.warning("Spotify returned 429, pausing requests for %.1fs", retry_after)
+                if attempt == settings.SPOTIFY_MAX_RETRIES or retry_after > max_wait:
+                    self.rejected += 1
+                    raise SpotifyRateLimited(retry_after)
+                self.retries += 1
+                continue
+
+            if response.status_code >= 500 and idempotent and attempt < settings.SPOTIFY_MAX_RETRIES:
+                logger.warning("Spotify returned %s, retrying", response.status_code)
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            return response
+
+        raise AssertionError("unreachable")
+
+    def snapshot(self) -> dict:
+        """
+        Get queue depth, wait times and retry counters.
+
+        Returns:
+            Dict of stats
+        """
+        waits = sorted(self._recent_waits)
+        depth = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, _, future in self._waiters:
+            if not future.done():
+                depth[Priority(priority).name.lower()] += 1
+        return {
+            "queue_depth": depth,
+            "sent": self.sent,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "paused_for_seconds": max(0.0, self.paused_until - time.monotonic()),
+            "wait_seconds_p50": waits[len(waits) // 2] if waits else 0.0,
+            "wait_seconds_p95": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            "wait_seconds_max": waits[-1] if waits else 0.0,
+        }
+
+    async def _acquire(self, user_key: str | None, priority: Priority, max_wait: float) -> None:
+        """Wait until the dispatcher grants this request a slot."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (e.g. test clients): start afresh
+            self._loop = loop
+            self._waiters = []
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+        future: asyncio.Future = loop.create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), user_key, future))
+        self._wakeup.set()
+
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise SpotifyRateLimited(max(self.paused_until - time.monotonic(), 1.0))
+        waited = time.monotonic() - start
+        self._recent_waits.append(waited)
+        scheduler_wait_seconds.observe(waited, priority.name.lower())
+
+    async def _dispatch(self) -> None:
+        """Grant waiting requests slots as buckets refill."""
+        while self._waiters:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await self._sleep(self.paused_until - now)
+                continue
+
+            app_wait = self.app_bucket.wait_time(now)
+            if app_wait > 0:
+                await self._sleep(app_wait)
+                continue
+
+            granted = False
+            user_wait = float("inf")
+            for entry in sorted(self._waiters):
+                future = entry[3]
+                if future.done():
+                    continue
+                bucket = self._user_bucket(entry[2], now)
+                wait = bucket.wait_time(now) if bucket else 0.0
+                if wait == 0:
+                    self.app_bucket.take(now)
+                    if bucket:
+                        bucket.take(now)
+                    future.set_result(None)
+                    granted = True
+                    break
+                user_wait = min(user_wait, wait)
+
+            # Drop granted and abandoned waiters
+            self._waiters = [entry for entry in self._waiters if not entry[3].done()]
+            heapq.heapify(self._waiters)
+
+            if not granted and self._waiters:
+                await self._sleep(user_wait)
+
+    async def _sleep(self, delay: float) -> None:
+        """Sleep up to ``delay`` seconds, waking early when a request arrives."""
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _user_bucket(self, user_key: str | None, now: float) -> TokenBucket | None:
+        if user_key is None:
+            return None
+        bucket = self.user_buckets.get(user_key)
+        if bucket is None:
+            if len(self.user_buckets) >= _MAX_USER_BUCKETS:
+                self.user_buckets = {
+                    key: value for key, value in self.user_buckets.items() if not value.is_full(now)
+                }
+            bucket = TokenBucket(
+                settings.SPOTIFY_USER_RATE_LIMIT_PER_SECOND,
+                settings.SPOTIFY_USER_RATE_LIMIT_BURST,
+            )
+            self.user_buckets[user_key] = bucket
+        return bucket
+
+    @staticmethod
+    def _max_wait(priority: Priority) -> float:
+        if priority == Priority.INTERACTIVE:
+            return settings.SPOTIFY_INTERACTIVE_MAX_WAIT_SECONDS
+        return settings.SPOTIFY_BACKGROUND_MAX_WAIT_SECONDS
+
+    @staticmethod
+    def _backoff(attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(settings.SPOTIFY_BACKOFF_MAX_SECONDS, settings.SPOTIFY_BACKOFF_BASE_SECONDS * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    """Parse the Retry-After header (seconds), defaulting to one second."""
+    try:
+        return max(float(response.headers.get("Retry-After", 1)), 0.0)
+    except ValueError:
+        return 1.0
+
+
+# Shared by every SpotifyClient in the process
+scheduler = RequestScheduler()
+
+registry.counter_callback(
+    "spotify_scheduler_events_total",
+    "Spotify requests sent, 429s received, retries and requests rejected for exceeding their wait budget.",
+    ("event",),
+    lambda: {
+        ("sent",): scheduler.sent,
+        ("throttled",): scheduler.throttled,
+        ("retried",): scheduler.retries,
+        ("rejected",): scheduler.rejected,
+    },
+)
+registry.gauge_callback(
+    "spotify_scheduler_queue_depth",
+    "Spotify requests waiting for a rate-limit slot.",
+    ("priority",),
+    lambda: {(priority,): depth for priority, depth in scheduler.snapshot()["queue_depth"].items()},
+)
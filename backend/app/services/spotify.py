@@ -1,35 +1,102 @@
 """Spotify API client."""
 
+import asyncio
 import base64
 import logging
+import re
+import time
 import httpx
+from collections.abc import AsyncIterator, Awaitable, Callable
 from urllib.parse import urlencode
 
 from app.config import settings
+from app.core.metrics import registry
+from app.models.episode import Episode
+from app.models.podcast import Podcast
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import Priority, scheduler
 
 # Create logger for this module
 logger = logging.getLogger(__name__)
 
+# Spotify caps multi-ID lookups (GET /episodes, GET /shows) at 50 IDs
+MAX_IDS_PER_REQUEST = 50
+
+# Spotify caps playlist additions at 100 URIs per request
+MAX_URIS_PER_REQUEST = 100
+
+# User and playlist IDs in paths would make one label per object
+_PATH_IDS = re.compile(r"/(users|playlists)/[^/]+")
+
+upstream_request_seconds = registry.histogram(
+    "spotify_request_duration_seconds",
+    "Latency of individual Spotify HTTP requests (each retry counts), by endpoint and status.",
+    ("method", "endpoint", "status"),
+)
+
+
+def _endpoint_label(url: str) -> str:
+    """Path of a Spotify URL with object IDs replaced by ``{id}``."""
+    return _PATH_IDS.sub(r"/\1/{id}", httpx.URL(url).path)
+
+
+def _parse_episode(item: dict, added_at: str | None = None) -> Episode:
+    """Convert a Spotify episode object to an Episode."""
+    show = item.get("show") or {}
+    return Episode(
+        id=item["id"],
+        name=item.get("name", ""),
+        duration_ms=item.get("duration_ms", 0),
+        description=item.get("description"),
+        podcast_name=show.get("name", ""),
+        podcast_id=show.get("id", ""),
+        release_date=item.get("release_date"),
+        added_at=added_at,
+    )
+
+
+def _parse_podcast(item: dict) -> Podcast:
+    """Convert a Spotify show object to a Podcast."""
+    return Podcast(
+        id=item["id"],
+        name=item.get("name", ""),
+        publisher=item.get("publisher"),
+        description=item.get("description"),
+        total_episodes=item.get("total_episodes"),
+    )
+
 
 class SpotifyClient:
     """Client for interacting with Spotify API."""
     
-    def __init__(self, access_token: str | None = None):
+    def __init__(
+        self,
+        access_token: str | None = None,
+        http_client: httpx.AsyncClient | None = None,
+        user_id: str | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
         """
         Initialize Spotify client.
         
         Args:
             access_token: Optional access token for authenticated requests
+            http_client: Pooled HTTP client (defaults to the shared app client)
+            user_id: Spotify user ID, used for per-user rate limiting
+            priority: Scheduling priority for this client's requests
         """
-        logger.info("Initializing SpotifyClient")
+        # One client is built per request; keep this off the INFO hot path
         if access_token:
             logger.debug("SpotifyClient initialized with access token")
         else:
             logger.debug("SpotifyClient initialized without access token (OAuth flow)")
         
         self.access_token = access_token
-        self.base_url = "https://api.spotify.com/v1"
-        self.auth_url = "https://accounts.spotify.com"
+        self.http_client = http_client or get_http_client()
+        self.user_id = user_id
+        self.priority = priority
+        self.base_url = settings.SPOTIFY_API_BASE_URL
+        self.auth_url = settings.SPOTIFY_ACCOUNTS_BASE_URL
     
     def get_authorization_url(self, state: str | None = None) -> str:
         """
@@ -82,21 +149,21 @@ class SpotifyClient:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.auth_url}/api/token",
-                    headers=headers,
-                    data=data,
-                )
-                response.raise_for_status()
-                token_data = response.json()
-                logger.info("Successfully exchanged code for tokens")
-                return token_data
+            response = await self._send(
+                "POST",
+                f"{self.auth_url}/api/token",
+                headers=headers,
+                data=data,
+            )
+            response.raise_for_status()
+            token_data = response.json()
+            logger.info("Successfully exchanged code for tokens")
+            return token_data
         except httpx.HTTPStatusError as e:
-            logger.error(f"Failed to exchange code for tokens: {e.response.status_code} - {e.response.text}")
+            logger.error("Failed to exchange code for tokens: %s - %s", e.response.status_code, e.response.text)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error exchanging tokens: {e}")
+            logger.error("Unexpected error exchanging tokens: %s", e)
             raise
     
     async def refresh_access_token(self, refresh_token: str) -> dict:
@@ -123,14 +190,14 @@ class SpotifyClient:
             "refresh_token": refresh_token,
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.auth_url}/api/token",
-                headers=headers,
-                data=data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._send(
+            "POST",
+            f"{self.auth_url}/api/token",
+            headers=headers,
+            data=data,
+        )
+        response.raise_for_status()
+        return response.json()
     
     async def get_user_profile(self) -> dict:
         """
@@ -150,38 +217,381 @@ class SpotifyClient:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/me",
-                    headers=headers,
-                )
-                response.raise_for_status()
-                user_data = response.json()
-                logger.info(f"Successfully retrieved user profile: {user_data.get('id')}")
-                return user_data
+            response = await self._send("GET", f"{self.base_url}/me", headers=headers)
+            response.raise_for_status()
+            user_data = response.json()
+            logger.debug("Successfully retrieved user profile: %s", user_data.get("id"))
+            return user_data
         except httpx.HTTPStatusError as e:
-            logger.error(f"Failed to get user profile: {e.response.status_code} - {e.response.text}")
+            logger.error("Failed to get user profile: %s - %s", e.response.status_code, e.response.text)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error getting user profile: {e}")
+            logger.error("Unexpected error getting user profile: %s", e)
             raise
     
-    async def get_saved_episodes(self, limit: int = 50, offset: int = 0):
-        """Get user's saved episodes."""
-        # TODO: Implement in Sprint 2
-        raise NotImplementedError("Not yet implemented")
-    
-    async def get_followed_podcasts(self):
-        """Get user's followed podcasts."""
-        # TODO: Implement in Sprint 2
-        raise NotImplementedError("Not yet implemented")
-    
-    async def create_playlist(self, name: str, description: str = ""):
-        """Create a new playlist."""
-        # TODO: Implement in Sprint 5
-        raise NotImplementedError("Not yet implemented")
-    
-    async def add_episodes_to_playlist(self, playlist_id: str, episode_uris: list[str]):
-        """Add episodes to a playlist."""
-        # TODO: Implement in Sprint 5
-        raise NotImplementedError("Not yet implemented")
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the shared rate-limit scheduler.
+        
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            **kwargs: Passed to httpx.AsyncClient.request
+            
+        Returns:
+            Response (status not yet checked)
+        """
+        endpoint = _endpoint_label(url)
+        
+        async def request() -> httpx.Response:
+            start = time.perf_counter()
+            status = "error"
+            try:
+                response = await self.http_client.request(method, url, **kwargs)
+                status = str(response.status_code)
+                return response
+            finally:
+                upstream_request_seconds.observe(time.perf_counter() - start, method, endpoint, status)
+        
+        return await scheduler.send(
+            request,
+            user_key=self.user_id or self.access_token,
+            priority=self.priority,
+            # POSTs (token exchange, playlist creation, adding items) must not be repeated
+            idempotent=method != "POST",
+        )
+    
+    async def _get(self, path: str, params: dict | None = None) -> dict:
+        """
+        Make an authenticated GET request against the Web API.
+        
+        Args:
+            path: API path relative to the base URL (e.g. "/me/episodes")
+            params: Optional query parameters
+            
+        Returns:
+            Decoded JSON response
+        """
+        if not self.access_token:
+            logger.error("Access token required but not provided")
+            raise ValueError("Access token required")
+        
+        response = await self._send(
+            "GET",
+            f"{self.base_url}{path}",
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            params=params,
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def _post(self, path: str, body: dict) -> dict:
+        """
+        Make an authenticated POST request with a JSON body against the Web API.
+        
+        Args:
+            path: API path relative to the base URL
+            body: JSON body
+            
+        Returns:
+            Decoded JSON response
+        """
+        if not self.access_token:
+            logger.error("Access token required but not provided")
+            raise ValueError("Access token required")
+        
+        response = await self._send(
+            "POST",
+            f"{self.base_url}{path}",
+            headers={"Authorization": f"Bearer {self.access_token}"},
+            json=body,
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    async def _iter_pages(
+        self,
+        path: str,
+        start: int = 0,
+        stop: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Stream pages of a paginated endpoint, fetching them concurrently.
+        
+        The first page is fetched alone to learn ``total``; the remaining
+        offsets are then requested concurrently, bounded by
+        ``SPOTIFY_PAGE_CONCURRENCY``. Pages are yielded as they complete, so
+        callers should use each page's ``offset`` if order matters.
+        
+        Args:
+            path: API path of a paging endpoint
+            start: Offset of the first item
+            stop: Offset to stop before (defaults to the reported total)
+            
+        Yields:
+            Paging objects with ``items``, ``offset`` and ``total``
+        """
+        page_size = settings.SPOTIFY_PAGE_SIZE
+        
+        def page_params(offset: int) -> dict:
+            limit = page_size if stop is None else min(page_size, stop - offset)
+            return {"limit": limit, "offset": offset}
+        
+        if stop is not None and stop <= start:
+            return
+        
+        first_page = await self._get(path, params=page_params(start))
+        yield first_page
+        
+        total = first_page.get("total", 0)
+        end = total if stop is None else min(stop, total)
+        offsets = range(start + page_size, end, page_size)
+        if not offsets:
+            return
+        
+        semaphore = asyncio.Semaphore(settings.SPOTIFY_PAGE_CONCURRENCY)
+        
+        async def fetch(offset: int) -> dict:
+            async with semaphore:
+                return await self._get(path, params=page_params(offset))
+        
+        tasks = [asyncio.create_task(fetch(offset)) for offset in offsets]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield await next_page
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def iter_saved_episodes(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> AsyncIterator[tuple[list[Episode], int]]:
+        """
+        Stream the user's saved episodes in page-sized batches.
+        
+        Batches arrive in completion order, not library order. Saved items
+        without an episode (no longer available on Spotify) are skipped but
+        counted, since Spotify's library total includes them.
+        
+        Args:
+            limit: Maximum number of episodes (defaults to the whole library)
+            offset: Offset of the first saved episode
+            
+        Yields:
+            Tuples of (episodes, number of items skipped for having no episode)
+        """
+        stop = None if limit is None else offset + limit
+        async for page in self._iter_pages("/me/episodes", start=offset, stop=stop):
+            items = page.get("items", [])
+            episodes = [
+                _parse_episode(item["episode"], item.get("added_at"))
+                for item in items
+                if item.get("episode")
+            ]
+            yield episodes, len(items) - len(episodes)
+    
+    async def get_saved_episodes(self, limit: int = 50, offset: int = 0) -> list[Episode]:
+        """
+        Get user's saved episodes, newest-saved first.
+        
+        Args:
+            limit: Maximum number of episodes
+            offset: Offset of the first saved episode
+            
+        Returns:
+            List of episodes
+        """
+        logger.debug("Getting saved episodes (limit=%s, offset=%s)", limit, offset)
+        
+        pages: list[tuple[int, list[Episode]]] = []
+        stop = offset + limit
+        async for page in self._iter_pages("/me/episodes", start=offset, stop=stop):
+            episodes = [
+                _parse_episode(item["episode"], item.get("added_at"))
+                for item in page.get("items", [])
+                if item.get("episode")
+            ]
+            pages.append((page.get("offset", 0), episodes))
+        
+        pages.sort(key=lambda page: page[0])
+        return [episode for _, episodes in pages for episode in episodes]
+    
+    async def get_saved_episodes_since(
+        self,
+        is_known: Callable[[str], bool],
+    ) -> tuple[list[Episode], int, int]:
+        """
+        Get episodes saved since the last sync (incremental sync).
+        
+        Saved episodes are returned newest-saved first, so pages are read
+        sequentially and reading stops at the first page containing an
+        already-known episode. Only additions are detected; comparing the
+        returned total with the known library size reveals removals.
+        
+        Args:
+            is_known: Returns True for episode IDs already in the local library
+            
+        Returns:
+            Tuple of (new episodes newest first, current library total,
+            items without an episode seen before the first known one; these
+            may include items counted by an earlier sync)
+        """
+        new_episodes: list[Episode] = []
+        skipped = 0
+        total = 0
+        offset = 0
+        while True:
+            page = await self._get(
+                "/me/episodes",
+                params={"limit": settings.SPOTIFY_PAGE_SIZE, "offset": offset},
+            )
+            total = page.get("total", 0)
+            items = page.get("items", [])
+            reached_known = False
+            for item in items:
+                if not item.get("episode"):
+                    skipped += 1
+                    continue
+                if is_known(item["episode"]["id"]):
+                    reached_known = True
+                    break
+                new_episodes.append(_parse_episode(item["episode"], item.get("added_at")))
+            
+            offset += len(items)
+            if reached_known or not items or offset >= total:
+                break
+        
+        logger.debug("Incremental sync found %s new saved episodes", len(new_episodes))
+        return new_episodes, total, skipped
+    
+    async def iter_followed_podcasts(self) -> AsyncIterator[list[Podcast]]:
+        """
+        Stream the user's followed podcasts in page-sized batches.
+        
+        Yields:
+            Lists of podcasts
+        """
+        async for page in self._iter_pages("/me/shows"):
+            yield [
+                _parse_podcast(item["show"])
+                for item in page.get("items", [])
+                if item.get("show")
+            ]
+    
+    async def get_followed_podcasts(self) -> list[Podcast]:
+        """
+        Get user's followed podcasts.
+        
+        Returns:
+            List of podcasts
+        """
+        podcasts: list[Podcast] = []
+        async for batch in self.iter_followed_podcasts():
+            podcasts.extend(batch)
+        return podcasts
+    
+    async def _get_several(self, path: str, key: str, ids: list[str]) -> list[dict]:
+        """
+        Look up objects through a multi-ID endpoint in concurrent batches.
+        
+        Args:
+            path: Multi-ID endpoint path (e.g. "/episodes")
+            key: Response key holding the objects (e.g. "episodes")
+            ids: Object IDs
+            
+        Returns:
+            Objects in the order of ``ids``; unknown IDs are dropped
+        """
+        batch_size = MAX_IDS_PER_REQUEST
+        semaphore = asyncio.Semaphore(settings.SPOTIFY_PAGE_CONCURRENCY)
+        
+        async def fetch(batch: list[str]) -> list[dict]:
+            async with semaphore:
+                data = await self._get(path, params={"ids": ",".join(batch)})
+                return [item for item in data.get(key, []) if item]
+        
+        results = await asyncio.gather(
+            *(fetch(ids[i:i + batch_size]) for i in range(0, len(ids), batch_size))
+        )
+        return [item for batch in results for item in batch]
+    
+    async def get_episodes(self, episode_ids: list[str]) -> list[Episode]:
+        """
+        Get several episodes by ID, batched through the multi-ID endpoint.
+        
+        Args:
+            episode_ids: Spotify episode IDs
+            
+        Returns:
+            List of episodes
+        """
+        items = await self._get_several("/episodes", "episodes", episode_ids)
+        return [_parse_episode(item) for item in items]
+    
+    async def get_shows(self, show_ids: list[str]) -> list[Podcast]:
+        """
+        Get several shows by ID, batched through the multi-ID endpoint.
+        
+        Args:
+            show_ids: Spotify show IDs
+            
+        Returns:
+            List of podcasts
+        """
+        items = await self._get_several("/shows", "shows", show_ids)
+        return [_parse_podcast(item) for item in items]
+    
+    async def create_playlist(self, name: str, description: str = "", public: bool = True) -> dict:
+        """
+        Create a new playlist owned by the current user.
+        
+        Args:
+            name: Playlist name
+            description: Playlist description
+            public: Whether the playlist is public (the app only requests
+                the playlist-modify-public scope)
+            
+        Returns:
+            Spotify playlist object (id, external_urls, ...)
+        """
+        if not self.user_id:
+            raise ValueError("User ID required to create a playlist")
+        
+        return await self._post(
+            f"/users/{self.user_id}/playlists",
+            {"name": name, "description": description, "public": public},
+        )
+    
+    async def add_episodes_to_playlist(
+        self,
+        playlist_id: str,
+        episode_uris: list[str],
+        on_batch: Callable[[int], Awaitable[None]] | None = None,
+    ) -> str | None:
+        """
+        Append episodes to a playlist in maximal batches, preserving order.
+        
+        Batches of up to MAX_URIS_PER_REQUEST are sent one after another
+        (each appends at the end, so they must not overlap); 429/5xx
+        responses are retried by the scheduler.
+        
+        Args:
+            playlist_id: Spotify playlist ID
+            episode_uris: Episode URIs ("spotify:episode:<id>") in playlist order
+            on_batch: Optional coroutine called with the number of URIs
+                added so far after each batch (used to record progress)
+            
+        Returns:
+            Snapshot ID of the playlist after the last batch, or None if
+            there was nothing to add
+        """
+        snapshot_id = None
+        for start in range(0, len(episode_uris), MAX_URIS_PER_REQUEST):
+            batch = episode_uris[start:start + MAX_URIS_PER_REQUEST]
+            data = await self._post(f"/playlists/{playlist_id}/tracks", {"uris": batch})
+            snapshot_id = data.get("snapshot_id")
+            if on_batch is not None:
+                await on_batch(start + len(batch))
+        return snapshot_id
@@ -0,0 +1,296 @@
+"""Server-side store for Spotify OAuth tokens with proactive refresh."""
+
+import asyncio
+import json
+import logging
+import secrets
+import time
+from dataclasses import asdict, dataclass
+
+import httpx
+
+from app.config import settings
+from app.core.cache_backends import create_backend
+from app.services.http_client import get_http_client
+from app.services.rate_limiter import Priority, SpotifyRateLimited
+from app.services.spotify import SpotifyClient
+
+# Create logger for this module
+logger = logging.getLogger(__name__)
+
+# Spotify access tokens last an hour; used when a response omits expires_in
+DEFAULT_EXPIRES_IN_SECONDS = 3600
+
+# Retry-After suggested when an expired token cannot be refreshed right now
+REFRESH_RETRY_AFTER_SECONDS = 5
+
+
+class TokenRefreshError(Exception):
+    """Raised when an expired access token cannot be refreshed (Spotify error or rate limit)."""
+
+    def __init__(self, user_id: str, retry_after: float):
+        super().__init__(f"Could not refresh the access token for user {user_id}")
+        self.retry_after = retry_after
+
+
+@dataclass
+class TokenSet:
+    """A user's current Spotify tokens."""
+    access_token: str
+    refresh_token: str
+    expires_at: float  # Wall-clock expiry of the access token
+
+    @classmethod
+    def from_response(cls, token_data: dict, previous: "TokenSet | None" = None) -> "TokenSet":
+        """
+        Build from a Spotify token endpoint response.
+
+        Args:
+            token_data: Parsed response (access_token, expires_in, optional refresh_token)
+            previous: Token set being refreshed; its refresh token is kept if
+                Spotify does not issue a new one
+
+        Returns:
+            TokenSet
+        """
+        refresh_token = token_data.get("refresh_token") or (previous.refresh_token if previous else "")
+        expires_in = token_data.get("expires_in") or DEFAULT_EXPIRES_IN_SECONDS
+        return cls(
+            access_token=token_data["access_token"],
+            refresh_token=refresh_token,
+            expires_at=time.time() + expires_in,
+        )
+
+
+def _dump_tokens(tokens: TokenSet) -> bytes:
+    return json.dumps(asdict(tokens)).encode()
+
+
+def _load_tokens(data: bytes) -> TokenSet:
+    return TokenSet(**json.loads(data))
+
+
+class TokenStore:
+    """
+    Spotify tokens held server-side, keyed by opaque session id.
+
+    Session cookies carry only a random session id. The id maps to a user
+    and the user to their current token set, so every session of a user
+    shares one refresh. Access tokens are refreshed before they expire:
+    on access when inside the refresh margin, and by a background loop for
+    users seen recently. Refreshes are single-flight per user, so concurrent
+    requests wait on one token request instead of each sending their own.
+    Both maps live in the configured cache backend, so Redis shares sessions
+    between workers. The memory backend is per process, so it only suits a
+    single worker, and its sessions end when the process restarts.
+    """
+
+    def __init__(self):
+        self.sessions = create_backend(
+            "sessions",
+            max_bytes=settings.TOKEN_STORE_MAX_MB * 1024 * 1024 // 4,
+            sizeof=lambda user_id: len(user_id) + 128,
+            dumps=str.encode,
+            loads=bytes.decode,
+        )
+        self.tokens = create_backend(
+            "tokens",
+            max_bytes=settings.TOKEN_STORE_MAX_MB * 1024 * 1024,
+            sizeof=lambda tokens: len(tokens.access_token) + len(tokens.refresh_token) + 256,
+            dumps=_dump_tokens,
+            loads=_load_tokens,
+        )
+        # Users seen by this process: user_id -> (last seen, access token expiry)
+        self._active: dict[str, tuple[float, float]] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._refresher: asyncio.Task | None = None
+        # Observability
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def create_session(self, user_id: str, token_data: dict) -> str:
+        """
+        Store a user's tokens and open a new session for them.
+
+        Args:
+            user_id: Spotify user ID
+            token_data: Token endpoint response from the authorization code exchange
+
+        Returns:
+            New opaque session id
+        """
+        tokens = TokenSet.from_response(token_data)
+        await self._save(user_id, tokens)
+        self._active[user_id] = (time.time(), tokens.expires_at)
+
+        session_id = secrets.token_urlsafe(32)
+        expire_seconds = settings.SESSION_EXPIRE_MINUTES * 60
+        await self.sessions.set(session_id, user_id, time.time(), expire_seconds)
+        return session_id
+
+    async def get_access_token(self, session_id: str) -> tuple[str, str] | None:
+        """
+        Resolve a session to its user and a usable access token.
+
+        Refreshes the token first if it expires within the refresh margin.
+
+        Args:
+            session_id: Opaque session id from the session cookie
+
+        Returns:
+            Tuple of (user_id, access_token), or None if the session is
+            unknown or its tokens were revoked
+
+        Raises:
+            TokenRefreshError: The access token has expired and Spotify
+                could not refresh it
+        """
+        entry = await self.sessions.get(session_id)
+        if entry is None:
+            return None
+        user_id = entry[1]
+
+        entry = await self.tokens.get(user_id)
+        if entry is None:
+            return None
+        tokens = entry[1]
+
+        now = time.time()
+        if tokens.expires_at - now < settings.TOKEN_REFRESH_MARGIN_SECONDS:
+            try:
+                tokens = await self.refresh(user_id, Priority.INTERACTIVE)
+            except Exception as e:
+                if tokens.expires_at <= now:
+                    retry_after = e.retry_after if isinstance(e, SpotifyRateLimited) else REFRESH_RETRY_AFTER_SECONDS
+                    raise TokenRefreshError(user_id, retry_after) from e
+                # Still valid for a little while; the background loop retries
+                logger.warning("Token refresh failed for user %s, using current token", user_id, exc_info=True)
+            if tokens is None:
+                return None
+
+        self._active[user_id] = (now, tokens.expires_at)
+        return user_id, tokens.access_token
+
+    async def delete_session(self, session_id: str) -> None:
+        """
+        End a session. The user's tokens stay for their other sessions.
+
+        Args:
+            session_id: Opaque session id
+        """
+        await self.sessions.delete(session_id)
+
+    async def refresh(self, user_id: str, priority: Priority = Priority.BACKGROUND) -> TokenSet | None:
+        """
+        Refresh a user's access token, joining a refresh already in flight.
+
+        Args:
+            user_id: Spotify user ID
+            priority: Scheduler priority for the token request
+
+        Returns:
+            New token set, or None if the user has no tokens or the refresh
+            token was rejected
+        """
+        task = self._refreshing.get(user_id)
+        if task is None:
+            task = asyncio.create_task(self._refresh(user_id, priority))
+            self._refreshing[user_id] = task
+            task.add_done_callback(lambda done: self._finish(user_id, done))
+        return await asyncio.shield(task)
+
+    def start(self) -> None:
+        """Start the background refresh loop."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+
+    def snapshot(self) -> dict:
+        """
+        Get refresh counters.
+
+        Returns:
+            Dict of stats
+        """
+        return {
+            "active_users": len(self._active),
+            "refreshing": len(self._refreshing),
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+        }
+
+    async def _save(self, user_id: str, tokens: TokenSet) -> None:
+        # Tokens outlive the access token so later sessions can still refresh
+        expire_seconds = settings.SESSION_EXPIRE_MINUTES * 60
+        await self.tokens.set(user_id, tokens, time.time(), expire_seconds)
+
+    def _finish(self, user_id: str, task: asyncio.Task) -> None:
+        """Clear the in-flight marker; failures are reported to the awaiting callers."""
+        self._refreshing.pop(user_id, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _refresh(self, user_id: str, priority: Priority) -> TokenSet | None:
+        entry = await self.tokens.get(user_id)
+        if entry is None:
+            self._active.pop(user_id, None)
+            return None
+        previous = entry[1]
+        if previous.expires_at - time.time() >= settings.TOKEN_REFRESH_MARGIN_SECONDS:
+            # Already refreshed (e.g. by another worker sharing the backend)
+            return previous
+
+        spotify = SpotifyClient(http_client=get_http_client(), user_id=user_id, priority=priority)
+        try:
+            token_data = await spotify.refresh_access_token(previous.refresh_token)
+        except httpx.HTTPStatusError as e:
+            self.refresh_errors += 1
+            if e.response.status_code in (400, 401):
+                # Refresh token revoked or invalid: the user has to log in again
+                logger.warning("Refresh token rejected for user %s, dropping tokens", user_id)
+                await self.tokens.delete(user_id)
+                self._active.pop(user_id, None)
+                return None
+            raise
+        except Exception:
+            self.refresh_errors += 1
+            raise
+
+        tokens = TokenSet.from_response(token_data, previous)
+        await self._save(user_id, tokens)
+        if user_id in self._active:
+            # Keep the last-seen time: background refreshes are not activity
+            self._active[user_id] = (self._active[user_id][0], tokens.expires_at)
+        self.refreshes += 1
+        logger.debug("Refreshed access token for user %s", user_id)
+        return tokens
+
+    async def _refresh_loop(self) -> None:
+        """Refresh tokens of recently seen users before they expire."""
+        while True:
+            await asyncio.sleep(settings.TOKEN_REFRESH_INTERVAL_SECONDS)
+            now = time.time()
+            due = []
+            for user_id, (last_seen, expires_at) in list(self._active.items()):
+                if now - last_seen > settings.TOKEN_KEEP_WARM_SECONDS:
+                    del self._active[user_id]
+                elif expires_at - now < settings.TOKEN_REFRESH_MARGIN_SECONDS:
+                    due.append(user_id)
+
+            results = await asyncio.gather(*(self.refresh(user_id) for user_id in due), return_exceptions=True)
+            for user_id, result in zip(due, results):
+                if isinstance(result, Exception):
+                    logger.warning("Background token refresh failed for user %s: %s", user_id, result)
+
+
+# Shared by every request in the process
+token_store = TokenStore()
@@ -0,0 +1,72 @@
+"""
+Content classifier throughput on synthetic descriptions.
+
+Compares a naive per-keyword substring scan against the compiled lexicon,
+then reruns the batch to show the cost of cached (unchanged) episodes.
+
+Usage:
+    python -m benchmarks.bench_classifier [--episodes 100000]
+"""
+
+import argparse
+import random
+import time
+
+from app.core.content_classifier import DEEP_KEYWORDS, LIGHT_KEYWORDS, ContentClassifier
+from app.models.episode import Episode
+
+FILLER = (
+    "the a of and to in we this week our guest talks about with from on new "
+    "episode today listen more join us for conversation story life people"
+).split()
+
+
+def make_episodes(count: int, seed: int = 7) -> list[Episode]:
+    """Build episodes with ~60-word descriptions, roughly 3% lexicon keywords."""
+    rng = random.Random(seed)
+    vocabulary = FILLER * 80 + list(LIGHT_KEYWORDS) + list(DEEP_KEYWORDS)
+    return [
+        Episode(
+            id=f"episode-{index}",
+            name=" ".join(rng.choices(vocabulary, k=6)),
+            duration_ms=rng.randint(10, 150) * 60_000,
+            description=" ".join(rng.choices(vocabulary, k=60)).capitalize() + ".",
+            podcast_name=f"Podcast {index % 500}",
+            podcast_id=f"show-{index % 500}",
+        )
+        for index in range(count)
+    ]
+
+
+def naive_scan(episodes: list[Episode]) -> int:
+    """Baseline: one lowercase substring search per keyword per episode."""
+    keywords = [(word, -1) for word in LIGHT_KEYWORDS] + [(word, 1) for word in DEEP_KEYWORDS]
+    total = 0
+    for episode in episodes:
+        text = f"{episode.name}\n{episode.podcast_name}\n{episode.description}".lower()
+        total += sum(weight for word, weight in keywords if word in text)
+    return total
+
+
+def _timed(label: str, count: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:24} {elapsed * 1000:9.1f}ms  {count / elapsed:12,.0f} episodes/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--episodes", type=int, default=100_000)
+    args = parser.parse_args()
+
+    episodes = make_episodes(args.episodes)
+    classifier = ContentClassifier()
+
+    _timed("naive keyword scan", len(episodes), lambda: naive_scan(episodes))
+    _timed("classify_episodes (cold)", len(episodes), lambda: classifier.classify_episodes(episodes))
+    _timed("classify_episodes (warm)", len(episodes), lambda: classifier.classify_episodes(episodes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Per-request latency of SpotifyClient with a fresh vs. pooled HTTP client.
+
+"fresh" reproduces the old behaviour (a new httpx.AsyncClient, and so a new
+connection, for every call); "pooled" reuses one keep-alive client as the app
+now does. The stub server speaks plain HTTP, so the numbers exclude the TLS
+handshake that a fresh connection to api.spotify.com also pays. Client-side
+rate limits are lifted so both modes measure the connection, not throttling.
+
+Usage:
+    python -m benchmarks.bench_http_client [--requests 500]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.config import settings
+from app.services.http_client import create_http_client
+from app.services.rate_limiter import TokenBucket, scheduler
+from app.services.spotify import SpotifyClient
+from benchmarks.stub_server import StubServer, create_stub_app
+
+
+async def _run(mode: str, requests: int) -> list[float]:
+    timings: list[float] = []
+    pooled = create_http_client() if mode == "pooled" else None
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            if pooled is None:
+                async with httpx.AsyncClient() as fresh:
+                    await SpotifyClient("bench-token", http_client=fresh).get_user_profile()
+            else:
+                await SpotifyClient("bench-token", http_client=pooled).get_user_profile()
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        if pooled is not None:
+            await pooled.aclose()
+    return timings
+
+
+def _report(mode: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{mode:7} mean={statistics.mean(timings):6.3f}ms "
+        f"p50={statistics.median(timings):6.3f}ms p95={p95:6.3f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    # The per-user bucket would otherwise pace every request
+    settings.SPOTIFY_USER_RATE_LIMIT_PER_SECOND = settings.SPOTIFY_RATE_LIMIT_PER_SECOND = 1e6
+    settings.SPOTIFY_USER_RATE_LIMIT_BURST = settings.SPOTIFY_RATE_LIMIT_BURST = 1_000_000
+    scheduler.app_bucket = TokenBucket(settings.SPOTIFY_RATE_LIMIT_PER_SECOND, settings.SPOTIFY_RATE_LIMIT_BURST)
+    scheduler.user_buckets.clear()
+
+    with StubServer(create_stub_app()) as server:
+        settings.SPOTIFY_API_BASE_URL = f"{server.url}/v1"
+        for mode in ("fresh", "pooled"):
+            _report(mode, asyncio.run(_run(mode, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
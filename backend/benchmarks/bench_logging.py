@@ -0,0 +1,125 @@
+"""
+Caller-side cost of logging on the request path, before and after the queue handler.
+
+"before" reproduces the old setup: a synchronous StreamHandler from
+basicConfig, an INFO line for every SpotifyClient built per request and
+eagerly formatted f-string debug messages. "after" is the current setup:
+the queue handler (formatting and I/O on a writer thread), that line at
+DEBUG and lazy ``%s`` arguments.
+
+Most records go to /dev/null. There, an emitted record costs the caller
+as much or more through the queue (the writer thread competes for the
+GIL), so the per-request savings come from not emitting or formatting on
+the hot path. The "slow sink" rows model a stalled stdout pipe (1ms per
+write): the synchronous handler stalls the caller (and so the event
+loop), the queue does not.
+
+Usage:
+    python -m benchmarks.bench_logging [--iterations 100000]
+"""
+
+import argparse
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueListener
+
+from app.core.log_config import JsonFormatter, NonBlockingQueueHandler, TextFormatter
+
+
+class SlowStream:
+    """Stream whose writes take ``delay`` seconds, like a backed-up pipe."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def write(self, text: str) -> None:
+        time.sleep(self.delay)
+
+    def flush(self) -> None:
+        pass
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"bench.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+def _per_call_us(iterations: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    devnull = open(os.devnull, "w")
+    sync_handler = logging.StreamHandler(devnull)
+    sync_handler.setFormatter(TextFormatter())
+    before = _logger("before", sync_handler)
+
+    log_queue: queue.Queue = queue.Queue(maxsize=args.iterations * 4)
+    stream_handler = logging.StreamHandler(devnull)
+    stream_handler.setFormatter(TextFormatter())
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    after = _logger("after", NonBlockingQueueHandler(log_queue))
+
+    limit, offset = 50, 100
+    episodes = list(range(200))
+
+    def request_before() -> None:
+        before.info("Initializing SpotifyClient")
+        before.debug(f"Getting saved episodes (limit={limit}, offset={offset})")
+        before.debug(f"Incremental sync found {len(episodes)} new saved episodes")
+
+    def request_after() -> None:
+        after.debug("SpotifyClient initialized with access token")
+        after.debug("Getting saved episodes (limit=%s, offset=%s)", limit, offset)
+        after.debug("Incremental sync found %s new saved episodes", len(episodes))
+
+    rows = [
+        ("disabled debug, f-string", lambda: before.debug(f"Getting saved episodes (limit={limit}, offset={offset})")),
+        ("disabled debug, lazy %s", lambda: after.debug("Getting saved episodes (limit=%s, offset=%s)", limit, offset)),
+        ("INFO, sync StreamHandler", lambda: before.info("Playlist job %s finished in %.2fs", "job", 0.5)),
+        ("INFO, queue handler", lambda: after.info("Playlist job %s finished in %.2fs", "job", 0.5)),
+        ("per request, before", request_before),
+        ("per request, after", request_after),
+    ]
+    results = {}
+    for label, func in rows:
+        results[label] = _per_call_us(args.iterations, func)
+        print(f"{label:26} {results[label]:7.3f}us")
+    listener.stop()
+
+    saved = results["per request, before"] - results["per request, after"]
+    print(f"{'saved per request':26} {saved:7.3f}us (caller side)")
+
+    slow_iterations = max(1, args.iterations // 100)
+    slow_before = _logger("slow_before", logging.StreamHandler(SlowStream(0.001)))
+    slow_queue: queue.Queue = queue.Queue(maxsize=slow_iterations * 2)
+    slow_listener = QueueListener(slow_queue, logging.StreamHandler(SlowStream(0.001)))
+    slow_listener.start()
+    slow_after = _logger("slow_after", NonBlockingQueueHandler(slow_queue))
+    for label, logger in (("INFO, sync, slow sink", slow_before), ("INFO, queue, slow sink", slow_after)):
+        cost = _per_call_us(slow_iterations, lambda: logger.info("Playlist job %s finished", "job"))
+        print(f"{label:26} {cost:7.3f}us")
+    slow_listener.stop()
+
+    # Writer-thread cost per record, off the request path
+    record = logging.LogRecord("bench", logging.INFO, __file__, 0, "Playlist job %s finished", ("job",), None)
+    for label, formatter in (("text format", TextFormatter()), ("json format", JsonFormatter())):
+        print(f"{label:26} {_per_call_us(args.iterations, lambda: formatter.format(record)):7.3f}us (writer thread)")
+    devnull.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Episode metadata store: bulk writes and reads, and the first request after a restart.
+
+Micro section: time to persist a whole library (``save_library``), to
+rebuild it from disk (``load_library``) and to look up a page of episodes
+by id (``get_episodes``), per library size.
+
+Restart section: serves the real app against the stub Spotify server and
+times the first GET /api/episodes after the in-memory library cache is
+dropped, as on a freshly started worker:
+
+- no store: the library is fetched and classified in full
+- store: the library is rebuilt from disk and synced incrementally
+
+Usage:
+    python -m benchmarks.bench_metadata_store [--sizes 1000,10000] [--episodes 2000] [--latency-ms 50]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from app.config import settings
+from app.core.episode_store import EpisodeStore
+from app.core.metadata_store import metadata_store
+from app.main import app
+from app.services.library_cache import episode_cache
+from app.services.rate_limiter import TokenBucket, scheduler
+from benchmarks.bench_classifier import make_episodes
+from benchmarks.harness import measure
+from benchmarks.stub_server import StubServer, create_stub_app
+from benchmarks.suite import _login
+
+USER_ID = "bench-user"
+
+
+def _micro(sizes: list[int], min_time: float) -> None:
+    loop = asyncio.new_event_loop()
+    for size in sizes:
+        store = EpisodeStore.from_episodes(make_episodes(size), ["mixed"] * size)
+        user_id = f"micro-{size}"
+        page = store.ids[::max(1, size // 50)][:50]
+        loop.run_until_complete(metadata_store.save_library(user_id, store))
+
+        rows = [
+            ("save_library (all rows)", lambda: loop.run_until_complete(metadata_store.save_library(user_id, store))),
+            ("load_library", lambda: loop.run_until_complete(metadata_store.load_library(user_id, 3600))),
+            ("get_episodes (50 ids)", lambda: loop.run_until_complete(metadata_store.get_episodes(page))),
+            ("EpisodeStore.from_bytes", lambda data=store.to_bytes(): EpisodeStore.from_bytes(data)),
+        ]
+        print(f"\n{size} episodes")
+        for label, func in rows:
+            result = measure(func, min_time=min_time)
+            print(f"  {label:28} {result['median_us'] / 1000:9.3f}ms")
+    loop.close()
+
+
+async def _first_request(base_url: str) -> float:
+    """Drop the cached library and time the next episodes request."""
+    await episode_cache.invalidate(USER_ID)
+    metadata_store.close()
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        await _login(client)
+        start = time.perf_counter()
+        response = await client.get("/api/episodes", params={"limit": 50})
+        response.raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+
+def _restart(episodes: int, latency_ms: float, rounds: int) -> None:
+    stub = create_stub_app(latency_ms=latency_ms, episodes=episodes)
+    with StubServer(stub) as spotify:
+        settings.SPOTIFY_API_BASE_URL = f"{spotify.url}/v1"
+        settings.SPOTIFY_ACCOUNTS_BASE_URL = spotify.url
+        with StubServer(app) as server:
+            print(f"\nFirst request after restart, {episodes} episodes, {latency_ms:.0f}ms stub latency")
+            for scenario in ("no store", "store"):
+                settings.METADATA_STORE_ENABLED = scenario == "store"
+                # Populate the store before timing
+                asyncio.run(_first_request(server.url))
+                results = []
+                for _ in range(rounds):
+                    before = stub.state.stats["requests"]
+                    elapsed_ms = asyncio.run(_first_request(server.url))
+                    results.append((elapsed_ms, stub.state.stats["requests"] - before))
+                elapsed_ms = statistics.median(result[0] for result in results)
+                spotify_requests = statistics.median(result[1] for result in results)
+                print(f"  {scenario:9} {elapsed_ms:9.1f}ms  ({spotify_requests:.0f} Spotify requests incl. login)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000", help="Library sizes for the micro section")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per measurement")
+    parser.add_argument("--episodes", type=int, default=2000, help="Stub library size")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub latency per request")
+    parser.add_argument("--rounds", type=int, default=3, help="Restarts per scenario")
+    args = parser.parse_args()
+
+    settings.LIBRARY_PREFETCH_ENABLED = False
+    # Client-side rate limits would dominate the full fetch
+    settings.SPOTIFY_USER_RATE_LIMIT_PER_SECOND = settings.SPOTIFY_RATE_LIMIT_PER_SECOND = 1e6
+    settings.SPOTIFY_USER_RATE_LIMIT_BURST = settings.SPOTIFY_RATE_LIMIT_BURST = 1_000_000
+    scheduler.app_bucket = TokenBucket(settings.SPOTIFY_RATE_LIMIT_PER_SECOND, settings.SPOTIFY_RATE_LIMIT_BURST)
+    scheduler.user_buckets.clear()
+    with tempfile.TemporaryDirectory() as directory:
+        settings.METADATA_STORE_PATH = os.path.join(directory, "metadata.db")
+        _micro([int(size) for size in args.sizes.split(",") if size], args.min_time)
+        _restart(args.episodes, args.latency_ms, args.rounds)
+        metadata_store.close()
+
+
+if __name__ == "__main__":
+    main()
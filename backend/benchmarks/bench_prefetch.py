@@ -0,0 +1,107 @@
+"""
+First generate request after login: cold library vs. warmed by the login prefetch.
+
+Serves the real app against the stub Spotify server and, per round, logs in
+through the OAuth callback and times the first POST /api/playlists/generate:
+
+- cold: prefetch disabled, the request pays the whole library fetch
+- mid-prefetch: sent right after login, joins the running prefetch (which
+  is promoted to interactive priority)
+- warm: sent once the prefetch has finished, as after a user picks run
+  settings; the time from login until the prefetch finished is reported too
+
+Library caches are cleared between rounds and the on-disk metadata store is
+disabled, so every round starts from Spotify. Client-side rate limits stay
+on unless ``--unthrottled``, since they dominate a cold fetch of a large
+library.
+
+Usage:
+    python -m benchmarks.bench_prefetch [--episodes 2000] [--latency-ms 50] [--rounds 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from app.config import settings
+from app.main import app
+from app.services.library_cache import episode_cache, show_cache
+from app.services.library_prefetch import library_prefetcher
+from app.services.playlist_cache import alternatives_cache
+from app.services.rate_limiter import TokenBucket, scheduler
+from benchmarks.stub_server import StubServer, create_stub_app
+from benchmarks.suite import GENERATE_BODY, _login, _wait_for_optimizer
+
+USER_ID = "bench-user"
+
+
+async def _first_generate(base_url: str, scenario: str) -> dict:
+    """Log in and time the first generate request of one scenario."""
+    settings.LIBRARY_PREFETCH_ENABLED = scenario != "cold"
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        login_at = time.perf_counter()
+        await _login(client)
+
+        prefetch_ms = None
+        if scenario == "warm":
+            while library_prefetcher.snapshot()["running"]:
+                await asyncio.sleep(0.01)
+            prefetch_ms = (time.perf_counter() - login_at) * 1000
+
+        start = time.perf_counter()
+        response = await client.post("/api/playlists/generate", json=GENERATE_BODY)
+        response.raise_for_status()
+        return {"generate_ms": (time.perf_counter() - start) * 1000, "prefetch_ms": prefetch_ms}
+
+
+async def _clear_library() -> None:
+    await episode_cache.invalidate(USER_ID)
+    await show_cache.invalidate(USER_ID)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--episodes", type=int, default=2000, help="Stub library size")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub latency per request")
+    parser.add_argument("--rounds", type=int, default=3, help="Logins per scenario")
+    parser.add_argument("--unthrottled", action="store_true", help="Disable client-side Spotify rate limits")
+    args = parser.parse_args()
+
+    if args.unthrottled:
+        settings.SPOTIFY_USER_RATE_LIMIT_PER_SECOND = settings.SPOTIFY_RATE_LIMIT_PER_SECOND = 1e6
+        settings.SPOTIFY_USER_RATE_LIMIT_BURST = settings.SPOTIFY_RATE_LIMIT_BURST = 1_000_000
+    # Every first request should search, not hit the alternatives cache
+    alternatives_cache.ttl_seconds = 0
+    # Cold rounds must fetch in full, not rebuild the library from the metadata store
+    settings.METADATA_STORE_ENABLED = False
+
+    stub = create_stub_app(latency_ms=args.latency_ms, episodes=args.episodes)
+    with StubServer(stub) as spotify:
+        settings.SPOTIFY_API_BASE_URL = f"{spotify.url}/v1"
+        settings.SPOTIFY_ACCOUNTS_BASE_URL = spotify.url
+        with StubServer(app) as server:
+            _wait_for_optimizer()
+            for scenario in ("cold", "mid-prefetch", "warm"):
+                results = []
+                for _ in range(args.rounds):
+                    asyncio.run(_clear_library())
+                    # Start each round with full rate-limit budgets
+                    scheduler.app_bucket = TokenBucket(
+                        settings.SPOTIFY_RATE_LIMIT_PER_SECOND,
+                        settings.SPOTIFY_RATE_LIMIT_BURST,
+                    )
+                    scheduler.user_buckets.clear()
+                    results.append(asyncio.run(_first_generate(server.url, scenario)))
+                generate_ms = statistics.median(result["generate_ms"] for result in results)
+                line = f"{scenario:13} first generate {generate_ms:9.1f}ms"
+                if scenario == "warm":
+                    prefetch_ms = statistics.median(result["prefetch_ms"] for result in results)
+                    line += f"  (prefetch finished {prefetch_ms:.0f}ms after login)"
+                print(line)
+
+
+if __name__ == "__main__":
+    main()
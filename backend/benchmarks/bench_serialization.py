@@ -0,0 +1,91 @@
+"""
+Serialization cost of episode pages and playlists, FastAPI default path vs. fast path.
+
+"fastapi default" is what a route returning models with a ``response_model``
+pays: validated models are built, validated again against the response
+model, passed through ``jsonable_encoder`` and dumped with stdlib json.
+The episode fast path builds dicts straight from the EpisodeStore columns
+and renders them with FastJSONResponse (orjson); the playlist fast path
+serializes the cached model with pydantic-core (``model_dump_json``), which
+beats ``model_dump()`` plus orjson. Playlist assembly (once per cache miss)
+is shown per model vs. one ``model_validate`` over column dicts.
+
+Usage:
+    python -m benchmarks.bench_serialization [--sizes 50,500,5000] [--min-time 0.5]
+"""
+
+import argparse
+import asyncio
+import json
+
+import numpy as np
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api import responses
+from app.api.responses import FastJSONResponse
+from app.api.schemas import Episode, Playlist, PlaylistItem
+from app.core.episode_store import EpisodeStore
+from app.core.playlist_generator import assemble_playlist
+from benchmarks.bench_classifier import make_episodes
+from benchmarks.harness import measure
+
+
+def _fastapi_default(loop: asyncio.AbstractEventLoop, field, content) -> bytes:
+    """Render ``content`` the way FastAPI does for a route with ``response_model``."""
+    encoded = loop.run_until_complete(serialize_response(field=field, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def _playlist_per_model(store: EpisodeStore, chosen: np.ndarray) -> Playlist:
+    """Playlist assembled one Episode and PlaylistItem at a time (the previous assemble_playlist)."""
+    items = [PlaylistItem(episode=store.episode(index), order=order) for order, index in enumerate(chosen.tolist())]
+    total_ms = int(store.duration_ms[chosen].sum())
+    return Playlist(items=items, total_duration_minutes=round(total_ms / 60000, 2), target_duration_minutes=60)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="50,500,5000", help="Items per response")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per measurement")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    store = EpisodeStore.from_episodes(make_episodes(max(sizes)))
+    episodes_field = create_response_field(name="episodes", type_=list[Episode])
+    playlist_field = create_response_field(name="playlist", type_=Playlist)
+    loop = asyncio.new_event_loop()
+
+    def stdlib_dumps(content) -> bytes:
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    for size in sizes:
+        indices = np.arange(size)
+        playlist = assemble_playlist(store, indices, 60)
+        # Both paths must produce the same document
+        default = _fastapi_default(loop, episodes_field, [store.episode(index) for index in range(size)])
+        assert json.loads(default) == json.loads(FastJSONResponse(store.episode_dicts(indices)).body)
+
+        rows = [
+            (
+                "episodes: fastapi default",
+                lambda: _fastapi_default(loop, episodes_field, [store.episode(index) for index in range(size)]),
+            ),
+            ("episodes: dicts + orjson", lambda: FastJSONResponse(store.episode_dicts(indices)).body),
+            ("episodes: dicts + stdlib json", lambda: stdlib_dumps(store.episode_dicts(indices))),
+            ("playlist: assemble per model", lambda: _playlist_per_model(store, indices)),
+            ("playlist: assemble_playlist", lambda: assemble_playlist(store, indices, 60)),
+            ("playlist: fastapi default", lambda: _fastapi_default(loop, playlist_field, playlist)),
+            ("playlist: model_dump + orjson", lambda: responses.dumps(playlist.model_dump())),
+            ("playlist: model_dump_json", playlist.model_dump_json),
+        ]
+        print(f"\n{size} items")
+        for label, func in rows:
+            result = measure(func, min_time=args.min_time)
+            print(f"  {label:32} {result['median_us'] / 1000:9.3f}ms")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Request overhead of session verification on an authenticated no-op endpoint.
+
+Runs the same endpoint (depending on get_current_user and get_spotify_client,
+as the real routes do) with the verified-session LRU disabled and enabled,
+plus a direct get_session microbenchmark.
+
+Usage:
+    python -m benchmarks.bench_session [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from app.api.deps import get_current_user, get_spotify_client
+from app.config import settings
+from app.core import session
+from app.services.token_store import token_store
+
+
+def create_noop_app() -> FastAPI:
+    """App with a single authenticated endpoint that does no work."""
+    noop = FastAPI()
+
+    @noop.get("/noop")
+    async def noop_endpoint(user: dict = Depends(get_current_user), spotify=Depends(get_spotify_client)):
+        return {"user_id": user["user_id"]}
+
+    return noop
+
+
+def make_cookie() -> str:
+    """Signed session cookie shaped like the real one, backed by a stored session."""
+    session_id = asyncio.run(token_store.create_session(
+        "bench-user",
+        {"access_token": "x" * 200, "refresh_token": "y" * 130, "expires_in": 3600},
+    ))
+    return session.serializer.dumps({"sid": session_id, "created_at": "2024-01-01T00:00:00"})
+
+
+async def _endpoint_overhead(requests: int, cookie: str) -> float:
+    transport = httpx.ASGITransport(app=create_noop_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", cookies={"session": cookie}) as client:
+        for _ in range(100):
+            await client.get("/noop")
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get("/noop")
+            response.raise_for_status()
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+def _get_session_cost(iterations: int, cookie: str) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        request = SimpleNamespace(cookies={"session": cookie}, state=SimpleNamespace())
+        session.get_session(request)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    cookie = make_cookie()
+    for label, cache_size in (("no session cache", 0), ("session LRU", 10_000)):
+        settings.SESSION_CACHE_SIZE = cache_size
+        session._verified_sessions.clear()
+        per_call = _get_session_cost(args.requests * 4, cookie)
+        per_request = asyncio.run(_endpoint_overhead(args.requests, cookie))
+        print(f"{label:18} get_session={per_call:7.2f}us  /noop request={per_request:7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Timing, percentile and baseline helpers shared by the benchmark suite."""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+# Metrics compared against a baseline, and which direction is an improvement
+LOWER_IS_BETTER = ("median_us", "elapsed_ms", "p50_ms", "p95_ms", "p99_ms")
+HIGHER_IS_BETTER = ("throughput_rps",)
+
+
+def measure(
+    func: Callable[[], object],
+    min_rounds: int = 5,
+    min_time: float = 1.0,
+    round_time: float = 0.05,
+) -> dict:
+    """
+    Time a callable in the style of pytest-benchmark.
+
+    The callable is calibrated so one round (a batch of calls) takes about
+    ``round_time`` seconds, then rounds run until both ``min_rounds`` and
+    ``min_time`` are reached. Statistics are per call.
+
+    Args:
+        func: Zero-argument callable to time
+        min_rounds: Minimum number of timed rounds
+        min_time: Minimum total timed duration in seconds
+        round_time: Target duration of one round in seconds
+
+    Returns:
+        Dict with min/max/mean/median/stddev (microseconds), ops per second,
+        rounds and iterations per round
+    """
+    func()  # Warm-up
+
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= round_time / 2 or iterations >= 1 << 20:
+            break
+        iterations *= 2
+
+    timings: list[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append((time.perf_counter() - start) / iterations * 1e6)
+
+    median = statistics.median(timings)
+    return {
+        "min_us": round(min(timings), 3),
+        "max_us": round(max(timings), 3),
+        "mean_us": round(statistics.mean(timings), 3),
+        "median_us": round(median, 3),
+        "stddev_us": round(statistics.stdev(timings), 3) if len(timings) > 1 else 0.0,
+        "ops": round(1e6 / median, 1),
+        "rounds": len(timings),
+        "iterations": iterations,
+    }
+
+
+def summarize_latencies(latencies_ms: list[float], elapsed_seconds: float) -> dict:
+    """
+    Summarize request latencies from a load run.
+
+    Args:
+        latencies_ms: Per-request latencies in milliseconds
+        elapsed_seconds: Wall-clock duration of the run
+
+    Returns:
+        Dict with request count, throughput and p50/p95/p99
+    """
+    ordered = sorted(latencies_ms)
+    return {
+        "requests": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+    }
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+
+    Args:
+        ordered: Sorted values
+        fraction: Percentile as a fraction (0.99 for p99)
+
+    Returns:
+        Percentile value, or 0.0 for no values
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def save_results(path: str, results: dict[str, dict], config: dict) -> None:
+    """
+    Write results as a JSON baseline.
+
+    Args:
+        path: Output file
+        results: Metrics per benchmark name
+        config: Parameters the run used (compared runs should match)
+    """
+    document = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def load_results(path: str) -> dict:
+    """
+    Read a JSON baseline written by save_results.
+
+    Args:
+        path: Baseline file
+
+    Returns:
+        Baseline document
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare_results(
+    baseline: dict[str, dict],
+    results: dict[str, dict],
+    threshold: float,
+) -> list[tuple[str, str, float, float, float, bool]]:
+    """
+    Compare results against a baseline.
+
+    Only benchmarks and metrics present in both are compared.
+
+    Args:
+        baseline: Metrics per benchmark name from the baseline
+        results: Metrics per benchmark name from this run
+        threshold: Relative change counted as a regression (0.15 is 15% worse)
+
+    Returns:
+        Rows of (benchmark, metric, baseline value, current value, relative
+        change, regressed), where a positive change is always worse
+    """
+    rows = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            if metric not in current or not previous.get(metric):
+                continue
+            change = (current[metric] - previous[metric]) / previous[metric]
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            rows.append((name, metric, previous[metric], current[metric], change, change > threshold))
+    return rows
@@ -0,0 +1,138 @@
+"""
+Latency of light endpoints while playlists are being generated.
+
+Serves the real app on a local port (Spotify replaced by the stub server)
+with a large library already cached for one user. A few clients loop on
+POST /api/playlists/generate while probes hit /health and /api/auth/me;
+p50/p95/p99 are reported with the optimizer inline
+(PLAYLIST_PROCESS_WORKERS=0) and with the process pool. Library durations
+are multiples of 7s and the target is not, so every search runs to the end.
+
+The app and the load generator share one process (and GIL), so inline
+searches also delay the probes' own client side; the comparison still
+shows how long the event loop is blocked.
+
+Usage:
+    python -m benchmarks.load_generation [--episodes 20000] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date
+
+import httpx
+import numpy as np
+
+from app.config import settings
+from app.core.episode_store import CONTENT_CLASS_CODES, EpisodeStore
+from app.core.session import serializer
+from app.main import app
+from app.services.library_cache import episode_cache
+from app.services.playlist_cache import alternatives_cache
+from app.services.token_store import token_store
+from benchmarks.stub_server import StubServer, create_stub_app
+
+USER_ID = "bench-user"
+PROBES = ("/health", "/api/auth/me")
+
+
+def make_library(count: int, seed: int = 0) -> EpisodeStore:
+    """
+    Synthetic library of ``count`` episodes lasting 35 minutes to 2.5 hours.
+
+    Args:
+        count: Number of episodes
+        seed: Random seed
+
+    Returns:
+        EpisodeStore
+    """
+    rng = np.random.default_rng(seed)
+    shows = 50
+    return EpisodeStore(
+        ids=[f"episode-{index}" for index in range(count)],
+        names=[f"Episode {index}" for index in range(count)],
+        descriptions=[None] * count,
+        release_dates=["2024-01-01"] * count,
+        podcast_ids=[f"show-{index}" for index in range(shows)],
+        podcast_names=[f"Show {index}" for index in range(shows)],
+        duration_ms=rng.integers(300, 1300, count).astype(np.int64) * 7000,
+        podcast_idx=rng.integers(0, shows, count).astype(np.int32),
+        release_ordinal=np.full(count, date(2024, 1, 1).toordinal(), dtype=np.int32),
+        content_class=np.full(count, CONTENT_CLASS_CODES["mixed"], dtype=np.int8),
+    )
+
+
+async def _seed(library: EpisodeStore) -> str:
+    """Store a session and the cached library; return the session cookie."""
+    session_id = await token_store.create_session(
+        USER_ID,
+        {"access_token": "bench-access", "refresh_token": "bench-refresh", "expires_in": 3600},
+    )
+    await episode_cache.set(USER_ID, library)
+    return serializer.dumps({"sid": session_id, "created_at": "2024-01-01T00:00:00"})
+
+
+async def _run(base_url: str, cookie: str, seconds: float, generators: int) -> tuple[dict, int]:
+    latencies: dict[str, list[float]] = {path: [] for path in PROBES}
+    generated = 0
+    body = {"duration_minutes": 120, "run_type": "long", "content_preference": "mixed"}
+    deadline = time.monotonic() + seconds
+
+    async with httpx.AsyncClient(base_url=base_url, cookies={"session": cookie}, timeout=60) as client:
+        async def generate() -> None:
+            nonlocal generated
+            while time.monotonic() < deadline:
+                response = await client.post("/api/playlists/generate", json=body)
+                response.raise_for_status()
+                generated += 1
+
+        async def probe(path: str) -> None:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies[path].append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(generate() for _ in range(generators)), *(probe(path) for path in PROBES))
+    return latencies, generated
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--episodes", type=int, default=20_000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--generators", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=2, help="Process pool size for the offloaded run")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    # Every request should search, not hit the alternatives cache
+    alternatives_cache.ttl_seconds = 0
+    library = make_library(args.episodes)
+
+    with StubServer(create_stub_app()) as spotify:
+        settings.SPOTIFY_API_BASE_URL = f"{spotify.url}/v1"
+        for label, workers in (("inline", 0), ("process pool", args.workers)):
+            settings.PLAYLIST_PROCESS_WORKERS = workers
+            cookie = asyncio.run(_seed(library))
+            with StubServer(app) as server:
+                latencies, generated = asyncio.run(_run(server.url, cookie, args.seconds, args.generators))
+            print(f"{label} ({generated} playlists generated)")
+            for path, timings in latencies.items():
+                ordered = sorted(timings)
+                print(
+                    f"  {path:14} n={len(ordered):5} p50={_percentile(ordered, 0.5):7.1f}ms "
+                    f"p95={_percentile(ordered, 0.95):7.1f}ms p99={_percentile(ordered, 0.99):7.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
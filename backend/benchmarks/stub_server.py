@@ -0,0 +1,163 @@
+"""Local stand-in for the Spotify Web API used by benchmarks."""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Small vocabulary so descriptions exercise the content classifier
+_WORDS = (
+    "the a of and to in we this week our guest talks about with story life people "
+    "comedy funny laugh history science research interview analysis philosophy"
+).split()
+
+
+def make_episode_items(count: int, shows: int = 50, seed: int = 0) -> list[dict]:
+    """
+    Build saved-episode items as returned by ``GET /v1/me/episodes``.
+
+    Items are newest-saved first, with durations of 10 to 150 minutes.
+
+    Args:
+        count: Number of saved episodes
+        shows: Number of distinct shows the episodes belong to
+        seed: Random seed
+
+    Returns:
+        List of ``{"added_at", "episode"}`` items
+    """
+    rng = random.Random(seed)
+    saved_at = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    items = []
+    for index in range(count):
+        show = index % shows
+        items.append({
+            "added_at": (saved_at - timedelta(minutes=index)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "episode": {
+                "id": f"episode-{index}",
+                "name": " ".join(rng.choices(_WORDS, k=6)),
+                "description": " ".join(rng.choices(_WORDS, k=60)),
+                "duration_ms": rng.randint(10, 150) * 60_000,
+                "release_date": "2024-01-01",
+                "show": {"id": f"show-{show}", "name": f"Show {show}"},
+            },
+        })
+    return items
+
+
+def create_stub_app(
+    latency_ms: float = 0.0,
+    episodes: int = 0,
+    shows: int = 50,
+    rate_limit_every: int = 0,
+    retry_after_seconds: int = 0,
+    seed: int = 0,
+) -> FastAPI:
+    """
+    Create a minimal Spotify-shaped app.
+
+    Counters of served and rate-limited requests are kept in
+    ``app.state.stats``.
+
+    Args:
+        latency_ms: Artificial server-side latency per request
+        episodes: Size of the synthetic saved-episode library
+        shows: Number of distinct shows in the library
+        rate_limit_every: Answer every Nth Web API request with 429 (0 disables)
+        retry_after_seconds: Retry-After sent with injected 429s
+        seed: Random seed for the library
+
+    Returns:
+        FastAPI app serving ``/api/token``, ``/v1/me``, ``/v1/me/episodes``
+        and ``/v1/me/shows``
+    """
+    stub = FastAPI()
+    stub.state.stats = {"requests": 0, "rate_limited": 0}
+    items = make_episode_items(episodes, shows, seed)
+    show_items = [
+        {"show": {"id": f"show-{show}", "name": f"Show {show}", "publisher": "Bench", "total_episodes": 100}}
+        for show in range(shows if episodes else 0)
+    ]
+
+    async def _delay() -> None:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+    @stub.middleware("http")
+    async def inject_rate_limits(request: Request, call_next):
+        stats = stub.state.stats
+        stats["requests"] += 1
+        if rate_limit_every and request.url.path.startswith("/v1/") and stats["requests"] % rate_limit_every == 0:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                status_code=429,
+                headers={"Retry-After": str(retry_after_seconds)},
+            )
+        return await call_next(request)
+
+    def _page(source: list[dict], limit: int, offset: int) -> dict:
+        return {"items": source[offset:offset + limit], "limit": limit, "offset": offset, "total": len(source)}
+
+    @stub.get("/v1/me")
+    async def me():
+        await _delay()
+        return {"id": "bench-user", "display_name": "Bench User", "email": None, "images": []}
+
+    @stub.get("/v1/me/episodes")
+    async def saved_episodes(limit: int = 20, offset: int = 0):
+        await _delay()
+        return _page(items, limit, offset)
+
+    @stub.get("/v1/me/shows")
+    async def followed_shows(limit: int = 20, offset: int = 0):
+        await _delay()
+        return _page(show_items, limit, offset)
+
+    @stub.post("/api/token")
+    async def token():
+        await _delay()
+        return {"access_token": "bench-access", "refresh_token": "bench-refresh", "expires_in": 3600}
+
+    return stub
+
+
+class StubServer:
+    """Run an ASGI app with uvicorn on a background thread."""
+
+    def __init__(self, app, host: str = "127.0.0.1"):
+        self.host = host
+        self.port = _free_port(host)
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host=host, port=self.port, log_level="warning", access_log=False)
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "StubServer":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("Stub server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
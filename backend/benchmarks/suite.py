@@ -0,0 +1,240 @@
+"""
+Benchmark suite with a JSON baseline for catching regressions.
+
+Microbenchmarks time generate_playlist (per library size), classify_episode
+and get_session in-process. The end-to-end scenario serves the real app on a
+local port with Spotify replaced by the stub server (synthetic library,
+optional latency and injected 429s), logs in through the OAuth callback,
+times the cold library sync, then drives POST /api/playlists/generate from
+concurrent clients and reports throughput and p50/p95/p99.
+
+``--save`` writes the results as a baseline; ``--compare`` checks a run
+against one and exits with status 1 if any metric is worse by more than
+``--threshold``. Compare runs made with the same options on the same machine.
+
+Usage:
+    python -m benchmarks.suite [--episodes 5000] [--latency-ms 20] [--rate-limit-every 0]
+                               [--save baseline.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+import httpx
+
+from app.config import settings
+from app.core import session
+from app.core.content_classifier import ContentClassifier, classify_episode
+from app.core.playlist_generator import generate_playlist
+from app.main import app
+from app.services.optimizer_pool import optimizer_pool
+from app.services.playlist_cache import alternatives_cache
+from app.services.rate_limiter import TokenBucket, scheduler
+from benchmarks.bench_classifier import make_episodes
+from benchmarks.bench_session import make_cookie
+from benchmarks.harness import compare_results, load_results, measure, save_results, summarize_latencies
+from benchmarks.load_generation import make_library
+from benchmarks.stub_server import StubServer, create_stub_app
+
+GENERATE_BODY = {"duration_minutes": 60, "run_type": "long", "content_preference": "mixed"}
+
+
+def run_microbenchmarks(library_sizes: list[int], min_time: float) -> dict[str, dict]:
+    """
+    Time the hot in-process functions.
+
+    Args:
+        library_sizes: Library sizes to run generate_playlist on
+        min_time: Minimum timed duration per benchmark in seconds
+
+    Returns:
+        Metrics per benchmark name
+    """
+    results: dict[str, dict] = {}
+
+    for size in library_sizes:
+        library = make_library(size)
+        results[f"generate_playlist[{size}]"] = measure(
+            lambda: generate_playlist(library, 120, "long", "mixed"),
+            min_time=min_time,
+        )
+
+    episodes = make_episodes(1000)
+    cycle = iter(range(sys.maxsize))
+    results["classify_episode"] = measure(
+        lambda: classify_episode(episodes[next(cycle) % len(episodes)]),
+        min_time=min_time,
+    )
+    # Keeps a single cached result, so cycling through episodes always misses
+    uncached = ContentClassifier(max_cached=0)
+    results["classify_episode[uncached]"] = measure(
+        lambda: uncached.classify_episodes([episodes[next(cycle) % len(episodes)]]),
+        min_time=min_time,
+    )
+
+    cookie = make_cookie()
+
+    def get_session() -> None:
+        session.get_session(SimpleNamespace(cookies={"session": cookie}, state=SimpleNamespace()))
+
+    cache_size = settings.SESSION_CACHE_SIZE
+    for label, size in (("get_session", cache_size), ("get_session[uncached]", 0)):
+        settings.SESSION_CACHE_SIZE = size
+        session._verified_sessions.clear()
+        results[label] = measure(get_session, min_time=min_time)
+    settings.SESSION_CACHE_SIZE = cache_size
+    return results
+
+
+async def _login(client: httpx.AsyncClient) -> None:
+    """Log in through the OAuth callback so the client holds a session cookie."""
+    response = await client.get("/api/auth/callback", params={"code": "bench-code"})
+    if "session" not in client.cookies:
+        raise RuntimeError(f"Login failed: {response.status_code} {response.headers.get('location')}")
+
+
+async def _end_to_end(base_url: str, seconds: float, concurrency: int) -> dict[str, dict]:
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        await _login(client)
+
+        start = time.perf_counter()
+        response = await client.post("/api/playlists/generate", json=GENERATE_BODY)
+        response.raise_for_status()
+        sync_ms = (time.perf_counter() - start) * 1000
+
+        latencies: list[float] = []
+        deadline = time.monotonic() + seconds
+
+        async def generate() -> None:
+            while time.monotonic() < deadline:
+                request_start = time.perf_counter()
+                response = await client.post("/api/playlists/generate", json=GENERATE_BODY)
+                response.raise_for_status()
+                latencies.append((time.perf_counter() - request_start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(generate() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "e2e:library_sync": {"elapsed_ms": round(sync_ms, 3)},
+        "e2e:generate": summarize_latencies(latencies, elapsed),
+    }
+
+
+def _wait_for_optimizer() -> None:
+    """Let spawned optimizer workers finish importing before anything is timed."""
+    executor = optimizer_pool._executor
+    if executor is not None:
+        pending = [executor.submit(time.sleep, 0) for _ in range(settings.PLAYLIST_PROCESS_WORKERS)]
+        for future in pending:
+            future.result(timeout=120)
+
+
+def run_end_to_end(args: argparse.Namespace) -> dict[str, dict]:
+    """
+    Run the app against the stub server and load it with playlist requests.
+
+    Args:
+        args: Parsed command-line options
+
+    Returns:
+        Metrics per scenario name
+    """
+    if args.unthrottled:
+        # Leave the stub's latency and 429s as the only limit on syncing
+        settings.SPOTIFY_USER_RATE_LIMIT_PER_SECOND = settings.SPOTIFY_RATE_LIMIT_PER_SECOND = 1e6
+        settings.SPOTIFY_USER_RATE_LIMIT_BURST = settings.SPOTIFY_RATE_LIMIT_BURST = 1_000_000
+        scheduler.app_bucket = TokenBucket(settings.SPOTIFY_RATE_LIMIT_PER_SECOND, settings.SPOTIFY_RATE_LIMIT_BURST)
+        scheduler.user_buckets.clear()
+    # Every request should search, not hit the alternatives cache
+    alternatives_cache.ttl_seconds = 0
+    # The library sync must be cold, not rebuilt from an earlier run's metadata store
+    settings.METADATA_STORE_ENABLED = False
+
+    stub = create_stub_app(
+        latency_ms=args.latency_ms,
+        episodes=args.episodes,
+        rate_limit_every=args.rate_limit_every,
+    )
+    with StubServer(stub) as spotify:
+        settings.SPOTIFY_API_BASE_URL = f"{spotify.url}/v1"
+        settings.SPOTIFY_ACCOUNTS_BASE_URL = spotify.url
+        with StubServer(app) as server:
+            _wait_for_optimizer()
+            results = asyncio.run(_end_to_end(server.url, args.seconds, args.concurrency))
+    results["e2e:library_sync"].update(
+        spotify_requests=stub.state.stats["requests"],
+        spotify_rate_limited=stub.state.stats["rate_limited"],
+    )
+    return results
+
+
+def _print_results(results: dict[str, dict]) -> None:
+    for name, metrics in results.items():
+        if "median_us" in metrics:
+            print(
+                f"{name:34} median={metrics['median_us']:11.2f}us  mean={metrics['mean_us']:11.2f}us  "
+                f"stddev={metrics['stddev_us']:9.2f}us  ops={metrics['ops']:12,.1f}/s"
+            )
+        elif "p50_ms" in metrics:
+            print(
+                f"{name:34} n={metrics['requests']:6}  {metrics['throughput_rps']:8.2f} req/s  "
+                f"p50={metrics['p50_ms']:8.1f}ms  p95={metrics['p95_ms']:8.1f}ms  p99={metrics['p99_ms']:8.1f}ms"
+            )
+        else:
+            print(f"{name:34} " + "  ".join(f"{key}={value}" for key, value in metrics.items()))
+
+
+def _print_comparison(rows: list[tuple[str, str, float, float, float, bool]]) -> None:
+    print("\nComparison with baseline (positive change is worse):")
+    for name, metric, previous, current, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"  {name:34} {metric:14} {previous:12.3f} -> {current:12.3f}  {change:+7.1%}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", choices=("micro", "e2e"), help="Run one part of the suite")
+    parser.add_argument("--library-sizes", default="1000,10000,50000", help="generate_playlist sizes")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds per microbenchmark")
+    parser.add_argument("--episodes", type=int, default=5000, help="Stub library size (100 to 50000)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stub latency per request")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Stub answers every Nth request with 429")
+    parser.add_argument("--unthrottled", action="store_true", help="Disable client-side Spotify rate limits")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of the generate load")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent generate clients")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with a JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results: dict[str, dict] = {}
+    if args.only != "e2e":
+        sizes = [int(size) for size in args.library_sizes.split(",") if size]
+        results.update(run_microbenchmarks(sizes, args.min_time))
+    if args.only != "micro":
+        results.update(run_end_to_end(args))
+    _print_results(results)
+
+    config = {key: value for key, value in vars(args).items() if key not in ("save", "compare", "threshold")}
+    if args.save:
+        save_results(args.save, results, config)
+        print(f"\nSaved baseline to {args.save}")
+    if args.compare:
+        baseline = load_results(args.compare)
+        if baseline.get("config") != config:
+            print(f"\nWarning: baseline was recorded with different options: {baseline.get('config')}")
+        rows = compare_results(baseline["results"], results, args.threshold)
+        _print_comparison(rows)
+        if any(regressed for *_, regressed in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Tests for the async read-through cache and its in-process backend."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.cache import AsyncCache
+from app.core.cache_backends import MemoryBackend
+
+
+class Clock:
+    """Wall clock the cache and backend read through time.time."""
+
+    def __init__(self, monkeypatch):
+        self.now = 1_000_000.0
+        monkeypatch.setattr(time, "time", lambda: self.now)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    return Clock(monkeypatch)
+
+
+def _cache(retain_seconds: float | None = None) -> AsyncCache[str]:
+    backend = MemoryBackend(max_bytes=1024, sizeof=len)
+    return AsyncCache("test", ttl_seconds=60, stale_seconds=30, backend=backend, retain_seconds=retain_seconds)
+
+
+class Loader:
+    """Loader returning numbered values and recording what it was given."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.previous: list[str | None] = []
+
+    async def __call__(self, previous: str | None) -> str:
+        self.previous.append(previous)
+        await asyncio.sleep(self.delay)
+        return f"v{len(self.previous)}"
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_hits(clock):
+    cache, loader = _cache(), Loader()
+    assert await cache.get("key", loader) == "v1"
+    clock.now += 59
+    assert await cache.get("key", loader) == "v1"
+
+    assert loader.previous == [None]
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_refreshing(clock):
+    cache, loader = _cache(), Loader()
+    await cache.get("key", loader)
+    clock.now += 70
+
+    # Served at once; one background refresh gets the previous value
+    assert await cache.get("key", loader) == "v1"
+    assert await cache.get("key", loader) == "v1"
+    await asyncio.sleep(0.01)
+    assert loader.previous == [None, "v1"]
+    assert cache.stats.stale_hits == 2
+
+    assert await cache.get("key", loader) == "v2"
+    assert cache.stats.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_past_stale_window_are_reloaded_from_previous(clock):
+    cache, loader = _cache(retain_seconds=600), Loader()
+    await cache.get("key", loader)
+    clock.now += 91
+
+    assert await cache.get("key", loader) == "v2"
+    assert loader.previous == [None, "v1"]
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_past_retention_are_dropped(clock):
+    cache, loader = _cache(), Loader()
+    await cache.get("key", loader)
+    # Retention defaults to TTL plus the stale window
+    clock.now += 91
+
+    assert await cache.get("key", loader) == "v2"
+    assert loader.previous == [None, None]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load(clock):
+    cache, loader = _cache(), Loader(delay=0.01)
+    values = await asyncio.gather(*(cache.get("key", loader) for _ in range(10)))
+
+    assert values == ["v1"] * 10
+    assert loader.previous == [None]
+    assert cache.stats.misses == 10
+    assert cache.stats.refreshes == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_counted_and_raised(clock):
+    cache = _cache()
+
+    async def failing(previous):
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        await cache.get("key", failing)
+    assert cache.stats.refresh_errors == 1
+    assert await cache.get("key", Loader()) == "v1"
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_evicts_least_recently_used(clock):
+    backend = MemoryBackend(max_bytes=10, sizeof=len)
+    await backend.set("a", "aaaa", clock.now, 60)
+    await backend.set("b", "bbbb", clock.now, 60)
+    # Reading "a" makes "b" the least recently used
+    await backend.get("a")
+    await backend.set("c", "cccc", clock.now, 60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == (clock.now, "aaaa")
+    assert backend.snapshot() == {"evictions": 1, "entries": 2, "bytes": 8, "max_bytes": 10}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reports_counters(clock):
+    cache, loader = _cache(), Loader()
+    await cache.get("a", loader)
+    await cache.get("a", loader)
+    await cache.get("a", loader)
+    await cache.get("b", loader)
+
+    snapshot = cache.snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["refreshes"]) == (2, 2, 2)
+    assert snapshot["hit_ratio"] == 0.5
+    assert snapshot["backend"] == "MemoryBackend"
+    assert snapshot["entries"] == 2
+    assert snapshot["evictions"] == 0
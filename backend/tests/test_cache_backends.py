@@ -0,0 +1,112 @@
+"""Tests for the Redis cache backend, run against fakeredis."""
+
+import asyncio
+import time
+
+import fakeredis
+import pytest
+
+from app.core import cache_backends
+from app.core.cache import AsyncCache
+from app.core.cache_backends import RedisBackend, create_backend
+from app.core.episode_store import EpisodeStore
+from app.models.episode import Episode
+from app.models.podcast import Podcast
+from app.services.library_cache import _dump_podcasts, _load_podcasts
+from app.services.token_store import TokenStore
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeAsyncRedis()
+
+
+def _backend(client, namespace: str = "test") -> RedisBackend:
+    return RedisBackend(client, namespace=namespace, dumps=str.encode, loads=bytes.decode)
+
+
+@pytest.mark.asyncio
+async def test_get_set_delete(redis_client):
+    backend = _backend(redis_client)
+    assert await backend.get("key") is None
+
+    await backend.set("key", "value", loaded_at=123.5, expire_seconds=60)
+    assert await backend.get("key") == (123.5, "value")
+    assert await redis_client.exists("test:key")
+
+    await backend.delete("key")
+    assert await backend.get("key") is None
+    assert backend.snapshot() == {"errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_values_expire_server_side(redis_client):
+    backend = _backend(redis_client)
+    await backend.set("key", "value", loaded_at=time.time(), expire_seconds=0.2)
+    # Rounded up to Redis' one second resolution
+    assert await redis_client.ttl("test:key") == 1
+
+    await asyncio.sleep(1.1)
+    assert await backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_undecodable_value_is_a_miss(redis_client):
+    backend = RedisBackend(redis_client, namespace="test", dumps=str.encode, loads=EpisodeStore.from_bytes)
+    await backend.set("key", "not an episode store", loaded_at=time.time(), expire_seconds=60)
+    assert await backend.get("key") is None
+
+    # Too short for the load timestamp header
+    await redis_client.set("test:key", b"x")
+    assert await backend.get("key") is None
+    assert backend.snapshot() == {"errors": 0}
+
+
+@pytest.mark.asyncio
+async def test_library_values_round_trip(redis_client):
+    episodes = RedisBackend(redis_client, "episodes", dumps=EpisodeStore.to_bytes, loads=EpisodeStore.from_bytes)
+    library = EpisodeStore.from_episodes(
+        [Episode(id="a", name="A", duration_ms=1000, podcast_name="P", podcast_id="p")], ["mixed"],
+    )
+    await episodes.set("user", library, loaded_at=1.0, expire_seconds=60)
+    loaded_at, stored = await episodes.get("user")
+    assert loaded_at == 1.0
+    assert stored.ids == ["a"]
+    assert stored.fingerprint == library.fingerprint
+
+    shows = RedisBackend(redis_client, "shows", dumps=_dump_podcasts, loads=_load_podcasts)
+    podcasts = [Podcast(id="p", name="P", publisher="Pub", total_episodes=3)]
+    await shows.set("user", podcasts, loaded_at=1.0, expire_seconds=60)
+    assert (await shows.get("user"))[1] == podcasts
+
+
+@pytest.mark.asyncio
+async def test_async_cache_on_redis_backend(redis_client):
+    cache: AsyncCache[str] = AsyncCache("redis-test", ttl_seconds=60, stale_seconds=0, backend=_backend(redis_client))
+    loads = []
+
+    async def loader(previous):
+        loads.append(previous)
+        return "loaded"
+
+    assert await cache.get("key", loader) == "loaded"
+    assert await cache.get("key", loader) == "loaded"
+    assert loads == [None]
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+
+    await cache.invalidate("key")
+    assert await redis_client.get("test:key") is None
+
+
+@pytest.mark.asyncio
+async def test_sessions_and_tokens_on_redis(monkeypatch, redis_client):
+    monkeypatch.setattr(cache_backends.settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(cache_backends, "_redis_client", redis_client)
+    assert isinstance(create_backend("x", 0, len, str.encode, bytes.decode), RedisBackend)
+
+    # Two stores stand in for two workers sharing Redis
+    session_id = await TokenStore().create_session(
+        "user", {"access_token": "access", "refresh_token": "refresh", "expires_in": 3600},
+    )
+    assert await TokenStore().get_access_token(session_id) == ("user", "access")
@@ -0,0 +1,72 @@
+"""Tests for negotiated response compression."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE = {"items": [{"id": f"ep{index}", "name": "Episode"} for index in range(200)]}
+
+
+@pytest.fixture
+def client():
+    compressed = FastAPI()
+    compressed.add_middleware(CompressionMiddleware)
+
+    @compressed.get("/large")
+    async def large():
+        return LARGE
+
+    @compressed.get("/small")
+    async def small():
+        return {"id": "ep1"}
+
+    @compressed.get("/binary")
+    async def binary():
+        return PlainTextResponse("x" * 4096, media_type="application/octet-stream")
+
+    return TestClient(compressed)
+
+
+def test_gzip(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) < len(response.content)
+    assert response.json() == LARGE
+
+
+def test_brotli_preferred_over_gzip(client):
+    pytest.importorskip("brotli")
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.json() == LARGE
+
+
+@pytest.mark.parametrize("accept_encoding", ["identity", "gzip;q=0, br;q=0", ""])
+def test_identity(client, accept_encoding):
+    response = client.get("/large", headers={"Accept-Encoding": accept_encoding})
+    assert "Content-Encoding" not in response.headers
+    # Still varies: another client would get a compressed body
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json() == LARGE
+
+
+def test_small_bodies_are_sent_as_is(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.json() == {"id": "ep1"}
+
+
+def test_incompressible_types_are_sent_as_is(client):
+    response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+def test_negotiate_encoding_weights():
+    assert negotiate_encoding("gzip;q=0.5, *;q=0.1") == "gzip"
+    assert negotiate_encoding("*;q=0") is None
+    assert negotiate_encoding("deflate") is None
@@ -0,0 +1,86 @@
+"""Tests for the keyword content classifier."""
+
+import random
+import re
+
+import pytest
+
+from app.core.content_classifier import DEEP_KEYWORDS, LIGHT_KEYWORDS, ContentClassifier
+from app.models.episode import Episode
+
+
+@pytest.fixture
+def classifier():
+    return ContentClassifier()
+
+
+@pytest.mark.parametrize(
+    ("text", "score"),
+    [
+        ("fun", -1),
+        ("funny", -1),
+        ("funn", 0),
+        ("Fun, fun!", -2),
+        ("science scientist scientific", 3),
+        ("scientists", 0),
+        ("pop culture", -1),
+        ("pop cultures", 0),
+        ("popculture", 0),
+        ("A deep dive", 1),
+        ("in-depth", 1),
+        ("in depth", 0),
+        ("long-form history", 2),
+        ("WAR\nand\tpeace", 1),
+    ],
+)
+def test_score_text_matches_whole_keywords(classifier, text, score):
+    assert classifier.score_text(text) == score
+
+
+def test_trie_pattern_matches_flat_alternation(classifier):
+    # Longest-first flat alternation: the straightforward equivalent of the trie
+    keywords = sorted(classifier.weights, key=len, reverse=True)
+    flat = re.compile(" (" + "|".join(map(re.escape, keywords)) + r")(?!\w)")
+    pieces = [*LIGHT_KEYWORDS, *DEEP_KEYWORDS, "funn", "sci", "the", "pop", "-", "ing", "s"]
+    rng = random.Random(0)
+    for _ in range(500):
+        text = " " + " ".join(rng.choice(pieces) + rng.choice(["", "", "s", "-x"]) for _ in range(12))
+        assert classifier.pattern.findall(text) == flat.findall(text)
+
+
+def _episode(description: str, duration_ms: int = 45 * 60 * 1000) -> Episode:
+    return Episode(id="ep1", name="Episode", duration_ms=duration_ms, description=description, podcast_name="Show", podcast_id="show")
+
+
+def test_classes_and_duration_signal(classifier):
+    assert classifier.classify_episodes([_episode("history and philosophy")]) == ["deep"]
+    assert classifier.classify_episodes([_episode("comedy and banter")]) == ["light"]
+    assert classifier.classify_episodes([_episode("comedy and history")]) == ["mixed"]
+    # One keyword plus a short or long runtime crosses the threshold
+    assert classifier.classify_episodes([_episode("comedy", duration_ms=10 * 60 * 1000)]) == ["light"]
+
+
+def test_unchanged_text_reuses_cached_result(classifier, monkeypatch):
+    scanned = []
+    score_text = classifier.score_text
+
+    def counting_score_text(text: str) -> int:
+        scanned.append(text)
+        return score_text(text)
+
+    monkeypatch.setattr(classifier, "score_text", counting_score_text)
+
+    assert classifier.classify_episodes([_episode("history and philosophy")] * 3) == ["deep"] * 3
+    assert len(scanned) == 1
+
+    # Changed text under the same id is classified again
+    assert classifier.classify_episodes([_episode("comedy and banter")]) == ["light"]
+    assert len(scanned) == 2
+
+
+def test_result_cache_is_bounded():
+    classifier = ContentClassifier(max_cached=10)
+    episodes = [_episode("history").model_copy(update={"id": f"ep{index}"}) for index in range(11)]
+    classifier.classify_episodes(episodes)
+    assert len(classifier._cache) == 6
+    assert "ep10" in classifier._cache
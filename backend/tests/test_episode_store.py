@@ -0,0 +1,74 @@
+"""Tests for the columnar episode store and its binary encoding."""
+
+import pytest
+
+from app.core.codec import pack_strings, unpack_required_strings, unpack_strings
+from app.core.episode_store import EpisodeStore
+from app.models.episode import Episode
+
+
+def _store() -> EpisodeStore:
+    episodes = [
+        Episode(id="a", name="A", duration_ms=1000, podcast_name="P", podcast_id="p", release_date="2024-03"),
+        Episode(id="b", name="B", duration_ms=2000, description="about b", podcast_name="Q", podcast_id="q"),
+    ]
+    return EpisodeStore.from_episodes(episodes, ["light", "deep"], unavailable=3)
+
+
+def test_round_trip_keeps_columns_and_fingerprint():
+    store = _store()
+    decoded = EpisodeStore.from_bytes(store.to_bytes())
+
+    assert decoded.ids == store.ids
+    assert decoded.descriptions == [None, "about b"]
+    assert decoded.release_dates == ["2024-03", None]
+    assert decoded.podcast_names == store.podcast_names
+    assert decoded.content_class.tolist() == store.content_class.tolist()
+    assert decoded.unavailable == 3
+    assert decoded.fingerprint == store.fingerprint
+
+
+def test_strings_round_trip_with_none():
+    values = ["", None, "ünïcode", "x"]
+    assert unpack_strings(pack_strings(values)) == values
+
+
+def test_required_strings_reject_none():
+    assert unpack_required_strings(pack_strings(["a", ""])) == ["a", ""]
+    with pytest.raises(ValueError):
+        unpack_required_strings(pack_strings(["a", None]))
+
+
+def _episodes(count: int) -> list[Episode]:
+    return [
+        Episode(id=f"e{index}", name=f"E{index}", duration_ms=1000 * index, podcast_name="P", podcast_id="p")
+        for index in range(count)
+    ]
+
+
+def test_prepend_fingerprint_matches_full_build():
+    episodes = _episodes(5)
+    prepended = EpisodeStore.from_episodes(episodes[2:]).prepend(episodes[:2])
+    assert prepended.fingerprint == EpisodeStore.from_episodes(episodes).fingerprint
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"name": "Renamed"},
+        {"description": "New notes"},
+        {"release_date": "2024-05-01"},
+        {"podcast_name": "Renamed show"},
+    ],
+)
+def test_fingerprint_covers_rendered_fields(change):
+    episodes = _episodes(3)
+    # The first episode of a show supplies its interned podcast name
+    changed = [episodes[0].model_copy(update=change)] + episodes[1:]
+    assert EpisodeStore.from_episodes(changed).fingerprint != EpisodeStore.from_episodes(episodes).fingerprint
+
+
+def test_fingerprint_covers_order():
+    episodes = _episodes(3)
+    reordered = [episodes[1], episodes[0], episodes[2]]
+    assert EpisodeStore.from_episodes(reordered).fingerprint != EpisodeStore.from_episodes(episodes).fingerprint
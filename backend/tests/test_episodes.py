@@ -0,0 +1,114 @@
+"""Tests for GET /api/episodes paging and conditional requests."""
+
+import pytest
+
+from app.api.deps import get_current_user, get_spotify_client
+from app.api.routes import episodes as episodes_route
+from app.core.episode_store import EpisodeStore
+from app.main import app
+from app.models.episode import Episode
+
+
+def _episode(index: int) -> Episode:
+    return Episode(
+        id=f"ep{index}",
+        name=f"Episode {index}",
+        duration_ms=60_000 * index,
+        description=f"About episode {index}",
+        podcast_name="Show",
+        podcast_id="show",
+    )
+
+
+class Library:
+    """Saved episodes returned in place of the cached library, newest first."""
+
+    def __init__(self, count: int):
+        self.episodes = [_episode(index) for index in range(count, 0, -1)]
+
+    def save(self, index: int) -> None:
+        self.episodes.insert(0, _episode(index))
+
+    async def get(self, user_id, spotify) -> EpisodeStore:
+        return EpisodeStore.from_episodes(self.episodes, ["mixed"] * len(self.episodes))
+
+
+@pytest.fixture
+def library(monkeypatch):
+    library = Library(5)
+    monkeypatch.setattr(episodes_route, "get_user_library", library.get)
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "user", "access_token": "token"}
+    app.dependency_overrides[get_spotify_client] = lambda: None
+    yield library
+    app.dependency_overrides.clear()
+
+
+def test_next_cursor_pages_through_library(client, library):
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/episodes", params=params).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == ["ep5", "ep4", "ep3", "ep2", "ep1"]
+
+
+def test_pages_continue_after_cursor_when_episodes_are_saved(client, library):
+    first = client.get("/api/episodes", params={"limit": 2}).json()
+    library.save(6)
+    second = client.get("/api/episodes", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [item["id"] for item in second["items"]] == ["ep3", "ep2"]
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "%%%", "ZXA5OTk"])  # last is "ep999"
+def test_malformed_or_unknown_cursor_is_400(client, library, cursor):
+    response = client.get("/api/episodes", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_matching_if_none_match_is_304(client, library):
+    response = client.get("/api/episodes")
+    etag = response.headers["ETag"]
+
+    cached = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["ETag"] == etag
+
+
+def test_library_change_yields_new_etag(client, library):
+    etag = client.get("/api/episodes").headers["ETag"]
+    library.save(6)
+
+    response = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["items"][0]["id"] == "ep6"
+
+
+def test_fields_projection_keeps_id(client, library):
+    items = client.get("/api/episodes", params={"fields": "name, duration_ms"}).json()["items"]
+    assert items[0] == {"id": "ep5", "name": "Episode 5", "duration_ms": 300_000}
+
+
+def test_fields_projection_changes_etag(client, library):
+    full = client.get("/api/episodes").headers["ETag"]
+    projected = client.get("/api/episodes", params={"fields": "id"}).headers["ETag"]
+    assert projected != full
+
+
+def test_unknown_field_is_422(client, library):
+    response = client.get("/api/episodes", params={"fields": "id,transcript"})
+    assert response.status_code == 422
+    assert "transcript" in response.json()["detail"]
+
+
+def test_edited_episode_yields_new_etag(client, library):
+    etag = client.get("/api/episodes").headers["ETag"]
+    library.episodes[2] = library.episodes[2].model_copy(update={"name": "Renamed"})
+
+    response = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["items"][2]["name"] == "Renamed"
@@ -0,0 +1,102 @@
+"""Tests for saved episode syncing in the library cache."""
+
+import pytest
+
+from app.config import settings
+from app.models.episode import Episode
+from app.services.library_cache import episode_cache, get_user_library
+from app.services.rate_limiter import Priority
+
+
+def _episode(index: int) -> Episode:
+    return Episode(
+        id=f"ep{index}",
+        name=f"Episode {index}",
+        duration_ms=60_000,
+        podcast_name="Show",
+        podcast_id="show",
+        added_at=f"2024-01-01T00:00:{index:02d}Z",
+    )
+
+
+class FakeSpotify:
+    """Saved library, newest first, where None is an item Spotify has no episode for."""
+
+    priority = Priority.INTERACTIVE
+
+    def __init__(self, items: list[Episode | None]):
+        self.items = items
+        self.full_syncs = 0
+
+    async def iter_saved_episodes(self):
+        self.full_syncs += 1
+        episodes = [item for item in self.items if item is not None]
+        yield episodes, len(self.items) - len(episodes)
+
+    async def get_saved_episodes_since(self, is_known):
+        new_episodes, skipped = [], 0
+        for item in self.items:
+            if item is None:
+                skipped += 1
+            elif is_known(item.id):
+                break
+            else:
+                new_episodes.append(item)
+        return new_episodes, len(self.items), skipped
+
+
+@pytest.fixture(autouse=True)
+def always_refresh(monkeypatch):
+    monkeypatch.setattr(settings, "METADATA_STORE_ENABLED", False)
+    # Every get refreshes from the previous library
+    monkeypatch.setattr(episode_cache, "ttl_seconds", 0)
+    monkeypatch.setattr(episode_cache, "stale_seconds", 0)
+
+
+@pytest.mark.asyncio
+async def test_incremental_sync_counts_items_without_episodes():
+    user_id = "null-items"
+    await episode_cache.invalidate(user_id)
+    spotify = FakeSpotify([_episode(2), None, _episode(1), None])
+
+    library = await get_user_library(user_id, spotify)
+    assert library.ids == ["ep2", "ep1"]
+    assert library.unavailable == 2
+
+    spotify.items = [_episode(3), None] + spotify.items
+    library = await get_user_library(user_id, spotify)
+    assert library.ids == ["ep3", "ep2", "ep1"]
+    assert library.unavailable == 3
+    assert spotify.full_syncs == 1
+
+
+@pytest.mark.asyncio
+async def test_removed_episode_triggers_full_sync():
+    user_id = "removed"
+    await episode_cache.invalidate(user_id)
+    spotify = FakeSpotify([_episode(2), None, _episode(1)])
+    await get_user_library(user_id, spotify)
+
+    spotify.items = [_episode(2), None]
+    library = await get_user_library(user_id, spotify)
+    assert library.ids == ["ep2"]
+    assert spotify.full_syncs == 2
+
+
+@pytest.mark.asyncio
+async def test_unavailable_newest_item_is_not_counted_again():
+    user_id = "null-head"
+    await episode_cache.invalidate(user_id)
+    spotify = FakeSpotify([None, _episode(2), _episode(1)])
+
+    for _ in range(4):
+        library = await get_user_library(user_id, spotify)
+        assert library.unavailable == 1
+    assert spotify.full_syncs == 1
+
+    # A new unavailable item ahead of the counted one is still picked up
+    spotify.items = [None, _episode(3)] + spotify.items
+    library = await get_user_library(user_id, spotify)
+    assert library.ids == ["ep3", "ep2", "ep1"]
+    assert library.unavailable == 2
+    assert spotify.full_syncs == 1
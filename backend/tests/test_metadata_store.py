@@ -0,0 +1,139 @@
+"""Tests for the on-disk episode metadata store."""
+
+import sqlite3
+import time
+
+import pytest
+
+from app.config import settings
+from app.core.episode_store import EpisodeStore
+from app.core.metadata_store import MetadataStore, metadata_store
+from app.models.episode import Episode
+from app.services.library_cache import episode_cache, get_user_library
+from tests.test_library_cache import FakeSpotify
+
+
+def _episode(index: int, name: str | None = None) -> Episode:
+    return Episode(
+        id=f"ep{index}",
+        name=name or f"Episode {index}",
+        duration_ms=60_000 * index,
+        description=None if index % 2 else f"About {index}",
+        release_date=f"2024-01-{index % 28 + 1:02d}",
+        podcast_name=f"Show {index % 3}",
+        podcast_id=f"show{index % 3}",
+    )
+
+
+def _library(count: int, unavailable: int = 0) -> EpisodeStore:
+    episodes = [_episode(index) for index in range(count, 0, -1)]
+    return EpisodeStore.from_episodes(episodes, ["light", "deep"] * (count // 2) + ["mixed"] * (count % 2), unavailable)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "metadata.db"
+    monkeypatch.setattr(settings, "METADATA_STORE_ENABLED", True)
+    monkeypatch.setattr(settings, "METADATA_STORE_PATH", str(path))
+    return path
+
+
+@pytest.fixture
+def store(db_path):
+    store = MetadataStore()
+    yield store
+    store.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_and_lookup(store):
+    # More ids than one lookup query binds
+    library = _library(1200)
+    await store.save_library("user", library)
+
+    found = await store.get_episodes(["ep7", "missing", "ep3"])
+    assert found.ids == ["ep7", "ep3"]
+    assert found.episode(0) == library.episode(library.index_of("ep7"))
+    assert len(await store.get_episodes(library.ids)) == 1200
+
+    # Saving again updates rows in place
+    renamed = EpisodeStore.from_episodes([_episode(7, name="Renamed")])
+    await store.save_library("other", renamed)
+    assert (await store.get_episodes(["ep7"])).names == ["Renamed"]
+    assert store.snapshot()["episodes_written"] == 1201
+
+
+@pytest.mark.asyncio
+async def test_load_library_keeps_order_and_counts(store):
+    library = _library(20, unavailable=2)
+    await store.save_library("user", library)
+
+    loaded = await store.load_library("user", max_age_seconds=60)
+    assert loaded.ids == library.ids
+    assert loaded.podcast_names == library.podcast_names
+    assert loaded.unavailable == 2
+    assert loaded.full_synced_at == library.full_synced_at
+    assert loaded.fingerprint == library.fingerprint
+    assert store.snapshot()["hydrated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_load_library_ignores_old_full_syncs(store):
+    library = _library(3)
+    library.full_synced_at = time.time() - 120
+    await store.save_library("user", library)
+
+    assert await store.load_library("user", max_age_seconds=60) is None
+    assert await store.load_library("unknown", max_age_seconds=60) is None
+    assert store.snapshot()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_library_with_missing_episode_is_not_loaded(store, db_path):
+    await store.save_library("user", _library(3))
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("DELETE FROM episodes WHERE id = 'ep2'")
+
+    assert await store.load_library("user", max_age_seconds=60) is None
+
+
+@pytest.mark.asyncio
+async def test_missing_episode_falls_back_to_full_sync(db_path, monkeypatch):
+    monkeypatch.setattr(episode_cache, "ttl_seconds", 0)
+    monkeypatch.setattr(episode_cache, "stale_seconds", 0)
+    metadata_store.close()
+    try:
+        spotify = FakeSpotify([_episode(2), _episode(1)])
+        await get_user_library("hydrate", spotify)
+        with sqlite3.connect(db_path) as connection:
+            connection.execute("DELETE FROM episodes WHERE id = 'ep1'")
+
+        # A fresh worker: nothing cached, the stored library is incomplete
+        await episode_cache.invalidate("hydrate")
+        library = await get_user_library("hydrate", spotify)
+        assert library.ids == ["ep2", "ep1"]
+        assert spotify.full_syncs == 2
+
+        # The full sync wrote the library back, so the next worker resumes from disk
+        await episode_cache.invalidate("hydrate")
+        await get_user_library("hydrate", spotify)
+        assert spotify.full_syncs == 2
+    finally:
+        metadata_store.close()
+
+
+@pytest.mark.asyncio
+async def test_retention_prunes_old_rows_on_open(store, db_path, monkeypatch):
+    now = time.time()
+    old = now - (settings.METADATA_STORE_RETENTION_DAYS + 1) * 24 * 60 * 60
+    monkeypatch.setattr(time, "time", lambda: old)
+    await store.save_library("old", EpisodeStore.from_episodes([_episode(1)]))
+    monkeypatch.setattr(time, "time", lambda: now)
+    await store.save_library("new", EpisodeStore.from_episodes([_episode(2)]))
+    store.close()
+
+    assert len(await store.get_episodes(["ep1", "ep2"])) == 1
+    assert await store.load_library("old", max_age_seconds=10**9) is None
+    assert (await store.load_library("new", max_age_seconds=60)).ids == ["ep2"]
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("SELECT id FROM shows").fetchall() == [("show2",)]
@@ -0,0 +1,78 @@
+"""Tests for the playlist duration fitting algorithm."""
+
+import itertools
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.schemas import PlaylistGenerationRequest
+from app.config import settings
+from app.core.playlist_generator import fit_duration
+
+
+def brute_force_best(durations_s: list[int], target_s: int, tolerance_s: int) -> int:
+    """Best total fit_duration should reach, found by enumerating every subset."""
+    capacity = target_s + tolerance_s
+    reachable = {
+        sum(subset)
+        for size in range(len(durations_s) + 1)
+        for subset in itertools.combinations(durations_s, size)
+        if sum(subset) <= capacity
+    }
+    in_window = [total for total in reachable if abs(total - target_s) <= tolerance_s]
+    if in_window:
+        # Closest to the target, shorter on ties
+        return min(in_window, key=lambda total: (abs(total - target_s), total))
+    return max(reachable)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_fit_duration_matches_brute_force(seed):
+    rng = random.Random(seed)
+    durations_s = [rng.randint(1, 60) for _ in range(rng.randint(0, 10))]
+    target_s = rng.randint(1, 200)
+    tolerance_s = rng.randint(0, 20)
+
+    chosen = fit_duration(durations_s, target_s, tolerance_s)
+
+    assert chosen == sorted(set(chosen))
+    assert all(0 <= index < len(durations_s) for index in chosen)
+    assert sum(durations_s[index] for index in chosen) == brute_force_best(durations_s, target_s, tolerance_s)
+
+
+def test_fit_duration_without_exact_fit_uses_closest_reachable():
+    # 100 is unreachable; 90 (under) and 110 (over) are equally close, shorter wins
+    assert fit_duration([40, 50, 70], 100, 10) == [0, 1]
+    # Nothing inside 100 +/- 5; the longest total below the window is used
+    assert fit_duration([30, 60], 100, 5) == [0, 1]
+
+
+def test_fit_duration_prefers_earlier_items():
+    assert fit_duration([30, 30, 30], 60, 0) == [0, 1]
+
+
+def test_fit_duration_empty_library():
+    assert fit_duration([], 3600, 300) == []
+
+
+def test_fit_duration_non_positive_target():
+    assert fit_duration([60, 120], 0, 30) == []
+    assert fit_duration([60, 120], -60, 30) == []
+
+
+def test_fit_duration_skips_unusable_durations():
+    assert fit_duration([0, 500, 60], 60, 0) == [2]
+
+
+def test_fit_duration_caps_target():
+    durations_s = [3600] * 10
+    chosen = fit_duration(durations_s, 10**9, 10**9)
+    # Five hours of the ten fit the capped target exactly
+    assert sum(durations_s[index] for index in chosen) == settings.PLAYLIST_MAX_DURATION_MINUTES * 60
+
+
+@pytest.mark.parametrize("duration_minutes", [0, settings.PLAYLIST_MAX_DURATION_MINUTES + 1, 20000])
+def test_generation_request_rejects_out_of_range_durations(duration_minutes):
+    with pytest.raises(ValidationError):
+        PlaylistGenerationRequest(duration_minutes=duration_minutes, run_type="long", content_preference="mixed")
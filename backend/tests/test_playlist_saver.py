@@ -0,0 +1,98 @@
+"""Tests for saving playlists to Spotify through POST /api/playlists/save."""
+
+import json
+import secrets
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.deps import get_current_user, get_spotify_client
+from app.main import app
+from app.services.spotify import SpotifyClient
+
+
+class FakeSpotifyApi:
+    """Records Web API calls and answers playlist creation and appends."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+        self.return_ids = True
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.calls.append((request.url.path, body))
+        if request.url.path.endswith("/tracks"):
+            return httpx.Response(201, json={"snapshot_id": f"snap{len(self.calls)}"})
+        if not self.return_ids:
+            return httpx.Response(201, json={})
+        return httpx.Response(201, json={
+            "id": f"playlist{len(self.calls)}",
+            "external_urls": {"spotify": "https://open.spotify.com/playlist/x"},
+        })
+
+    @property
+    def batches(self) -> list[list[str]]:
+        return [body["uris"] for path, body in self.calls if path.endswith("/tracks")]
+
+
+@pytest.fixture
+def spotify_api():
+    api = FakeSpotifyApi()
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(api.handle))
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": "user", "access_token": "token"}
+    app.dependency_overrides[get_spotify_client] = lambda: SpotifyClient(
+        access_token="token", http_client=http_client, user_id="user",
+    )
+    yield api
+    app.dependency_overrides.clear()
+
+
+def _save(client: TestClient, episode_ids: list[str], key: str | None = None, name: str = "Run"):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post(
+        "/api/playlists/save",
+        json={"playlist_name": name, "episode_ids": episode_ids},
+        headers=headers,
+    )
+
+
+def test_episodes_are_added_in_batches_of_100(client, spotify_api):
+    episode_ids = [f"ep{index}" for index in range(230)]
+    response = _save(client, episode_ids)
+
+    assert response.status_code == 200
+    assert response.json()["episodes_added"] == 230
+    assert [len(batch) for batch in spotify_api.batches] == [100, 100, 30]
+    # Order is preserved across batches
+    assert [uri for batch in spotify_api.batches for uri in batch] == [
+        f"spotify:episode:{episode_id}" for episode_id in episode_ids
+    ]
+
+
+def test_idempotency_key_replay_does_not_call_spotify(client, spotify_api):
+    key = secrets.token_hex(8)
+    first = _save(client, ["a", "b"], key)
+    calls = len(spotify_api.calls)
+
+    replay = _save(client, ["a", "b"], key)
+    assert replay.status_code == 200
+    assert replay.json() == first.json()
+    assert len(spotify_api.calls) == calls
+
+
+def test_idempotency_key_reused_for_different_request_is_422(client, spotify_api):
+    key = secrets.token_hex(8)
+    assert _save(client, ["a"], key).status_code == 200
+    calls = len(spotify_api.calls)
+
+    response = _save(client, ["a"], key, name="Other run")
+    assert response.status_code == 422
+    assert len(spotify_api.calls) == calls
+
+
+def test_created_playlist_without_id_is_502(client, spotify_api):
+    spotify_api.return_ids = False
+    response = _save(client, ["a"], secrets.token_hex(8))
+    assert response.status_code == 502
+    assert spotify_api.batches == []
@@ -0,0 +1,60 @@
+"""Tests for the Spotify request scheduler's retry policy."""
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services.rate_limiter import RequestScheduler
+
+
+def _failing_request(error: Exception, calls: list):
+    async def request() -> httpx.Response:
+        calls.append(1)
+        if len(calls) == 1:
+            raise error
+        return httpx.Response(200)
+    return request
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "SPOTIFY_BACKOFF_BASE_SECONDS", 0.0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [httpx.ReadTimeout("read"), httpx.RemoteProtocolError("closed")])
+async def test_non_idempotent_request_is_not_retried_after_sending(error):
+    calls: list = []
+    with pytest.raises(type(error)):
+        await RequestScheduler().send(_failing_request(error, calls), idempotent=False)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [httpx.ConnectError("refused"), httpx.ConnectTimeout("timeout"), httpx.PoolTimeout("pool")])
+async def test_non_idempotent_request_is_retried_on_connect_errors(error):
+    calls: list = []
+    response = await RequestScheduler().send(_failing_request(error, calls), idempotent=False)
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_idempotent_request_is_retried_on_read_errors():
+    calls: list = []
+    response = await RequestScheduler().send(_failing_request(httpx.ReadTimeout("read"), calls))
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_request_is_not_retried_on_server_errors():
+    calls: list = []
+
+    async def request() -> httpx.Response:
+        calls.append(1)
+        return httpx.Response(502)
+
+    response = await RequestScheduler().send(request, idempotent=False)
+    assert response.status_code == 502
+    assert len(calls) == 1
@@ -0,0 +1,94 @@
+"""Tests for server-side sessions and token refresh."""
+
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.deps import get_current_user
+from app.config import settings
+from app.core.cache_backends import MemoryBackend
+from app.main import startup_event
+from app.services.rate_limiter import SpotifyRateLimited
+from app.services.spotify import SpotifyClient
+from app.services.token_store import TokenRefreshError, TokenStore
+
+TOKEN_DATA = {"access_token": "access", "refresh_token": "refresh", "expires_in": 3600}
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_entries(monkeypatch):
+    backend = MemoryBackend(max_bytes=1024, sizeof=lambda value: 1)
+    now = time.time()
+    await backend.set("old", "a", now, 10)
+    await backend.set("new", "b", now, 100)
+
+    monkeypatch.setattr(time, "time", lambda: now + 50)
+    assert await backend.get("old") is None
+    assert await backend.get("new") == (now, "b")
+
+    # Writes drop expired entries nobody reads again
+    await backend.set("other", "c", now + 50, 100)
+    monkeypatch.setattr(time, "time", lambda: now + 200)
+    await backend.set("latest", "d", now + 200, 100)
+    assert backend.snapshot()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cookie_holds_only_session_id():
+    store = TokenStore()
+    session_id = await store.create_session("user", TOKEN_DATA)
+    assert isinstance(session_id, str)
+    assert await store.get_access_token(session_id) == ("user", "access")
+
+    await store.delete_session(session_id)
+    assert await store.get_access_token(session_id) is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("error", "retry_after"),
+    [
+        (SpotifyRateLimited(30), "30"),
+        (httpx.HTTPStatusError("bad gateway", request=None, response=httpx.Response(502)), "5"),
+        (httpx.ConnectError("refused"), "5"),
+    ],
+)
+async def test_failed_refresh_of_expired_token_is_503(monkeypatch, error, retry_after):
+    async def refresh_access_token(self, refresh_token):
+        raise error
+
+    monkeypatch.setattr(SpotifyClient, "refresh_access_token", refresh_access_token)
+    store = TokenStore()
+    session_id = await store.create_session("user", {**TOKEN_DATA, "expires_in": -1})
+
+    with pytest.raises(TokenRefreshError):
+        await store.get_access_token(session_id)
+
+    monkeypatch.setattr("app.api.deps.token_store", store)
+    monkeypatch.setattr("app.api.deps.get_session", lambda request: {"sid": session_id})
+    with pytest.raises(HTTPException) as excinfo:
+        await get_current_user(Request({"type": "http", "headers": []}))
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.headers == {"Retry-After": retry_after}
+
+
+@pytest.mark.asyncio
+async def test_rejected_refresh_token_is_401(monkeypatch):
+    async def refresh_access_token(self, refresh_token):
+        raise httpx.HTTPStatusError("bad request", request=None, response=httpx.Response(400))
+
+    monkeypatch.setattr(SpotifyClient, "refresh_access_token", refresh_access_token)
+    store = TokenStore()
+    session_id = await store.create_session("user", {**TOKEN_DATA, "expires_in": -1})
+    assert await store.get_access_token(session_id) is None
+
+
+@pytest.mark.asyncio
+async def test_several_workers_require_shared_backend(monkeypatch):
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "memory")
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 2)
+    with pytest.raises(RuntimeError, match="CACHE_BACKEND=redis"):
+        await startup_event()
@@ -10,14 +10,21 @@ import { apiRequest } from './client.js';
  */
 export const episodes = {
   /**
-   * Get all user's saved episodes and followed podcasts.
+   * Get a page of user's saved episodes, most recently saved first.
+   * 
+   * Unchanged pages are revalidated by the browser with the response's
+   * ETag and come back as 304s, so polling this is cheap.
    * 
    * @param {number} limit - Number of episodes to return (default: 50)
-   * @param {number} offset - Pagination offset (default: 0)
-   * @returns {Promise<any>} List of episodes
+   * @param {string|null} cursor - `next_cursor` of the previous page (default: first page)
+   * @returns {Promise<any>} Page of episodes: { items, next_cursor }
    */
-  getAll: async (limit = 50, offset = 0) => {
-    return apiRequest(`/api/episodes?limit=${limit}&offset=${offset}`);
+  getAll: async (limit = 50, cursor = null) => {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+    return apiRequest(`/api/episodes?${params}`);
   },
   
   /**